@@ -0,0 +1,269 @@
+# File: product/app/bench.py
+"""
+상품 조회 경로 지연 벤치마크.
+
+합성 브랜드 / 상품을 벤치 전용 DB 에 넣고 목록 조회 경로별 지연(p50 / p95)을 측정합니다.
+
+    목록 (GET /product)
+    - scan      : 요청마다 브랜드 컬렉션 전체를 읽어 합치는 기존 방식 (왕복 3회)
+    - cache     : count + find 후 BrandCache 에서 페이지에 나온 브랜드만 조회 (왕복 2회)
+    - aggregate : $facet(total + 페이지) + $lookup 브랜드 조인 (왕복 1회)
+
+    상세 (GET /product/{id})
+    - find      : 상품 find_one → 브랜드 find_one (왕복 2회)
+    - cache     : 상품 find_one + BrandCache (왕복 1회)
+    - aggregate : $match + $lookup (왕복 1회)
+
+    이름 검색 (GET /product?name=)
+    - regex     : {"name": {"$regex": ..., "$options": "i"}} 컬렉션 스캔
+    - index     : ProductSearchIndex 메모리 검색 (관련도 순 전체 결과)
+
+mock 백엔드는 왕복 비용이 0 이므로 --rtt-ms 로 가정한 왕복 지연을 더한
+추정치(est_ms = p50 + rtt × 왕복 수)도 함께 출력합니다.
+
+백엔드:
+    - mongo : 실제 MongoDB (BENCH_MONGO_URI, 기본 mongodb://localhost:27017)
+    - mock  : mongomock-motor 프로세스 내 대체 구현 (pip install mongomock-motor).
+              네트워크 / 직렬화 비용이 없으므로 경로 간 상대 비교용
+
+사용 예:
+    python -m app.bench --backend mongo --brands 10000 --products 50000
+"""
+import os
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Awaitable, Callable, List
+
+from .brand_cache import BrandCache, brand_fields
+from .pipelines import product_page_pipeline, product_lookup_pipeline, unpack_page
+from .search import ProductSearchIndex
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+BENCH_DB = os.getenv("BENCH_DB", "product_bench")
+
+CATEGORIES = ["상의", "하의", "아우터", "신발", "가방", "액세서리"]
+GENDERS = ["M", "F", "U"]
+
+
+def open_database(backend: str):
+    """벤치용 DB 핸들 (motor 호환 인터페이스)."""
+    if backend == "mongo":
+        from motor.motor_asyncio import AsyncIOMotorClient
+        return AsyncIOMotorClient(BENCH_MONGO_URI)[BENCH_DB]
+    if backend == "mock":
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError as e:
+            raise SystemExit("mock 백엔드는 mongomock-motor 가 필요합니다: pip install mongomock-motor") from e
+        return AsyncMongoMockClient()[BENCH_DB]
+    raise SystemExit(f"알 수 없는 backend: {backend}")
+
+
+async def seed(db, n_brands: int, n_products: int, batch: int = 5000, indexes: bool = True) -> None:
+    """
+    합성 브랜드 / 상품 적재 (기존 벤치 데이터는 삭제).
+
+    Args:
+        indexes (bool): 서비스와 같은 인덱스 생성 여부
+            (mongomock 은 unique 인덱스 삽입이 O(n²) 이라 mock 백엔드에서는 생략)
+    """
+    await db["brand"].drop()
+    await db["product"].drop()
+    if indexes:
+        await db["brand"].create_index([("id", 1)], unique=True)
+        await db["product"].create_index([("id", 1)], unique=True)
+        await db["product"].create_index([("major_category", 1)], name="idx_major_category")
+
+    brands = [
+        {"id": i, "brand_kor": f"브랜드{i}", "brand_eng": f"brand{i}", "like_count": i % 500}
+        for i in range(1, n_brands + 1)
+    ]
+    for start in range(0, len(brands), batch):
+        await db["brand"].insert_many(brands[start:start + batch])
+
+    for start in range(1, n_products + 1, batch):
+        docs = [
+            {
+                "id": i,
+                "name": f"상품 {i} {CATEGORIES[i % len(CATEGORIES)]}",
+                "brand_id": (i * 7919) % n_brands + 1,
+                "major_category": CATEGORIES[i % len(CATEGORIES)],
+                "gender": GENDERS[i % len(GENDERS)],
+                "price": 10000 + (i % 100) * 1000,
+                "discounted_price": 9000 + (i % 100) * 900,
+                "like_count": i % 50,
+            }
+            for i in range(start, min(start + batch, n_products + 1))
+        ]
+        await db["product"].insert_many(docs)
+
+
+async def list_scan(db, query: dict, page: int, size: int) -> list:
+    """기존 목록 조회: 요청마다 브랜드 전체 조회."""
+    total = await db["product"].count_documents(query)
+    products = await db["product"].find(query).skip((page - 1) * size).limit(size).to_list(length=size)
+    brands = await db["brand"].find().to_list(length=None)
+    brand_map = {b["id"]: b for b in brands}
+    return [total] + [{**p, **brand_fields(brand_map.get(p.get("brand_id")))} for p in products]
+
+
+def list_cached(cache: BrandCache) -> Callable:
+    async def run(db, query: dict, page: int, size: int) -> list:
+        total = await db["product"].count_documents(query)
+        products = await db["product"].find(query).skip((page - 1) * size).limit(size).to_list(length=size)
+        brand_map = await cache.get_many(p.get("brand_id") for p in products)
+        return [total] + [{**p, **brand_fields(brand_map.get(p.get("brand_id")))} for p in products]
+    return run
+
+
+async def list_aggregate(db, query: dict, page: int, size: int) -> list:
+    """$facet + $lookup 한 번의 왕복."""
+    result = await db["product"].aggregate(
+        product_page_pipeline(query, (page - 1) * size, size, "brand")
+    ).to_list(length=1)
+    total, items = unpack_page(result)
+    return [total] + items
+
+
+async def detail_find(db, product_id: int) -> dict:
+    """기존 상세 조회: 상품 → 브랜드 순차 조회."""
+    prod = await db["product"].find_one({"id": product_id})
+    brand = await db["brand"].find_one({"id": prod["brand_id"]})
+    return {**prod, **brand_fields(brand)}
+
+
+def detail_cached(cache: BrandCache) -> Callable:
+    async def run(db, product_id: int) -> dict:
+        prod = await db["product"].find_one({"id": product_id})
+        return {**prod, **brand_fields(await cache.get(prod.get("brand_id")))}
+    return run
+
+
+async def detail_aggregate(db, product_id: int) -> dict:
+    docs = await db["product"].aggregate(
+        product_lookup_pipeline({"id": product_id}, limit=1, brand_collection="brand")
+    ).to_list(length=1)
+    return docs[0]
+
+
+def summarize(timings: List[float], round_trips: int, rtt_ms: float) -> dict:
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    return {
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "round_trips": round_trips,
+        "est_ms": round(p50 + rtt_ms * round_trips, 3),
+    }
+
+
+async def measure(fn: Callable[..., Awaitable], db, repeat: int, size: int) -> List[float]:
+    """카테고리 / 페이지를 바꿔 가며 repeat 회 호출한 목록 조회 지연 (ms)."""
+    timings: List[float] = []
+    for i in range(repeat):
+        query = {"major_category": CATEGORIES[i % len(CATEGORIES)]}
+        started = time.perf_counter()
+        await fn(db, query, 1 + i % 5, size)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def measure_detail(fn: Callable[..., Awaitable], db, repeat: int, n_products: int) -> List[float]:
+    """상품 ID 를 바꿔 가며 repeat 회 호출한 상세 조회 지연 (ms)."""
+    timings: List[float] = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        await fn(db, (i * 104729) % n_products + 1)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def bench_listing(db, repeat: int, size: int, rtt_ms: float = 0.0) -> dict:
+    cache = BrandCache(db["brand"])
+    started = time.perf_counter()
+    await cache.load()
+    load_ms = (time.perf_counter() - started) * 1000
+    results = {
+        "scan": summarize(await measure(list_scan, db, repeat, size), 3, rtt_ms),
+        "cache": summarize(await measure(list_cached(cache), db, repeat, size), 2, rtt_ms),
+        "aggregate": summarize(await measure(list_aggregate, db, repeat, size), 1, rtt_ms),
+    }
+    results["cache"]["load_ms"] = round(load_ms, 3)
+    results["cache"]["stats"] = cache.stats()
+    return results
+
+
+async def bench_detail(db, repeat: int, n_products: int, rtt_ms: float = 0.0) -> dict:
+    cache = BrandCache(db["brand"])
+    await cache.load()
+    return {
+        "find": summarize(await measure_detail(detail_find, db, repeat, n_products), 2, rtt_ms),
+        "cache": summarize(await measure_detail(detail_cached(cache), db, repeat, n_products), 1, rtt_ms),
+        "aggregate": summarize(await measure_detail(detail_aggregate, db, repeat, n_products), 1, rtt_ms),
+    }
+
+
+SEARCH_QUERIES = ["상품 12", "상의", "신발", "아우터 1", "가방", "상품 9 하의"]
+
+
+async def bench_search(db, repeat: int, rtt_ms: float = 0.0) -> dict:
+    index = ProductSearchIndex(db["product"])
+    started = time.perf_counter()
+    await index.load()
+    load_ms = (time.perf_counter() - started) * 1000
+
+    async def regex(q):
+        return await db["product"].find({"name": {"$regex": q, "$options": "i"}}, {"id": 1}).to_list(length=None)
+
+    async def indexed(q):
+        return index.search(q)
+
+    results = {}
+    for path, fn, round_trips in (("regex", regex, 1), ("index", indexed, 0)):
+        timings = []
+        for i in range(repeat):
+            started = time.perf_counter()
+            await fn(SEARCH_QUERIES[i % len(SEARCH_QUERIES)])
+            timings.append((time.perf_counter() - started) * 1000)
+        results[path] = summarize(timings, round_trips, rtt_ms)
+    results["index"]["load_ms"] = round(load_ms, 3)
+    results["index"]["stats"] = index.stats()
+    return results
+
+
+async def run(args) -> None:
+    db = open_database(args.backend)
+    if not args.no_seed:
+        await seed(db, args.brands, args.products, indexes=args.backend == "mongo")
+    print(f"backend={args.backend}\tbrands={args.brands}\tproducts={args.products}"
+          f"\tsize={args.size}\trtt_ms={args.rtt_ms}")
+    for endpoint, results in (
+        ("list", await bench_listing(db, args.repeat, args.size, args.rtt_ms)),
+        ("detail", await bench_detail(db, args.repeat, args.products, args.rtt_ms)),
+        ("search", await bench_search(db, args.repeat, args.rtt_ms)),
+    ):
+        for path, stats in results.items():
+            print(f"{endpoint}\t{path}\t" + "\t".join(f"{k}={v}" for k, v in stats.items()))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.bench", description="상품 목록 조회 지연 벤치마크")
+    parser.add_argument("--backend", choices=["mongo", "mock"], default="mongo")
+    parser.add_argument("--brands", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=None,
+                        help="추정치에 더할 왕복 지연 (기본: mock 1.0, mongo 0 — 측정값에 이미 포함)")
+    parser.add_argument("--no-seed", action="store_true", help="기존 벤치 데이터 재사용")
+    args = parser.parse_args(argv)
+    if args.rtt_ms is None:
+        args.rtt_ms = 1.0 if args.backend == "mock" else 0.0
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# File: product/app/brand_cache.py
+"""
+브랜드 정보 프로세스 내 캐시 (brand id → brand_kor / brand_eng / like_count).
+
+상품 조회마다 브랜드 컬렉션을 읽지 않도록 시작 시 전체 브랜드를 한 번 적재하고,
+    - TTL 이 지나면 백그라운드로 전체를 다시 적재 (그동안은 기존 값으로 응답)
+    - 좋아요 / 좋아요 취소로 like_count 가 바뀐 브랜드는 invalidate 로 즉시 제거
+    - 캐시에 없는 브랜드(적재 이후 추가 등)는 해당 ID 만 조회해 채움
+합니다. 무효화는 프로세스 단위이므로 여러 워커 간 차이는 TTL 이내로 제한됩니다.
+"""
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger("product")
+
+# 상품 응답에 필요한 브랜드 필드만 적재
+BRAND_PROJECTION = {"_id": 0, "id": 1, "brand_kor": 1, "brand_eng": 1, "like_count": 1}
+
+
+class BrandCache:
+    def __init__(self, collection, ttl: float = 300.0):
+        self.collection = collection
+        self.ttl = ttl
+        self._brands: Dict[int, dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._reloading: Optional[asyncio.Task] = None
+        # 전체 적재 도중 무효화된 ID (적재 결과가 이전 값을 되살리지 않도록 제거)
+        self._invalidated: Set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.invalidations = 0
+
+    async def load(self) -> int:
+        """전체 브랜드를 적재해 통째로 교체합니다. 적재한 브랜드 수를 반환합니다."""
+        self._invalidated = set()
+        docs = await self.collection.find({}, BRAND_PROJECTION).to_list(length=None)
+        brands = {d["id"]: d for d in docs}
+        for brand_id in self._invalidated:
+            brands.pop(brand_id, None)
+        self._brands = brands
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+        logger.info(f"brand_cache_loaded\tbrands={len(self._brands)}")
+        return len(self._brands)
+
+    async def _reload_in_background(self) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            logger.warning(f"brand_cache_reload_failed\terror={e}")
+        finally:
+            self._reloading = None
+
+    async def _ensure_fresh(self) -> None:
+        if self._loaded_at is None:
+            await self.load()
+        elif time.monotonic() - self._loaded_at > self.ttl and self._reloading is None:
+            self._reloading = asyncio.create_task(self._reload_in_background())
+
+    async def get_many(self, brand_ids: Iterable[int]) -> Dict[int, dict]:
+        """
+        브랜드 ID 목록을 {id: brand} 로 반환합니다. 캐시에 없는 ID 만 컬렉션에서 조회합니다.
+        """
+        await self._ensure_fresh()
+        wanted = {b for b in brand_ids if b is not None}
+        found = {b: self._brands[b] for b in wanted if b in self._brands}
+        missing = list(wanted - found.keys())
+        self.hits += len(found)
+        self.misses += len(missing)
+        if missing:
+            docs = await self.collection.find({"id": {"$in": missing}}, BRAND_PROJECTION) \
+                .to_list(length=None)
+            for d in docs:
+                self._brands[d["id"]] = d
+                found[d["id"]] = d
+        return found
+
+    async def get(self, brand_id: Optional[int]) -> Optional[dict]:
+        if brand_id is None:
+            return None
+        return (await self.get_many([brand_id])).get(brand_id)
+
+    def invalidate(self, brand_id: int) -> None:
+        """변경된 브랜드를 제거합니다 (다음 조회 때 해당 ID 만 다시 읽음)."""
+        self._invalidated.add(brand_id)
+        if self._brands.pop(brand_id, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._brands),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "reloads": self.reloads,
+            "invalidations": self.invalidations,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+        }
+
+
+def brand_fields(brand: Optional[dict]) -> dict:
+    """CombinedProduct 에 합칠 브랜드 필드 (브랜드가 없으면 빈 dict)."""
+    if not brand:
+        return {}
+    return {
+        "brand_kor": brand.get("brand_kor"),
+        "brand_eng": brand.get("brand_eng"),
+        "brand_like_count": brand.get("like_count"),
+    }
+
+
+def brand_cache_from_env(collection) -> BrandCache:
+    return BrandCache(collection, ttl=float(os.getenv("BRAND_CACHE_TTL", "300")))
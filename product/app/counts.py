@@ -0,0 +1,178 @@
+# File: product/app/counts.py
+"""
+상품 목록 total 계산 전략.
+
+    - exact     : 요청마다 count_documents (기존 방식)
+    - cached    : 정규화한 필터별 개수를 TTL 동안 재사용. 같은 필터의 동시 미스는 한 번만 계산.
+                  상품 생성 / 삭제(및 필터 필드 변경) 시 전체 무효화
+    - estimated : 필드 값별 개수 통계(major_category / gender / brand_id)로 추정
+                  total × Π(값 비율) (필드 간 독립 가정). 필터가 없으면 estimated_document_count.
+                  통계로 추정할 수 없는 필터(name 등)는 cached 로 계산
+    - none      : total 을 계산하지 않음 (GET /product/count 로 필요할 때 따로 조회)
+
+기본 모드는 TOTAL_MODE (기본 cached), 요청별로 total_mode 파라미터로 바꿀 수 있습니다.
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("product")
+
+TOTAL_MODES = ("exact", "cached", "estimated", "none")
+TOTAL_MODE = os.getenv("TOTAL_MODE", "cached")
+# 필터별 개수 캐시 TTL (초) / 최대 항목 수
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "60"))
+COUNT_CACHE_MAX = int(os.getenv("COUNT_CACHE_MAX", "10000"))
+# 추정용 값별 개수 통계 갱신 주기 (초)
+COUNT_STATS_TTL = float(os.getenv("COUNT_STATS_TTL", "600"))
+
+# 값별 개수 통계를 유지하는 필드 (목록 조회의 동등 조건 필터)
+ESTIMATE_FIELDS = ("major_category", "gender", "brand_id")
+# 값이 바뀌면 필터별 개수가 달라지는 필드
+FILTER_FIELDS = ("name",) + ESTIMATE_FIELDS
+
+
+def normalize_filter(query: dict) -> str:
+    """필터 조건 → 캐시 키 (키 순서와 무관)."""
+    return json.dumps(query, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class CountStrategy:
+    def __init__(self, collection, ttl: float = COUNT_CACHE_TTL, stats_ttl: float = COUNT_STATS_TTL,
+                 max_entries: int = COUNT_CACHE_MAX):
+        self.collection = collection
+        self.ttl = ttl
+        self.stats_ttl = stats_ttl
+        self.max_entries = max_entries
+        self._counts: Dict[str, Tuple[int, float]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 무효화 세대 (계산 도중 무효화되면 결과를 캐시에 넣지 않음)
+        self._generation = 0
+        # field → {value: count}, 통계 기준 전체 개수, 갱신 시각
+        self._value_counts: Dict[str, Dict[object, int]] = {}
+        self._stats_total = 0
+        self._stats_at: Optional[float] = None
+        self._stats_refreshing: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def total(self, query: dict, mode: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        mode 에 따라 query 의 상품 수를 계산합니다.
+
+        Returns:
+            tuple: (개수, 실제 사용한 방식). none 이면 (None, None),
+                estimated 로 추정할 수 없는 필터면 cached 로 계산
+        """
+        if mode == "none":
+            return None, None
+        if mode == "exact":
+            return await self.collection.count_documents(query), "exact"
+        if mode == "estimated":
+            estimate = await self.estimated(query)
+            if estimate is not None:
+                return estimate, "estimated"
+        return await self.cached(query), "cached"
+
+    async def cached(self, query: dict) -> int:
+        key = normalize_filter(query)
+        entry = self._counts.get(key)
+        if entry is not None and time.monotonic() - entry[1] <= self.ttl:
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            count = await self.collection.count_documents(query)
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없을 때 "exception never retrieved" 경고 방지
+            future.exception()
+            raise
+        else:
+            future.set_result(count)
+            if generation == self._generation:
+                self._store(key, count)
+            return count
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: str, count: int) -> None:
+        self._counts.pop(key, None)
+        if len(self._counts) >= self.max_entries:
+            # 가장 오래 전에 저장한 항목 제거
+            self._counts.pop(next(iter(self._counts)))
+        self._counts[key] = (count, time.monotonic())
+
+    async def estimated(self, query: dict) -> Optional[int]:
+        """값별 개수 통계로 추정한 개수. 통계로 추정할 수 없는 필터면 None."""
+        if not query:
+            return await self.collection.estimated_document_count()
+        if not set(query) <= set(ESTIMATE_FIELDS) or any(isinstance(v, dict) for v in query.values()):
+            return None
+        await self._ensure_stats()
+        if not self._stats_total:
+            return 0
+        ratio = 1.0
+        for field, value in query.items():
+            ratio *= self._value_counts.get(field, {}).get(value, 0) / self._stats_total
+        return int(round(self._stats_total * ratio))
+
+    async def refresh_stats(self) -> None:
+        """ESTIMATE_FIELDS 의 값별 개수를 다시 집계합니다."""
+        value_counts = {}
+        for field in ESTIMATE_FIELDS:
+            docs = await self.collection.aggregate(
+                [{"$group": {"_id": f"${field}", "n": {"$sum": 1}}}]
+            ).to_list(length=None)
+            value_counts[field] = {d["_id"]: d["n"] for d in docs}
+        self._value_counts = value_counts
+        self._stats_total = sum(value_counts[ESTIMATE_FIELDS[0]].values())
+        self._stats_at = time.monotonic()
+        logger.info(f"count_stats_refreshed\ttotal={self._stats_total}")
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self.refresh_stats()
+        except Exception as e:
+            logger.warning(f"count_stats_refresh_failed\terror={e}")
+        finally:
+            self._stats_refreshing = None
+
+    async def _ensure_stats(self) -> None:
+        if self._stats_at is None:
+            await self.refresh_stats()
+        elif time.monotonic() - self._stats_at > self.stats_ttl and self._stats_refreshing is None:
+            self._stats_refreshing = asyncio.create_task(self._refresh_in_background())
+
+    def invalidate(self) -> None:
+        """상품 생성 / 삭제 등으로 개수가 바뀌었을 때 필터별 개수 캐시 전체를 비웁니다."""
+        self._generation += 1
+        self._counts.clear()
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._counts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "invalidations": self.invalidations,
+            "stats_age_seconds": round(time.monotonic() - self._stats_at, 1) if self._stats_at else None,
+        }
+
+
+def count_strategy_from_env(collection) -> CountStrategy:
+    if TOTAL_MODE not in TOTAL_MODES:
+        raise ValueError(f"TOTAL_MODE 는 {TOTAL_MODES} 중 하나여야 합니다: {TOTAL_MODE}")
+    return CountStrategy(collection)
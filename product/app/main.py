@@ -5,9 +5,11 @@
 from typing import List, Optional
 import time
 import os
+import json
 import logging
 
 from fastapi import FastAPI, Query, Depends, Path, HTTPException, Header, status, Request
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 from datetime import datetime
 from pymongo.errors import ServerSelectionTimeoutError
@@ -16,8 +18,15 @@ import asyncio
 # from redis.asyncio import Redis
 
 from .database import product_collection, brand_collection, db, likes_coll, brand_likes_coll # redis
-from .schemas import CombinedProduct, ProductBase, PaginatedProducts, BulkProduct, BulkRequest, LikeRequest, \
-    UserLikedProductsResponse, UserLikedBrandsResponse
+from .schemas import CombinedProduct, ProductBase, PaginatedProducts, ProductCount, ProductSuggestions, ProductCounters, BulkProduct, BulkRequest, LikeRequest, \
+    UserLikedProductsResponse, UserLikedBrandsResponse, UserEventsResponse, UserEventsBulkRequest, TrendingEventsResponse
+from .recommend_notifier import recommend_notifier
+from .brand_cache import BrandCache, brand_cache_from_env, brand_fields
+from .pipelines import read_path, product_page_pipeline, product_lookup_pipeline, unpack_page
+from .counts import TOTAL_MODE, TOTAL_MODES, FILTER_FIELDS, CountStrategy, count_strategy_from_env
+from .pagination import SORTS, DEFAULT_SORT, RELEVANCE, InvalidCursor, sort_spec, index_specs, apply_cursor, \
+    encode_cursor, decode_cursor, encode_offset_cursor, decode_offset_cursor
+from .search import ProductSearchIndex
 
 # Logging setup
 from shared.logging_config import configure_logging
@@ -44,6 +53,36 @@ async def get_brand_likes_coll() -> AsyncIOMotorCollection:
     return brand_likes_coll
 
 
+# 브랜드 정보 캐시 (상품 조회 시 브랜드 컬렉션 조회 대체)
+brand_cache = brand_cache_from_env(brand_collection)
+
+
+async def get_brand_cache() -> BrandCache:
+    return brand_cache
+
+
+# 목록 total 계산 (필터별 개수 캐시 / 추정)
+count_strategy = count_strategy_from_env(product_collection)
+
+
+async def get_count_strategy() -> CountStrategy:
+    return count_strategy
+
+
+# 상품명 검색 색인 (이름 검색 / 자동완성)
+search_index = ProductSearchIndex(product_collection)
+
+
+async def get_search_index() -> ProductSearchIndex:
+    return search_index
+
+
+# 엔드포인트별 상품 + 브랜드 조회 경로 (cache | aggregate)
+LIST_READ_PATH = read_path("list")
+DETAIL_READ_PATH = read_path("detail")
+BULK_READ_PATH = read_path("bulk")
+
+
 # async def get_redis() -> Redis:
 #     return redis
 
@@ -101,15 +140,153 @@ async def ensure_mongo_indexes():
             await brand_collection.create_index([("id", 1)], unique=True)
             await product_collection.create_index([("major_category", 1)], name="idx_major_category")
             await product_collection.create_index([("gender", 1)], name="idx_gender")
+            # 검색 색인의 변경 상품 조회 (updated_at 기준)
+            await product_collection.create_index([("updated_at", 1)], name="idx_updated_at")
+            # 목록 정렬 / 커서 페이지네이션용 (정렬 필드, id) 복합 인덱스
+            for index_name, keys in index_specs():
+                await product_collection.create_index(keys, name=index_name)
+            await view_collection.create_index([("user_id", 1), ("viewed_at", -1)], name="idx_user_viewed_at")
+            await purchase_collection.create_index(
+                [("user_id", 1), ("purchased_at", -1)], name="idx_user_purchased_at"
+            )
+            await likes_coll.create_index([("user_id", 1), ("created_at", -1)], name="idx_user_created_at")
+            # 트렌딩 집계용 기간 조회
+            await view_collection.create_index([("viewed_at", -1)], name="idx_viewed_at")
+            await purchase_collection.create_index([("purchased_at", -1)], name="idx_purchased_at")
             return
         except ServerSelectionTimeoutError:
             await asyncio.sleep(2)
     raise RuntimeError("MongoDB 연결 실패 - 인덱스 생성 불가")
 
+
+@app.on_event("startup")
+async def load_brand_cache():
+    # 실패해도 첫 조회 때 다시 적재하므로 기동은 계속 진행
+    try:
+        await brand_cache.load()
+    except Exception as e:
+        logger.warning(f"brand_cache_load_failed\terror={e}")
+
+
+@app.on_event("startup")
+async def start_search_index():
+    # 적재가 끝나기 전의 이름 검색은 $regex 로 처리
+    asyncio.create_task(search_index.run())
+
+
+@app.on_event("startup")
+async def start_recommend_notifier():
+    # 추천 서비스로 변경 상품 ID 주기 전송 (RECOMMEND_BASE_URL 미설정 시 비활성)
+    if recommend_notifier.enabled:
+        asyncio.create_task(recommend_notifier.run())
+
 @app.get("/health", status_code=200)
 async def health_check():
     return {"status": "ok"}
 
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {"brand": brand_cache.stats(), "count": count_strategy.stats(), "search": search_index.stats()}
+
+
+def _product_query(
+        name: Optional[str],
+        major_category: Optional[str],
+        gender: Optional[str],
+        brand_id: Optional[int],
+) -> dict:
+    query = {}
+    if name:
+        query["name"] = {"$regex": name, "$options": "i"}
+    if major_category:
+        query["major_category"] = major_category
+    if gender:
+        query["gender"] = gender
+    if brand_id is not None:
+        query["brand_id"] = brand_id
+    return query
+
+
+def _split_page(products: list, size: int, sort: str):
+    """size + 1 개 조회 결과 → (페이지, 다음 페이지 커서 또는 None)."""
+    if len(products) <= size:
+        return products, None
+    products = products[:size]
+    return products, encode_cursor(sort, products[-1])
+
+
+async def _load_products(collection, brands: BrandCache, query: dict, order, skip: int, limit: int) -> list:
+    """목록 조회 경로(cache | aggregate)대로 상품 + 브랜드 필드를 조회합니다."""
+    if LIST_READ_PATH == "aggregate":
+        return await collection.aggregate(
+            product_lookup_pipeline(query, limit, brand_collection.name, sort=order, skip=skip)
+        ).to_list(length=limit)
+
+    cursor = collection.find(query)
+    if order:
+        cursor = cursor.sort(order)
+    products = await cursor.skip(skip).limit(limit).to_list(length=limit)
+    # 페이지에 나온 브랜드만 캐시에서 조회
+    brand_map = await brands.get_many(p.get("brand_id") for p in products)
+    return [{**p, **brand_fields(brand_map.get(p.get("brand_id")))} for p in products]
+
+
+async def _search_page(
+        collection,
+        brands: BrandCache,
+        search: ProductSearchIndex,
+        name: str,
+        major_category: Optional[str],
+        gender: Optional[str],
+        brand_id: Optional[int],
+        sort: str,
+        page: int,
+        size: int,
+        after: Optional[str],
+        total_mode: str,
+) -> PaginatedProducts:
+    """
+    이름 검색 목록 한 페이지. 색인에서 정렬한 결과 목록을 잘라 페이지 상품만 id 로 조회합니다.
+
+    관련도 순 커서는 결과 목록 내 위치(offset), 그 외 정렬은 (정렬 값, id) keyset 커서입니다.
+
+    Raises:
+        InvalidCursor: 형식이 잘못됐거나 다른 정렬로 만든 커서
+    """
+    if sort == RELEVANCE:
+        ids = search.search(name, major_category, gender, brand_id)
+        offset = decode_offset_cursor(after) if after else (page - 1) * size
+    else:
+        ids = search.search(name, major_category, gender, brand_id, sort=SORTS[sort])
+        offset = search.position_after(ids, SORTS[sort], *decode_cursor(after, sort)) if after \
+            else (page - 1) * size
+    page_ids = ids[offset:offset + size]
+    products = await _load_products(
+        collection, brands, {"id": {"$in": page_ids}}, None, 0, len(page_ids)
+    ) if page_ids else []
+    by_id = {p["id"]: p for p in products}
+
+    next_cursor = None
+    if offset + size < len(ids):
+        if sort == RELEVANCE:
+            next_cursor = encode_offset_cursor(offset + size)
+        else:
+            # 커서 값은 색인의 정렬 값 (다음 페이지 위치를 같은 기준으로 찾도록)
+            field, _ = SORTS[sort]
+            last_id = page_ids[-1]
+            next_cursor = encode_cursor(sort, {"id": last_id, field: search.sort_value(last_id, field)})
+    return PaginatedProducts(
+        total=None if total_mode == "none" else len(ids),
+        total_mode=None if total_mode == "none" else "exact",
+        items=[CombinedProduct(**by_id[i]) for i in page_ids if i in by_id],
+        next_cursor=next_cursor,
+    )
+
+
+TOTAL_MODE_PATTERN = f"^({'|'.join(TOTAL_MODES)})$"
+
+
 # Endpoints
 @app.get("/product", response_model=PaginatedProducts)
 async def list_products(
@@ -117,60 +294,134 @@ async def list_products(
         major_category: Optional[str] = Query(None, description="메이저 카테고리"),
         gender: Optional[str] = Query(None, description="성별 (M/F/U 등)"),
         brand_id: Optional[int] = Query(None, description="브랜드 ID"),
-        page: int = Query(1, ge=1, description="페이지 번호"),
+        page: int = Query(1, ge=1, description="페이지 번호 (after 지정 시 무시)"),
         size: int = Query(10, ge=1, le=100, description="페이지 크기"),
+        sort: Optional[str] = Query(None, pattern=f"^({'|'.join([RELEVANCE, *SORTS])})$",
+                                    description="정렬 (기본: name 검색이면 relevance, 아니면 id)"),
+        after: Optional[str] = Query(None, description="이전 응답의 next_cursor (커서 페이지네이션)"),
+        total_mode: str = Query(TOTAL_MODE, pattern=TOTAL_MODE_PATTERN,
+                                description="total 계산 방식 (none 이면 생략, /product/count 로 따로 조회)"),
         collection: AsyncIOMotorCollection = Depends(get_db),
-        brand_coll: AsyncIOMotorCollection = Depends(get_brand_db),
+        brands: BrandCache = Depends(get_brand_cache),
+        counts: CountStrategy = Depends(get_count_strategy),
+        search: ProductSearchIndex = Depends(get_search_index),
 ):
-    query = {}
-    if name:
-        query["name"] = {"$regex": name, "$options": "i"}
-    if major_category:
-        query["major_category"] = major_category
-    if gender:
-        query["gender"] = gender
-    if brand_id is not None:
-        query["brand_id"] = brand_id
+    sort = sort or (RELEVANCE if name else DEFAULT_SORT)
+    if name and search.ready:
+        # 이름 검색은 색인에서 필터 / 개수 / 정렬까지 계산 (Mongo 는 페이지 상품만 id 로 조회)
+        try:
+            return await _search_page(
+                collection, brands, search, name, major_category, gender, brand_id,
+                sort, page, size, after, total_mode,
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if sort == RELEVANCE:
+        # 검색 색인 적재 전에는 $regex 로 찾고 기본 정렬
+        sort = DEFAULT_SORT
 
-    total = await collection.count_documents(query)
-    skip = (page - 1) * size
-    products = await collection.find(query).skip(skip).limit(size).to_list(length=size)
+    query = _product_query(name, major_category, gender, brand_id)
+    try:
+        # 커서가 있으면 skip 대신 "마지막 항목 이후" 조건으로 조회
+        page_query = apply_cursor(query, sort, after)
+    except InvalidCursor as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+    skip = 0 if after else (page - 1) * size
+    order = sort_spec(sort)
+
+    # 다음 페이지 존재 여부를 알기 위해 한 개 더 조회
+    if LIST_READ_PATH == "aggregate" and not after and total_mode == "exact":
+        # 개수 + 페이지 + 브랜드 조인을 한 번의 왕복으로
+        result = await collection.aggregate(
+            product_page_pipeline(query, skip, size + 1, brand_collection.name, sort=order)
+        ).to_list(length=1)
+        total, products = unpack_page(result)
+    else:
+        # total 은 전략대로 페이지 조회와 동시에 계산
+        # (aggregate 경로의 커서 조건은 $facet 안에서 인덱스를 못 타므로 따로 계산)
+        (total, total_mode), products = await asyncio.gather(
+            counts.total(query, total_mode),
+            _load_products(collection, brands, page_query, order, skip, size + 1),
+        )
+    products, next_cursor = _split_page(products, size, sort)
 
-    brands = await brand_coll.find().to_list(length=None)
-    brand_map = {b["id"]: b for b in brands}
+    return PaginatedProducts(
+        total=total,
+        total_mode=total_mode,
+        items=[CombinedProduct(**p) for p in products],
+        next_cursor=next_cursor,
+    )
+
+
+@app.get("/product/count", response_model=ProductCount, summary="목록 필터의 상품 수 (total 지연 조회)")
+async def count_products(
+        name: Optional[str] = Query(None, description="상품명 키워드"),
+        major_category: Optional[str] = Query(None, description="메이저 카테고리"),
+        gender: Optional[str] = Query(None, description="성별 (M/F/U 등)"),
+        brand_id: Optional[int] = Query(None, description="브랜드 ID"),
+        total_mode: str = Query("exact", pattern="^(exact|cached|estimated)$", description="total 계산 방식"),
+        counts: CountStrategy = Depends(get_count_strategy),
+        search: ProductSearchIndex = Depends(get_search_index),
+):
+    if name and search.ready:
+        return ProductCount(total=len(search.search(name, major_category, gender, brand_id)), total_mode="exact")
+    total, total_mode = await counts.total(_product_query(name, major_category, gender, brand_id), total_mode)
+    return ProductCount(total=total, total_mode=total_mode)
 
-    combined_list: List[CombinedProduct] = []
-    for prod in products:
-        data = prod.copy()
-        if brand := brand_map.get(prod["brand_id"]):
-            data.update({
-                "brand_kor": brand["brand_kor"],
-                "brand_eng": brand["brand_eng"],
-                "brand_like_count": brand["like_count"],
-            })
-        combined_list.append(CombinedProduct(**data))
 
-    return PaginatedProducts(total=total, items=combined_list)
+@app.get("/product/autocomplete", response_model=ProductSuggestions, summary="상품명 자동완성")
+async def autocomplete_products(
+        q: str = Query(..., min_length=1, description="입력 중인 검색어"),
+        limit: int = Query(10, ge=1, le=50, description="최대 후보 수"),
+        search: ProductSearchIndex = Depends(get_search_index),
+):
+    if not search.ready:
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail="검색 색인을 준비 중입니다.")
+    return ProductSuggestions(
+        query=q,
+        items=[{"id": product_id, "name": name} for product_id, name in search.suggest(q, limit)],
+    )
+
+
+@app.get("/product/counters", response_model=ProductCounters, summary="상품별 좋아요 / 조회 / 구매 수 (id 순)")
+async def product_counters(
+        after_id: Optional[int] = Query(None, description="이전 응답의 next_after_id"),
+        limit: int = Query(5000, ge=1, le=10000, description="페이지 크기"),
+        collection: AsyncIOMotorCollection = Depends(get_db),
+        brands: BrandCache = Depends(get_brand_cache),
+):
+    # 추천 서비스의 주기적 재학습용 카운터 (상품 변경 알림에는 카운터 변경을 싣지 않음)
+    query = {} if after_id is None else {"id": {"$gt": after_id}}
+    products = await collection.find(
+        query, {"_id": 0, "id": 1, "brand_id": 1, "like_count": 1, "view_count": 1, "purchase_count": 1}
+    ).sort("id", 1).limit(limit).to_list(length=limit)
+    brand_map = await brands.get_many(p.get("brand_id") for p in products)
+    return ProductCounters(
+        items=[
+            {**p, "brand_like_count": brand_fields(brand_map.get(p.get("brand_id"))).get("brand_like_count")}
+            for p in products
+        ],
+        next_after_id=products[-1]["id"] if len(products) == limit else None,
+    )
 
 
 @app.get("/product/{id}", response_model=CombinedProduct)
 async def get_product(
         id: int = Path(..., description="조회할 상품의 ID"),
         collection: AsyncIOMotorCollection = Depends(get_db),
-        brand_coll: AsyncIOMotorCollection = Depends(get_brand_db),
+        brands: BrandCache = Depends(get_brand_cache),
 ):
-    prod = await collection.find_one({"id": id})
-    if not prod:
+    if DETAIL_READ_PATH == "aggregate":
+        docs = await collection.aggregate(
+            product_lookup_pipeline({"id": id}, limit=1, brand_collection=brand_collection.name)
+        ).to_list(length=1)
+        combined = docs[0] if docs else None
+    else:
+        prod = await collection.find_one({"id": id})
+        combined = {**prod, **brand_fields(await brands.get(prod.get("brand_id")))} if prod else None
+    if not combined:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Product not found")
 
-    brand_info = await brand_coll.find_one({"id": prod["brand_id"]})
-    combined = {**prod}
-    if brand_info:
-        combined.update({
-            "brand_kor": brand_info["brand_kor"],
-            "brand_eng": brand_info["brand_eng"],
-            "brand_like_count": brand_info["like_count"],
-        })
     try:
         return CombinedProduct(**combined)
     except Exception as e:
@@ -186,7 +437,11 @@ async def create_product(
     now = datetime.utcnow().timestamp()
     doc = product.dict(exclude_unset=True)
     doc.update({"created_at": now, "updated_at": now})
-    await collection.update_one({"id": doc["id"]}, {"$setOnInsert": doc}, upsert=True)
+    result = await collection.update_one({"id": doc["id"]}, {"$setOnInsert": doc}, upsert=True)
+    if result.upserted_id is not None:
+        count_strategy.invalidate()
+        search_index.upsert(doc)
+    recommend_notifier.mark_changed(doc["id"])
     return ProductBase(**doc)
 
 
@@ -222,6 +477,7 @@ async def like_product(
     )
     if update_result.matched_count == 0:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "상품을 찾을 수 없습니다.")
+    recommend_notifier.mark_event(body.user_id, id, "like")
     # 3) Redis set에 추가
     # await redis.sadd(f"likes:{id}", body.user_id)
 
@@ -257,6 +513,7 @@ async def unlike_product(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="상품을 찾을 수 없습니다."
         )
+    recommend_notifier.mark_event(user_id, id, "unlike")
     # await redis.srem(f"likes:{id}", user_id)
     return {"message": "좋아요가 취소되었습니다."}
 
@@ -291,6 +548,115 @@ async def get_user_liked_products(
     return UserLikedProductsResponse(user_id=user_id, like_products=ordered)
 
 
+@app.get(
+    "/product/user/{user_id}/events",
+    response_model=UserEventsResponse,
+    summary="사용자 행동 이력(좋아요/조회/구매 상품 ID) 조회 - 추천 프로필용"
+)
+async def get_user_events(
+        user_id: str,
+        limit: int = Query(200, ge=1, le=1000, description="종류별 최근 이력 개수"),
+        likes_coll: AsyncIOMotorCollection = Depends(get_likes_db),
+):
+    return await _user_history(likes_coll, user_id, limit)
+
+
+@app.post(
+    "/product/user/events/bulk",
+    response_model=List[UserEventsResponse],
+    summary="여러 사용자의 행동 이력 일괄 조회 - 추천 일괄 계산용"
+)
+async def get_users_events(
+        req: UserEventsBulkRequest,
+        likes_coll: AsyncIOMotorCollection = Depends(get_likes_db),
+):
+    # 사용자별 조회는 (user_id, 시각) 인덱스 + limit 으로 끝나므로 서버 안에서 동시에 실행
+    user_ids = list(dict.fromkeys(req.user_ids))
+    return await asyncio.gather(*(_user_history(likes_coll, uid, req.limit) for uid in user_ids))
+
+
+async def _user_history(likes_coll: AsyncIOMotorCollection, user_id: str, limit: int) -> UserEventsResponse:
+    # 종류별 최근 limit 건, 상품 ID 만 프로젝션
+    likes, views, purchases = await asyncio.gather(
+        likes_coll.find({"user_id": user_id}, {"id": 1})
+        .sort("created_at", -1).limit(limit).to_list(length=limit),
+        view_collection.find({"user_id": user_id}, {"product_id": 1})
+        .sort("viewed_at", -1).limit(limit).to_list(length=limit),
+        purchase_collection.find({"user_id": user_id}, {"product_id": 1})
+        .sort("purchased_at", -1).limit(limit).to_list(length=limit),
+    )
+    return UserEventsResponse(
+        user_id=user_id,
+        likes=[d["id"] for d in likes],
+        views=[d["product_id"] for d in views],
+        purchases=[d["product_id"] for d in purchases],
+    )
+
+
+def _bucket_pipeline(time_field: str, since: float, bucket_seconds: int) -> list:
+    # 기간 내 이벤트를 (상품, 시간 버킷) 단위로 집계
+    return [
+        {"$match": {time_field: {"$gte": since}}},
+        {"$group": {
+            "_id": {
+                "product_id": "$product_id",
+                "ts": {"$subtract": [f"${time_field}", {"$mod": [f"${time_field}", bucket_seconds]}]},
+            },
+            "count": {"$sum": 1},
+        }},
+    ]
+
+
+@app.get(
+    "/product/trending/events",
+    response_model=TrendingEventsResponse,
+    summary="최근 조회/구매 이벤트 시간 버킷 집계 - 추천 트렌딩용"
+)
+async def get_trending_events(
+        hours: int = Query(72, ge=1, le=24 * 30, description="집계 기간 (시간)"),
+        bucket_seconds: int = Query(3600, ge=60, le=86400, description="시간 버킷 크기 (초)"),
+):
+    since = datetime.utcnow().timestamp() - hours * 3600
+    views, purchases = await asyncio.gather(
+        view_collection.aggregate(_bucket_pipeline("viewed_at", since, bucket_seconds))
+        .to_list(length=None),
+        purchase_collection.aggregate(_bucket_pipeline("purchased_at", since, bucket_seconds))
+        .to_list(length=None),
+    )
+    events = [
+        {"product_id": d["_id"]["product_id"], "type": kind, "ts": d["_id"]["ts"], "count": d["count"]}
+        for kind, docs in (("view", views), ("purchase", purchases))
+        for d in docs
+    ]
+    return TrendingEventsResponse(since=since, bucket_seconds=bucket_seconds, events=events)
+
+
+@app.get(
+    "/product/events/export",
+    summary="좋아요/조회/구매 이벤트 NDJSON 스트리밍 - 추천 협업 필터링 학습용"
+)
+async def export_events(
+        since: Optional[float] = Query(None, description="이 시각(epoch) 이후 조회/구매만"),
+        likes_coll: AsyncIOMotorCollection = Depends(get_likes_db),
+):
+    # 컬렉션별 커서를 순서대로 흘려보내 전체 이벤트를 메모리에 올리지 않음
+    sources = [
+        (likes_coll, {}, {"user_id": 1, "id": 1}, "id", "like"),
+        (view_collection, {"viewed_at": {"$gte": since}} if since else {},
+         {"user_id": 1, "product_id": 1}, "product_id", "view"),
+        (purchase_collection, {"purchased_at": {"$gte": since}} if since else {},
+         {"user_id": 1, "product_id": 1}, "product_id", "purchase"),
+    ]
+
+    async def stream():
+        for coll, query, projection, id_field, kind in sources:
+            async for d in coll.find(query, projection).batch_size(10000):
+                row = {"user_id": d.get("user_id"), "product_id": d.get(id_field), "type": kind}
+                yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @app.put("/product/{id}", response_model=ProductBase)
 async def update_product(
         id: int,
@@ -308,7 +674,11 @@ async def update_product(
     result = await collection.update_one({"id": id}, {"$set": update_data})
     if result.matched_count == 0:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Product not found")
+    if any(field in update_data for field in FILTER_FIELDS):
+        count_strategy.invalidate()
+    recommend_notifier.mark_changed(id)
     updated_doc = await collection.find_one({"id": id})
+    search_index.upsert(updated_doc)
     return ProductBase(**updated_doc)
 
 
@@ -320,6 +690,9 @@ async def delete_product(
     result = await collection.delete_one({"id": id})
     if result.deleted_count == 0:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Product not found")
+    count_strategy.invalidate()
+    search_index.remove(id)
+    recommend_notifier.mark_changed(id)
 
 
 @app.post("/product/{id}/view", status_code=status.HTTP_204_NO_CONTENT)
@@ -334,6 +707,7 @@ async def view_product(
         "viewed_at": now
     })
     await product_collection.update_one({"id": id}, {"$inc": {"view_count": 1}})
+    recommend_notifier.mark_event(user_id, id, "view")
 
 
 @app.post("/product/{id}/purchase", status_code=status.HTTP_204_NO_CONTENT)
@@ -348,33 +722,34 @@ async def purchase_product(
         "purchased_at": now
     })
     await product_collection.update_one({"id": id}, {"$inc": {"purchase_count": 1}})
+    recommend_notifier.mark_event(user_id, id, "purchase")
 
 
 @app.post("/product/bulk", response_model=List[BulkProduct])
 async def bulk_products(
         req: BulkRequest,
         prod_coll: AsyncIOMotorCollection = Depends(get_db),
-        brand_coll: AsyncIOMotorCollection = Depends(get_brand_db),
+        brands: BrandCache = Depends(get_brand_cache),
 ):
-    # 1) 상품 일괄 조회
-    products = await prod_coll.find({"id": {"$in": req.product_ids}}).to_list(length=None)
-
-    # 2) 관련 브랜드 일괄 조회
-    brand_ids = [p["brand_id"] for p in products if p.get("brand_id") is not None]
-    brands = await brand_coll.find({"id": {"$in": brand_ids}}).to_list(length=None)
-    brand_map = {b["id"]: b for b in brands}
+    query = {"id": {"$in": req.product_ids}}
+    if BULK_READ_PATH == "aggregate":
+        # 1~2) 상품 조회 + 브랜드 조인을 한 번의 왕복으로
+        products = await prod_coll.aggregate(
+            product_lookup_pipeline(query, brand_collection=brand_collection.name)
+        ).to_list(length=None)
+    else:
+        # 1) 상품 일괄 조회
+        products = await prod_coll.find(query).to_list(length=None)
+
+        # 2) 관련 브랜드 조회 (캐시에 없는 브랜드만 DB 조회)
+        brand_map = await brands.get_many(p.get("brand_id") for p in products)
+        products = [{**p, **brand_fields(brand_map.get(p.get("brand_id")))} for p in products]
 
     # 3) BulkProduct 객체 생성 (brand_kor, brand_eng, brand_like_count 포함)
     result: List[BulkProduct] = []
     for p in products:
-        b = brand_map.get(p["brand_id"], {})
-        combined = {
-            **p,
-            "brand_kor": b.get("brand_kor"),
-            "brand_eng": b.get("brand_eng"),
-        }
         try:
-            result.append(BulkProduct(**combined))
+            result.append(BulkProduct(**p))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -414,6 +789,7 @@ async def like_brand(
     )
     if res.matched_count == 0:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "브랜드를 찾을 수 없습니다.")
+    brand_cache.invalidate(id)
 
     # 3) Redis에도 추가
     # await redis.sadd(f"brand:{id}:like_count", body.user_id)
@@ -453,6 +829,7 @@ async def unlike_brand(
             "created_at": datetime.utcnow()
         })
         raise HTTPException(status.HTTP_404_NOT_FOUND, "브랜드를 찾을 수 없습니다.")
+    brand_cache.invalidate(id)
 
     # 3) Redis에서도 제거
     # await redis.srem(f"brand:{id}:like_count", user_id)
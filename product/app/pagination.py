@@ -0,0 +1,131 @@
+# File: product/app/pagination.py
+"""
+상품 목록 keyset(커서) 페이지네이션.
+
+skip 기반 페이지는 깊이에 비례해 인덱스 항목을 건너뛰어야 하므로, 마지막 항목의
+(정렬 키, id) 를 커서로 넘겨 다음 페이지를 "그 위치 이후" 조건으로 조회합니다.
+
+    - 정렬은 항상 (정렬 필드, id) 복합 키 → 같은 값이 여러 개여도 순서가 유일
+    - 커서는 {정렬 이름, 마지막 값, 마지막 id} 의 base64url JSON (클라이언트는 내용을 해석하지 않음)
+    - 정렬 필드가 없는(null) 상품은 MongoDB 정렬 규칙대로 오름차순이면 맨 앞, 내림차순이면 맨 뒤
+    - 각 정렬은 (정렬 필드, id) / (major_category, 정렬 필드, id) 복합 인덱스를 사용
+    - 이름 검색의 관련도 순(relevance)은 검색 색인이 정렬하므로 커서는 결과 목록 내 위치(offset)
+"""
+import json
+import base64
+import binascii
+from typing import List, Optional, Tuple
+
+# 정렬 이름 → (필드, 방향). id 는 방향을 정렬 필드와 맞춤
+SORTS = {
+    "id": ("id", 1),
+    "newest": ("created_at", -1),
+    "popular": ("like_count", -1),
+    "price_asc": ("discounted_price", 1),
+    "price_desc": ("discounted_price", -1),
+}
+DEFAULT_SORT = "id"
+# 이름 검색 관련도 순 (검색 색인에서 정렬; 커서는 결과 목록 내 위치)
+RELEVANCE = "relevance"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def sort_spec(sort: str) -> List[Tuple[str, int]]:
+    """find().sort() / $sort 에 넘길 (필드, 방향) 목록."""
+    field, direction = SORTS[sort]
+    return [(field, direction)] if field == "id" else [(field, direction), ("id", direction)]
+
+
+def index_specs() -> List[Tuple[str, List[Tuple[str, int]]]]:
+    """
+    정렬별 복합 인덱스 (이름, 키) 목록. 인덱스는 역방향으로도 탐색되므로 필드당 하나
+    (price_asc / price_desc 가 같은 인덱스 사용). id 단독 정렬은 기존 unique 인덱스 사용.
+    """
+    specs = {}
+    for sort, (field, _) in SORTS.items():
+        keys = sort_spec(sort)
+        if field != "id":
+            specs.setdefault(f"idx_{field}_id", keys)
+        specs.setdefault(f"idx_major_category_{field}_id", [("major_category", 1)] + keys)
+    return list(specs.items())
+
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str, sort: str, *fields: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = tuple(payload[f] for f in fields)
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"잘못된 커서입니다: {e}") from e
+    if payload.get("s") != sort:
+        raise InvalidCursor(f"커서의 정렬({payload.get('s')})과 요청 정렬({sort})이 다릅니다")
+    return values
+
+
+def encode_cursor(sort: str, doc: dict) -> str:
+    """페이지 마지막 상품으로 다음 페이지 커서를 만듭니다."""
+    field, _ = SORTS[sort]
+    return _encode({"s": sort, "v": doc.get(field), "id": doc["id"]})
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[object, int]:
+    """
+    커서 → (마지막 정렬 값, 마지막 id).
+
+    Raises:
+        InvalidCursor: 형식이 잘못됐거나 다른 정렬로 만든 커서
+    """
+    last_value, last_id = _decode(cursor, sort, "v", "id")
+    try:
+        return last_value, int(last_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"잘못된 커서입니다: {e}") from e
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """관련도 순 검색 결과의 다음 페이지 커서 (결과 목록 내 위치)."""
+    return _encode({"s": RELEVANCE, "o": offset})
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    (offset,) = _decode(cursor, RELEVANCE, "o")
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor(f"잘못된 커서입니다: offset={offset}")
+    return offset
+
+
+def keyset_query(sort: str, last_value, last_id: int) -> dict:
+    """
+    정렬 순서상 (last_value, last_id) 이후 상품 조건.
+
+    null 은 MongoDB 에서 모든 값보다 작게 정렬되므로 오름차순이면 맨 앞, 내림차순이면 맨 뒤에 옵니다.
+    """
+    field, direction = SORTS[sort]
+    after = "$gt" if direction == 1 else "$lt"
+    if field == "id":
+        return {"id": {after: last_id}}
+
+    tie = {field: last_value, "id": {after: last_id}}
+    if last_value is None:
+        # 오름차순: 남은 null 다음 값 있는 상품 전부 / 내림차순: 남은 null 만
+        return {"$or": [tie, {field: {"$ne": None}}]} if direction == 1 else tie
+    branches = [{field: {after: last_value}}, tie]
+    if direction == -1:
+        branches.append({field: None})
+    return {"$or": branches}
+
+
+def apply_cursor(query: dict, sort: str, cursor: Optional[str]) -> dict:
+    """필터 조건에 커서 조건을 AND 로 붙입니다 (커서가 없으면 그대로)."""
+    if not cursor:
+        return query
+    condition = keyset_query(sort, *decode_cursor(cursor, sort))
+    return {"$and": [query, condition]} if query else condition
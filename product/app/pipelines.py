@@ -0,0 +1,99 @@
+# File: product/app/pipelines.py
+"""
+상품 + 브랜드 조회용 aggregation 파이프라인 (서버 측 조인).
+
+    - 브랜드 조인: $lookup(brand.id 인덱스) 후 CombinedProduct 에 필요한
+      brand_kor / brand_eng / brand_like_count 만 꺼내고 조인 결과는 버림
+    - 목록: $facet 으로 total 과 페이지를 한 번의 왕복으로 조회
+    - 상세 / 일괄: 상품 조회와 브랜드 조인을 한 번의 왕복으로 조회
+
+$lookup 은 localField / foreignField 형식만 사용합니다 (MongoDB 3.6+ 와
+mongomock 에서 동작; let / pipeline 형식은 mongomock 미지원).
+
+엔드포인트별 조회 경로는 환경 변수로 고릅니다 (기본 cache).
+    READ_PATH_LIST / READ_PATH_DETAIL / READ_PATH_BULK = cache | aggregate
+"""
+import os
+from typing import List, Optional, Tuple
+
+# 조회 경로: cache = 상품 조회 + BrandCache, aggregate = 서버 측 조인
+READ_PATHS = ("cache", "aggregate")
+
+# CombinedProduct 필드 ← 브랜드 필드
+BRAND_FIELDS = (("brand_kor", "brand_kor"), ("brand_eng", "brand_eng"), ("brand_like_count", "like_count"))
+
+
+def read_path(endpoint: str) -> str:
+    """엔드포인트(list / detail / bulk)의 조회 경로."""
+    path = os.getenv(f"READ_PATH_{endpoint.upper()}", "cache")
+    if path not in READ_PATHS:
+        raise ValueError(f"READ_PATH_{endpoint.upper()} 는 {READ_PATHS} 중 하나여야 합니다: {path}")
+    return path
+
+
+def brand_lookup_stages(brand_collection: str = "brand") -> List[dict]:
+    """상품 문서에 브랜드 필드를 붙이는 단계 (브랜드가 없으면 필드 없음)."""
+    return [
+        {"$lookup": {
+            "from": brand_collection, "localField": "brand_id", "foreignField": "id", "as": "_brand",
+        }},
+        {"$addFields": {
+            field: {"$arrayElemAt": [f"$_brand.{source}", 0]} for field, source in BRAND_FIELDS
+        }},
+        {"$project": {"_brand": 0}},
+    ]
+
+
+def product_page_pipeline(
+        query: dict,
+        skip: int,
+        limit: int,
+        brand_collection: str = "brand",
+        sort: Optional[List[Tuple[str, int]]] = None,
+) -> List[dict]:
+    """
+    목록 한 페이지 + 전체 개수 파이프라인. 결과는 문서 1개: {"total": [...], "items": [...]}.
+
+    $sort 는 $facet 앞에 두어 $match 와 함께 인덱스를 타게 하고, 브랜드 조인은
+    $skip / $limit 이후에 하므로 페이지에 나온 상품만 조인합니다.
+    """
+    return [
+        {"$match": query},
+        *([{"$sort": dict(sort)}] if sort else []),
+        {"$facet": {
+            "total": [{"$count": "n"}],
+            "items": [{"$skip": skip}, {"$limit": limit}] + brand_lookup_stages(brand_collection),
+        }},
+    ]
+
+
+def product_lookup_pipeline(
+        query: dict,
+        limit: Optional[int] = None,
+        brand_collection: str = "brand",
+        sort: Optional[List[Tuple[str, int]]] = None,
+        skip: int = 0,
+) -> List[dict]:
+    """
+    상세(limit=1) / 일괄($in) / 목록 페이지(sort + skip + limit) 조회 + 브랜드 조인 파이프라인.
+
+    커서 페이지(커서 조건은 $facet 안에서 인덱스를 못 탐)와 total 을 따로 계산하는
+    목록 조회는 $facet 대신 이 파이프라인을 씁니다.
+    """
+    stages = [{"$match": query}]
+    if sort:
+        stages.append({"$sort": dict(sort)})
+    if skip:
+        stages.append({"$skip": skip})
+    if limit:
+        stages.append({"$limit": limit})
+    return stages + brand_lookup_stages(brand_collection)
+
+
+def unpack_page(result: List[dict]) -> Tuple[int, List[dict]]:
+    """product_page_pipeline 결과 → (total, items). 매칭 문서가 없으면 total 단계가 비어 있음."""
+    if not result:
+        return 0, []
+    facet = result[0]
+    total = facet["total"][0]["n"] if facet["total"] else 0
+    return total, facet["items"]
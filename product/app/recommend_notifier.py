@@ -0,0 +1,81 @@
+# File: product/app/recommend_notifier.py
+"""
+추천 서비스 증분 업데이트 알림.
+
+상품 생성/수정/삭제 시 상품 ID 를 모아 두었다가 주기적으로 추천 서비스의
+POST /model/updates 로 한 번에 전달합니다. 좋아요/조회수 같은 카운터 변경은
+보내지 않습니다 (추천 서비스가 GET /product/counters 로 주기적 재학습 때 반영).
+사용자 행동 이벤트(조회/좋아요/구매)는 POST /profile/events 로 전달되어
+캐시된 사용자 프로필에 증분 반영됩니다.
+RECOMMEND_BASE_URL 이 설정되지 않으면 아무 동작도 하지 않습니다.
+"""
+import os
+import asyncio
+import logging
+from typing import List, Optional, Set
+
+import httpx
+
+logger = logging.getLogger("product")
+
+
+class RecommendNotifier:
+    def __init__(self, base_url: Optional[str], interval: float = 10.0, max_batch: int = 500):
+        self.url = f"{base_url}/model/updates" if base_url else None
+        self.events_url = f"{base_url}/profile/events" if base_url else None
+        self.interval = interval
+        self.max_batch = max_batch
+        self._pending: Set[int] = set()
+        self._events: List[dict] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.url is not None
+
+    def mark_changed(self, product_id: int) -> None:
+        if self.enabled:
+            self._pending.add(product_id)
+
+    def mark_event(self, user_id: str, product_id: int, kind: str) -> None:
+        if self.enabled:
+            self._events.append({"user_id": user_id, "product_id": product_id, "type": kind})
+
+    async def flush(self) -> int:
+        """대기 중인 상품 ID / 행동 이벤트를 max_batch 단위로 전송하고 전송 개수를 반환합니다."""
+        if not self._pending and not self._events:
+            return 0
+        ids, self._pending = list(self._pending), set()
+        events, self._events = self._events, []
+        sent = 0
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            for start in range(0, len(events), self.max_batch):
+                chunk = events[start:start + self.max_batch]
+                try:
+                    resp = await client.post(self.events_url, json={"events": chunk})
+                    resp.raise_for_status()
+                    sent += len(chunk)
+                except Exception as e:
+                    # 프로필 캐시는 TTL 만료 후 이력으로 다시 적재되므로 이벤트는 재전송하지 않음
+                    logger.warning(f"recommend_event_notify_failed\tcount={len(chunk)}\terror={e}")
+            for start in range(0, len(ids), self.max_batch):
+                chunk = ids[start:start + self.max_batch]
+                try:
+                    resp = await client.post(self.url, json={"product_ids": chunk})
+                    resp.raise_for_status()
+                    sent += len(chunk)
+                except Exception as e:
+                    # 실패분은 다음 주기에 재전송
+                    self._pending.update(chunk)
+                    logger.warning(f"recommend_notify_failed\tcount={len(chunk)}\terror={e}")
+        return sent
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+
+recommend_notifier = RecommendNotifier(
+    base_url=os.getenv("RECOMMEND_BASE_URL"),
+    interval=float(os.getenv("RECOMMEND_NOTIFY_INTERVAL", "10")),
+)
@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Brand(BaseModel):
@@ -40,8 +40,41 @@ class CombinedProduct(ProductBase, Brand):
 
 
 class PaginatedProducts(BaseModel):
-    total: int
+    # total_mode=none 이면 None. total_mode 는 실제 계산 방식 (exact / cached / estimated)
+    total: Optional[int] = None
+    total_mode: Optional[str] = None
     items: List[CombinedProduct]
+    # 다음 페이지 커서 (GET /product?after=...); 마지막 페이지면 None
+    next_cursor: Optional[str] = None
+
+
+class ProductCount(BaseModel):
+    total: int
+    total_mode: str
+
+
+class ProductSuggestion(BaseModel):
+    id: int
+    name: str
+
+
+class ProductSuggestions(BaseModel):
+    query: str
+    items: List[ProductSuggestion]
+
+
+class ProductCounter(BaseModel):
+    id: int
+    like_count: Optional[int] = 0
+    view_count: Optional[int] = 0
+    purchase_count: Optional[int] = 0
+    brand_like_count: Optional[int] = 0
+
+
+class ProductCounters(BaseModel):
+    items: List[ProductCounter]
+    # 다음 페이지 조회용 마지막 id (GET /product/counters?after_id=...); 마지막 페이지면 None
+    next_after_id: Optional[int] = None
 
 
 class BulkProduct(BaseModel):
@@ -65,10 +98,35 @@ class LikeProduct(BaseModel):
 class UserLikedProductsResponse(BaseModel):
     user_id: str
     like_products: List[LikeProduct]
+class UserEventsResponse(BaseModel):
+    user_id: str
+    likes: List[int]
+    views: List[int]
+    purchases: List[int]
+
+
+class TrendingBucket(BaseModel):
+    product_id: int
+    type: str        # view / purchase
+    ts: float        # 시간 버킷 시작 시각 (epoch)
+    count: int
+
+
+class TrendingEventsResponse(BaseModel):
+    since: float
+    bucket_seconds: int
+    events: List[TrendingBucket]
+
+
 class BulkRequest(BaseModel):
     product_ids: List[int]
 
 
+class UserEventsBulkRequest(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    limit: int = Field(200, ge=1, le=1000)  # 종류별 최근 이력 개수
+
+
 class LikeRequest(BaseModel):
     user_id: str
 
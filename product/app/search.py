@@ -0,0 +1,364 @@
+# File: product/app/search.py
+"""
+상품명 n-gram 역색인 (프로세스 내).
+
+$regex 이름 검색은 인덱스를 못 타고 요청마다 컬렉션 전체를 훑으므로, 상품명을
+글자 단위 n-gram 으로 색인해 두고 이름 검색 / 자동완성을 메모리에서 처리합니다.
+
+    - 정규화: NFKC + 소문자 + 공백 정리 (한글은 음절 단위, 영문은 대소문자 무시)
+    - 색인: 공백으로 나눈 토큰마다 글자 unigram + bigram → 상품 ID 집합
+    - 검색: 질의 토큰의 n-gram 포스팅 교집합(작은 것부터) 후, 토큰이 모두 상품명의
+      부분 문자열인지 확인 (기존 $regex 부분 일치를 포함하는 토큰 AND 일치)
+    - 순위: 질의 전체 일치 > 상품명 접두 일치 > 토큰 시작 일치 수 > 짧은 이름 > 좋아요 수 > id
+    - 자동완성: 같은 후보에서 상품명 접두 / 토큰 접두 일치를 우선한 상위 상품명
+    - 목록 필터(major_category / gender / brand_id)와 정렬 필드(created_at / like_count /
+      discounted_price)도 함께 보관해 필터 + 개수 + 정렬까지 메모리에서 계산
+      (Mongo 는 페이지 상품만 id 로 조회)
+
+시작 시 전체 상품을 적재하고, 이 워커의 상품 생성 / 수정 / 삭제는 바로 반영합니다.
+다른 워커의 생성 / 수정은 SEARCH_INDEX_POLL 초마다 updated_at 이 바뀐 상품을 조회해 반영하고,
+updated_at 이 바뀌지 않는 변경(삭제, 좋아요 수)은 SEARCH_INDEX_REFRESH 초마다 전체를 다시
+적재해 반영합니다. 적재 중에 들어온 변경은 적재가 끝난 뒤 다시 적용합니다.
+updated_at 은 초 / 밀리초 단위가 섞여 있으므로(시드 데이터는 밀리초) 초로 환산해 비교하고,
+숫자 updated_at 이 하나도 없으면 변경 조회 없이 전체 재적재에 맡깁니다.
+"""
+import os
+import time
+import heapq
+import bisect
+import asyncio
+import logging
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("product")
+
+# 전체 재적재 주기 (삭제 / 좋아요 수 반영) / updated_at 변경 조회 주기 (초)
+SEARCH_INDEX_REFRESH = float(os.getenv("SEARCH_INDEX_REFRESH", "300"))
+SEARCH_INDEX_POLL = float(os.getenv("SEARCH_INDEX_POLL", "2"))
+# 워커 간 시계 차이로 놓치지 않도록 마지막 updated_at 보다 이만큼 앞에서부터 다시 조회 (초)
+POLL_OVERLAP_SECONDS = 5.0
+# 이보다 큰 updated_at 은 epoch 밀리초로 간주 (초 단위라면 서기 5138년)
+MILLIS_THRESHOLD = 1e11
+
+# 색인에 필요한 상품 필드만 적재
+INDEX_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "major_category": 1, "gender": 1, "brand_id": 1, "like_count": 1,
+    "created_at": 1, "discounted_price": 1, "updated_at": 1,
+}
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text or "").lower().split())
+
+
+def token_grams(token: str) -> Set[str]:
+    """토큰의 글자 unigram + bigram."""
+    return set(token) | {token[i:i + 2] for i in range(len(token) - 1)}
+
+
+def query_grams(token: str) -> Set[str]:
+    """질의 토큰의 후보 조회용 n-gram (두 글자 이상이면 bigram 만으로 충분)."""
+    if len(token) == 1:
+        return {token}
+    return {token[i:i + 2] for i in range(len(token) - 1)}
+
+
+def updated_seconds(value) -> Optional[float]:
+    """updated_at → epoch 초 (밀리초 값은 환산, 숫자가 아니면 None)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value / 1000.0 if value > MILLIS_THRESHOLD else float(value)
+
+
+def changed_since(seconds: float) -> dict:
+    """updated_at 이 seconds(epoch 초) 이후인 상품 조건 (초 / 밀리초 단위 문서 모두)."""
+    return {"$or": [
+        {"updated_at": {"$gte": seconds, "$lte": MILLIS_THRESHOLD}},
+        {"updated_at": {"$gte": seconds * 1000.0}},
+    ]}
+
+
+@dataclass(frozen=True)
+class IndexedProduct:
+    id: int
+    name: str  # 정규화된 상품명 (검색용)
+    title: str  # 원래 상품명 (자동완성 표시용)
+    major_category: Optional[str]
+    gender: Optional[str]
+    brand_id: Optional[int]
+    like_count: int
+    created_at: Optional[float] = None
+    discounted_price: Optional[float] = None
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "IndexedProduct":
+        return cls(
+            id=doc["id"],
+            name=normalize(doc.get("name")),
+            title=doc.get("name") or "",
+            major_category=doc.get("major_category"),
+            gender=doc.get("gender"),
+            brand_id=doc.get("brand_id"),
+            like_count=doc.get("like_count") or 0,
+            created_at=doc.get("created_at"),
+            discounted_price=doc.get("discounted_price"),
+        )
+
+
+def sort_key(field: str, direction: int):
+    """
+    (값, id) → 정렬 키. MongoDB 정렬 규칙과 같게 null 은 오름차순이면 맨 앞, 내림차순이면 맨 뒤.
+    """
+    if direction == 1:
+        return lambda value, product_id: (value is not None, value if value is not None else 0, product_id)
+    return lambda value, product_id: (value is None, -value if value is not None else 0, -product_id)
+
+
+class ProductSearchIndex:
+    def __init__(self, collection, refresh_interval: float = SEARCH_INDEX_REFRESH):
+        self.collection = collection
+        self.refresh_interval = refresh_interval
+        self._products: Dict[int, IndexedProduct] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self.ready = False
+        self.loaded_at: Optional[float] = None
+        # 지금까지 본 가장 큰 updated_at (epoch 초, 변경 조회 기준)
+        self._high_water: Optional[float] = None
+        # 전체 적재 도중 들어온 변경 (id → 문서, 삭제면 None)
+        self._pending: Optional[Dict[int, Optional[dict]]] = None
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    # ───── 색인 갱신 ─────
+
+    def _add(self, products: Dict[int, IndexedProduct], postings: Dict[str, Set[int]], item: IndexedProduct):
+        products[item.id] = item
+        for token in item.name.split():
+            for gram in token_grams(token):
+                postings.setdefault(gram, set()).add(item.id)
+
+    def _remove(self, product_id: int) -> None:
+        item = self._products.pop(product_id, None)
+        if item is None:
+            return
+        for token in item.name.split():
+            for gram in token_grams(token):
+                ids = self._postings.get(gram)
+                if ids is not None:
+                    ids.discard(product_id)
+                    if not ids:
+                        del self._postings[gram]
+
+    def _observe(self, doc: dict) -> None:
+        updated_at = updated_seconds(doc.get("updated_at"))
+        if updated_at is not None and (self._high_water is None or updated_at > self._high_water):
+            self._high_water = updated_at
+
+    def upsert(self, doc: dict) -> None:
+        """상품 생성 / 수정 반영 (문서 전체 또는 INDEX_PROJECTION 필드)."""
+        self._observe(doc)
+        if self._pending is not None:
+            self._pending[doc["id"]] = doc
+        self._remove(doc["id"])
+        self._add(self._products, self._postings, IndexedProduct.from_doc(doc))
+
+    def remove(self, product_id: int) -> None:
+        if self._pending is not None:
+            self._pending[product_id] = None
+        self._remove(product_id)
+
+    async def load(self) -> int:
+        """전체 상품을 다시 적재해 색인을 통째로 교체합니다. 색인한 상품 수를 반환합니다."""
+        started = time.perf_counter()
+        self._pending = {}
+        try:
+            products: Dict[int, IndexedProduct] = {}
+            postings: Dict[str, Set[int]] = {}
+            async for doc in self.collection.find({}, INDEX_PROJECTION).batch_size(10000):
+                self._observe(doc)
+                self._add(products, postings, IndexedProduct.from_doc(doc))
+            pending = self._pending
+        finally:
+            self._pending = None
+        self._products, self._postings = products, postings
+        for product_id, doc in pending.items():
+            if doc is None:
+                self._remove(product_id)
+            else:
+                self.upsert(doc)
+        self.ready = True
+        self.loaded_at = time.monotonic()
+        logger.info(
+            f"search_index_loaded\tproducts={len(products)}\tgrams={len(postings)}"
+            f"\tseconds={time.perf_counter() - started:.3f}"
+        )
+        return len(products)
+
+    async def poll(self) -> int:
+        """
+        다른 워커가 생성 / 수정한 상품(updated_at 기준)을 반영합니다. 반영한 상품 수를 반환합니다.
+
+        기준 updated_at 이 없으면(적재 전, 숫자 updated_at 이 없는 카탈로그) 전체 조회가 되므로
+        조회하지 않고 refresh_interval 전체 재적재에 맡깁니다.
+        """
+        if self._high_water is None:
+            return 0
+        query = changed_since(self._high_water - POLL_OVERLAP_SECONDS)
+        docs = await self.collection.find(query, INDEX_PROJECTION).to_list(length=None)
+        for doc in docs:
+            self.upsert(doc)
+        return len(docs)
+
+    async def run(self, poll_interval: float = SEARCH_INDEX_POLL) -> None:
+        """시작 시 적재 후 poll_interval 마다 변경 상품을 반영하고, refresh_interval 마다 다시 적재합니다."""
+        while True:
+            try:
+                await self.load()
+            except Exception as e:
+                logger.warning(f"search_index_load_failed\terror={e}")
+                await asyncio.sleep(10.0)
+                continue
+            reload_at = time.monotonic() + self.refresh_interval
+            while time.monotonic() < reload_at:
+                await asyncio.sleep(poll_interval)
+                try:
+                    await self.poll()
+                except Exception as e:
+                    logger.warning(f"search_index_poll_failed\terror={e}")
+
+    # ───── 조회 ─────
+
+    def _candidates(self, tokens: List[str]) -> Iterable[int]:
+        grams = set().union(*(query_grams(t) for t in tokens))
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        if not postings or not postings[0]:
+            return ()
+        ids = set(postings[0])
+        for other in postings[1:]:
+            ids &= other
+            if not ids:
+                break
+        return ids
+
+    def _matches(
+            self,
+            query: str,
+            major_category: Optional[str] = None,
+            gender: Optional[str] = None,
+            brand_id: Optional[int] = None,
+    ) -> Tuple[str, List[str], List[IndexedProduct]]:
+        q = normalize(query)
+        tokens = q.split()
+        if not tokens:
+            return q, tokens, []
+        matched = []
+        for product_id in self._candidates(tokens):
+            item = self._products[product_id]
+            if major_category and item.major_category != major_category:
+                continue
+            if gender and item.gender != gender:
+                continue
+            if brand_id is not None and item.brand_id != brand_id:
+                continue
+            # n-gram 교집합은 후보일 뿐이므로 토큰 부분 일치를 확인
+            if all(t in item.name for t in tokens):
+                matched.append(item)
+        return q, tokens, matched
+
+    def search(
+            self,
+            query: str,
+            major_category: Optional[str] = None,
+            gender: Optional[str] = None,
+            brand_id: Optional[int] = None,
+            sort: Optional[Tuple[str, int]] = None,
+    ) -> List[int]:
+        """
+        이름 검색 결과 상품 ID (관련도 순 또는 sort 순).
+
+        Args:
+            query (str): 검색어
+            major_category, gender, brand_id: 목록 조회와 같은 동등 조건 필터
+            sort (tuple, optional): (정렬 필드, 방향). 생략 시 관련도 순
+
+        Returns:
+            list: 정렬된 상품 ID
+        """
+        q, tokens, matched = self._matches(query, major_category, gender, brand_id)
+        if sort is not None:
+            field, direction = sort
+            key = sort_key(field, direction)
+            return [item.id for item in sorted(matched, key=lambda item: key(getattr(item, field), item.id))]
+
+        def rank(item: IndexedProduct):
+            words = item.name.split()
+            word_starts = sum(any(w.startswith(t) for w in words) for t in tokens)
+            return (
+                -(q in item.name),
+                -item.name.startswith(q),
+                -word_starts,
+                len(item.name),
+                -item.like_count,
+                item.id,
+            )
+
+        return [item.id for item in sorted(matched, key=rank)]
+
+    def sort_value(self, product_id: int, field: str):
+        """색인에 보관한 상품의 정렬 필드 값 (커서 생성용)."""
+        return getattr(self._products[product_id], field)
+
+    def position_after(self, ids: List[int], sort: Tuple[str, int], last_value, last_id: int) -> int:
+        """
+        search(..., sort=sort) 결과 ids 에서 (last_value, last_id) 바로 다음 위치 (keyset 커서 페이지).
+        """
+        field, direction = sort
+        key = sort_key(field, direction)
+
+        def item_key(product_id: int):
+            return key(getattr(self._products[product_id], field), product_id)
+
+        return bisect.bisect_right(ids, key(last_value, last_id), key=item_key)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        자동완성 후보 (상품 ID, 상품명). 마지막 토큰은 입력 중인 접두어로 보고,
+        같은 이름은 한 번만 반환합니다.
+        """
+        q, tokens, matched = self._matches(prefix)
+        if not matched:
+            return []
+        last = tokens[-1]
+
+        def rank(item: IndexedProduct):
+            words = item.name.split()
+            return (
+                -item.name.startswith(q),
+                -any(w.startswith(last) for w in words),
+                -item.like_count,
+                len(item.name),
+                item.id,
+            )
+
+        seen: Set[str] = set()
+        results = []
+        # 중복 이름을 건너뛸 여유를 두고 상위 후보만 정렬
+        for item in heapq.nsmallest(limit * 3, matched, key=rank):
+            if item.name in seen:
+                continue
+            seen.add(item.name)
+            results.append((item.id, item.title))
+            if len(results) >= limit:
+                break
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "products": len(self._products),
+            "grams": len(self._postings),
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at else None,
+        }
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.brand_cache import BrandCache, brand_fields
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def _brands():
+    collection = mongomock_motor.AsyncMongoMockClient()["product"]["brand"]
+    asyncio.run(collection.insert_many([
+        {"id": i, "brand_kor": f"브랜드{i}", "brand_eng": f"brand{i}", "like_count": i} for i in range(1, 6)
+    ]))
+    return collection
+
+
+class _GatedCursor:
+    """to_list 결과를 읽은 뒤 gate 가 열릴 때까지 반환을 미루는 커서 (적재 도중 끼어들기 재현)."""
+
+    def __init__(self, cursor, gate):
+        self.cursor = cursor
+        self.gate = gate
+
+    async def to_list(self, length=None):
+        docs = await self.cursor.to_list(length=length)
+        await self.gate.wait()
+        return docs
+
+
+class _GatedCollection:
+    def __init__(self, collection):
+        self.collection = collection
+        self.gate = None
+
+    def find(self, *args, **kwargs):
+        cursor = self.collection.find(*args, **kwargs)
+        return _GatedCursor(cursor, self.gate) if self.gate is not None else cursor
+
+
+def test_get_many_fetches_only_missing_brands():
+    collection = _brands()
+
+    async def run():
+        cache = BrandCache(collection)
+        await cache.load()
+        await collection.insert_one({"id": 9, "brand_kor": "신규", "brand_eng": "new", "like_count": 0})
+        found = await cache.get_many([1, 9, None, 42])
+        return cache, found
+
+    cache, found = asyncio.run(run())
+    assert sorted(found) == [1, 9]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+    assert brand_fields(found[1]) == {"brand_kor": "브랜드1", "brand_eng": "brand1", "brand_like_count": 1}
+
+
+def test_invalidate_during_reload_does_not_restore_stale_brand():
+    gated = _GatedCollection(_brands())
+
+    async def run():
+        cache = BrandCache(gated)
+        await cache.load()
+        gated.gate = asyncio.Event()
+        reload = asyncio.create_task(cache.load())
+        await asyncio.sleep(0)
+        # 적재가 이전 값을 읽은 뒤 좋아요로 브랜드 3 이 바뀌고 무효화됨
+        await gated.collection.update_one({"id": 3}, {"$set": {"like_count": 99}})
+        cache.invalidate(3)
+        gated.gate.set()
+        await reload
+        gated.gate = None
+        return cache, await cache.get(3)
+
+    cache, brand = asyncio.run(run())
+    assert brand["like_count"] == 99
+    assert cache.stats()["reloads"] == 2 and cache.stats()["size"] == 5
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from app.counts import CountStrategy
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+class _CountingCollection:
+    """count_documents 호출 수를 세고, gate 가 있으면 열릴 때까지 결과 반환을 미룸."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.calls = 0
+        self.gate = None
+        self.error = None
+
+    async def count_documents(self, query):
+        self.calls += 1
+        count = await self.collection.count_documents(query)
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return count
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock_motor.AsyncMongoMockClient()["product"]["product"]
+    asyncio.run(collection.insert_many([
+        {"id": i, "name": f"상품 {i}", "major_category": "top" if i % 4 else "bag",
+         "gender": "M" if i % 2 else "F", "brand_id": i % 5}
+        for i in range(1, 101)
+    ]))
+    return _CountingCollection(collection)
+
+
+def test_concurrent_misses_share_one_count(collection):
+    counts = CountStrategy(collection)
+
+    async def run():
+        collection.gate = asyncio.Event()
+        waiters = [asyncio.create_task(counts.cached({"major_category": "top"})) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        collection.gate.set()
+        results = await asyncio.gather(*waiters)
+        collection.gate = None
+        return results, await counts.cached({"major_category": "top"})
+
+    results, cached = asyncio.run(run())
+    assert results == [75] * 5 and cached == 75
+    assert collection.calls == 1
+    assert counts.stats()["hits"] == 1 and counts.stats()["misses"] == 5
+
+
+def test_invalidate_during_count_skips_store(collection):
+    counts = CountStrategy(collection)
+
+    async def run():
+        collection.gate = asyncio.Event()
+        pending = asyncio.create_task(counts.cached({}))
+        await asyncio.sleep(0.01)
+        # 계산 도중 상품이 추가되어 무효화되면 이전 세대 결과는 캐시하지 않음
+        await collection.insert_one({"id": 101, "major_category": "top"})
+        counts.invalidate()
+        collection.gate.set()
+        stale = await pending
+        collection.gate = None
+        return stale, await counts.cached({})
+
+    stale, fresh = asyncio.run(run())
+    assert stale == 100 and fresh == 101
+    assert collection.calls == 2
+
+
+def test_failed_count_reaches_waiters_and_is_not_cached(collection):
+    counts = CountStrategy(collection)
+
+    async def run():
+        collection.gate = asyncio.Event()
+        collection.error = RuntimeError("mongo down")
+        waiters = [asyncio.create_task(counts.cached({"gender": "M"})) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        collection.gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        collection.gate = None
+        collection.error = None
+        return results, await counts.cached({"gender": "M"})
+
+    results, count = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert count == 50 and collection.calls == 2
+
+
+def test_modes(collection):
+    counts = CountStrategy(collection)
+
+    async def run():
+        return [
+            await counts.total({"major_category": "top"}, "exact"),
+            await counts.total({"major_category": "top", "gender": "M"}, "estimated"),
+            await counts.total({"name": {"$regex": "상품"}}, "estimated"),
+            await counts.total({}, "none"),
+        ]
+
+    exact, estimated, fallback, none = asyncio.run(run())
+    assert exact == (75, "exact")
+    # 필드 간 독립 가정: 100 × 0.75 × 0.5
+    assert estimated == (38, "estimated")
+    assert fallback == (100, "cached")
+    assert none == (None, None)
@@ -0,0 +1,117 @@
+import asyncio
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.pagination import (
+    SORTS,
+    InvalidCursor,
+    apply_cursor,
+    decode_cursor,
+    encode_cursor,
+    keyset_query,
+    sort_spec,
+)
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def _docs():
+    docs = []
+    for i in range(1, 41):
+        doc = {"id": i, "name": f"상품 셔츠 {i}", "brand_id": 1, "major_category": "top", "updated_at": 1.0}
+        # 정렬 필드가 없는(null) 상품과 같은 값이 여러 개인 상품을 섞음
+        if i % 5:
+            doc["like_count"] = i % 4
+            doc["discounted_price"] = float(i % 3) * 1000
+            doc["created_at"] = float(i % 6)
+        docs.append(doc)
+    return docs
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock_motor.AsyncMongoMockClient()["product"]["product"]
+    asyncio.run(collection.insert_many(_docs()))
+    return collection
+
+
+async def _pages(collection, sort, query, size):
+    ids, cursor = [], None
+    while True:
+        page = await collection.find(apply_cursor(query, sort, cursor)).sort(sort_spec(sort)) \
+            .limit(size).to_list(length=size)
+        ids += [d["id"] for d in page]
+        if len(page) < size:
+            return ids
+        cursor = encode_cursor(sort, page[-1])
+
+
+@pytest.mark.parametrize("sort", list(SORTS))
+def test_keyset_pages_match_full_sort_with_nulls(collection, sort):
+    async def run():
+        expected = await collection.find({"major_category": "top"}).sort(sort_spec(sort)).to_list(length=None)
+        pages = await _pages(collection, sort, {"major_category": "top"}, size=3)
+        return [d["id"] for d in expected], pages
+
+    expected, pages = asyncio.run(run())
+    assert pages == expected and len(pages) == 40
+
+
+def test_null_cursor_branches():
+    # 오름차순: 남은 null 뒤에 값이 있는 상품 전부 / 내림차순: 남은 null 만
+    assert keyset_query("price_asc", None, 7) == {
+        "$or": [{"discounted_price": None, "id": {"$gt": 7}}, {"discounted_price": {"$ne": None}}]
+    }
+    assert keyset_query("popular", None, 7) == {"like_count": None, "id": {"$lt": 7}}
+    assert {"like_count": None} in keyset_query("popular", 3, 7)["$or"]
+    assert {"discounted_price": None} not in keyset_query("price_asc", 3, 7)["$or"]
+
+
+def test_invalid_and_mismatched_cursors():
+    cursor = encode_cursor("popular", {"id": 5, "like_count": 2})
+    assert decode_cursor(cursor, "popular") == (2, 5)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "price_asc")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "popular")
+
+
+@pytest.fixture
+def client(collection, monkeypatch, tmp_path):
+    for key in ("DB_USER", "MONGO_PASSWORD", "MONGO_URL", "MONGO_DB"):
+        monkeypatch.setenv(key, "test")
+    monkeypatch.setenv("MONGO_PORT", "27017")
+    monkeypatch.chdir(tmp_path)
+    main = importlib.import_module("app.main")
+    search = main.ProductSearchIndex(collection)
+    asyncio.run(search.load())
+
+    async def db():
+        return collection
+
+    async def index():
+        return search
+
+    monkeypatch.setattr(main.app.router, "on_startup", [])
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_db, db)
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_brand_cache,
+                        lambda: main.BrandCache(collection.database["brand"]))
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_count_strategy,
+                        lambda: main.CountStrategy(collection))
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_search_index, index)
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("name", [None, "셔츠"])
+def test_cursor_from_other_sort_is_rejected(client, name):
+    params = {"sort": "popular", "size": 5, **({"name": name} if name else {})}
+    first = client.get("/product", params=params)
+    assert first.status_code == 200 and first.json()["next_cursor"]
+
+    after = first.json()["next_cursor"]
+    assert client.get("/product", params={**params, "after": after}).status_code == 200
+    mismatched = client.get("/product", params={**params, "sort": "price_asc", "after": after})
+    assert mismatched.status_code == 400
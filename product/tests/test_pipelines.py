@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.brand_cache import BrandCache, brand_fields
+from app.pipelines import product_lookup_pipeline, product_page_pipeline, unpack_page
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture
+def db():
+    db = mongomock_motor.AsyncMongoMockClient()["product"]
+
+    async def seed():
+        await db["brand"].insert_many([
+            {"id": b, "brand_kor": f"브랜드{b}", "brand_eng": f"brand{b}", "like_count": b * 10} for b in (1, 2)
+        ])
+        # brand_id 3 은 브랜드 컬렉션에 없음
+        await db["product"].insert_many([
+            {"id": i, "name": f"상품 {i}", "brand_id": i % 4 or None, "major_category": "top" if i % 2 else "bag"}
+            for i in range(1, 21)
+        ])
+
+    asyncio.run(seed())
+    return db
+
+
+async def _cached(db, docs):
+    cache = BrandCache(db["brand"])
+    brands = await cache.get_many(d.get("brand_id") for d in docs)
+    return [{**d, **brand_fields(brands.get(d.get("brand_id")))} for d in docs]
+
+
+def _strip(docs):
+    return [{k: v for k, v in d.items() if k != "_id"} for d in docs]
+
+
+def test_page_pipeline_matches_find_plus_brand_cache(db):
+    query = {"major_category": "top"}
+
+    async def run():
+        result = await db["product"].aggregate(
+            product_page_pipeline(query, skip=2, limit=4, sort=[("id", -1)])
+        ).to_list(length=1)
+        docs = await db["product"].find(query).sort("id", -1).skip(2).limit(4).to_list(length=4)
+        return unpack_page(result), await _cached(db, docs)
+
+    (total, items), expected = asyncio.run(run())
+    assert total == 10
+    assert _strip(items) == _strip(expected)
+    assert "_brand" not in items[0]
+
+
+def test_lookup_pipeline_joins_bulk_and_missing_brands(db):
+    async def run():
+        items = await db["product"].aggregate(
+            product_lookup_pipeline({"id": {"$in": [1, 2, 3, 4]}}, sort=[("id", 1)])
+        ).to_list(length=None)
+        return {d["id"]: d for d in items}
+
+    items = asyncio.run(run())
+    assert items[1]["brand_kor"] == "브랜드1" and items[2]["brand_like_count"] == 20
+    # 브랜드가 없거나(3) brand_id 가 없는(4) 상품은 브랜드 필드 없이 반환
+    assert "brand_kor" not in items[3] and "brand_kor" not in items[4]
+    assert unpack_page([]) == (0, [])
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from app.pagination import SORTS, sort_spec
+from app.search import ProductSearchIndex
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def _docs():
+    docs = []
+    for i in range(1, 31):
+        doc = {"id": i, "name": f"{'셔츠' if i % 3 else '바지'} {i}", "major_category": "top",
+               "like_count": i % 4, "updated_at": 100.0}
+        if i % 5:
+            doc["discounted_price"] = float(i % 3) * 1000
+            doc["created_at"] = float(i % 6)
+        docs.append(doc)
+    return docs
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock_motor.AsyncMongoMockClient()["product"]["product"]
+    asyncio.run(collection.insert_many(_docs()))
+    return collection
+
+
+class _GatedCursor:
+    """첫 문서를 넘긴 뒤 gate 가 열릴 때까지 나머지 적재를 멈추는 커서."""
+
+    def __init__(self, docs, gate):
+        self.docs = docs
+        self.gate = gate
+
+    def batch_size(self, _):
+        return self
+
+    async def __aiter__(self):
+        for n, doc in enumerate(self.docs):
+            if n == 1:
+                await self.gate.wait()
+            yield doc
+
+
+class _GatedCollection:
+    def __init__(self, docs, gate):
+        self.docs = docs
+        self.gate = gate
+
+    def find(self, *args, **kwargs):
+        return _GatedCursor(self.docs, self.gate)
+
+
+def test_changes_during_load_are_replayed():
+    docs = _docs()
+
+    async def run():
+        gate = asyncio.Event()
+        index = ProductSearchIndex(_GatedCollection(docs, gate))
+        loading = asyncio.create_task(index.load())
+        await asyncio.sleep(0)
+        # 적재가 이전 문서를 읽는 도중 이 워커에서 생성 / 수정 / 삭제
+        index.upsert({"id": 100, "name": "새 셔츠", "updated_at": 200.0})
+        index.upsert({"id": 2, "name": "모자", "updated_at": 201.0})
+        index.remove(4)
+        gate.set()
+        await loading
+        return index
+
+    index = asyncio.run(run())
+    assert index.ready and len(index) == 30
+    shirts = index.search("셔츠")
+    assert 100 in shirts and 2 not in shirts and 4 not in shirts
+    assert index.search("모자") == [2]
+    assert index._pending is None
+
+
+def test_poll_applies_changes_from_other_workers(collection):
+    async def run():
+        index = ProductSearchIndex(collection)
+        await index.load()
+        await collection.insert_one({"id": 500, "name": "새 셔츠", "updated_at": 200.0})
+        await collection.update_one({"id": 1}, {"$set": {"name": "모자", "updated_at": 201.0}})
+        await index.poll()
+        # 다음 조회는 마지막 updated_at 에서 겹침 구간만큼 앞부터
+        return index, await index.poll()
+
+    index, polled = asyncio.run(run())
+    assert polled == 2
+    assert 500 in index.search("셔츠") and 1 not in index.search("셔츠")
+    assert index.search("모자") == [1]
+
+
+@pytest.mark.parametrize("sort", [s for s in SORTS if s != "id"])
+def test_sorted_search_and_paging_match_mongo(collection, sort):
+    async def run():
+        index = ProductSearchIndex(collection)
+        await index.load()
+        docs = await collection.find({"name": {"$regex": "셔츠"}}).sort(sort_spec(sort)).to_list(length=None)
+        return index, [d["id"] for d in docs]
+
+    index, expected = asyncio.run(run())
+    ids = index.search("셔츠", sort=SORTS[sort])
+    assert ids == expected
+
+    field = SORTS[sort][0]
+    for position, product_id in enumerate(ids):
+        after = index.position_after(ids, SORTS[sort], index.sort_value(product_id, field), product_id)
+        assert after == position + 1
+
+
+class _CountingCollection:
+    def __init__(self, collection):
+        self.collection = collection
+        self.finds = []
+
+    def find(self, *args, **kwargs):
+        self.finds.append(args[0] if args else {})
+        return self.collection.find(*args, **kwargs)
+
+
+def test_poll_without_updated_at_skips_full_scan():
+    collection = mongomock_motor.AsyncMongoMockClient()["product"]["product"]
+    asyncio.run(collection.insert_many([{"id": i, "name": f"셔츠 {i}"} for i in range(1, 6)]))
+    counting = _CountingCollection(collection)
+
+    async def run():
+        index = ProductSearchIndex(counting)
+        await index.load()
+        return index, await index.poll()
+
+    index, polled = asyncio.run(run())
+    # 전체 적재 1회만 조회하고 변경 조회는 전체 재적재에 맡김
+    assert polled == 0 and counting.finds == [{}]
+    assert len(index) == 5
+
+
+def test_poll_handles_millisecond_updated_at():
+    collection = mongomock_motor.AsyncMongoMockClient()["product"]["product"]
+    asyncio.run(collection.insert_many([
+        {"id": 1, "name": "셔츠 1", "updated_at": 1747470000000},
+        {"id": 2, "name": "셔츠 2", "updated_at": 1747477938000},
+        {"id": 4, "name": "셔츠 4", "updated_at": 1747400000000},
+    ]))
+
+    async def run():
+        index = ProductSearchIndex(collection)
+        await index.load()
+        # 다른 워커의 초 단위 수정 + 밀리초 단위 수정
+        await collection.insert_one({"id": 3, "name": "새 셔츠", "updated_at": 1747477950.0})
+        await collection.update_one({"id": 1}, {"$set": {"name": "모자", "updated_at": 1747477960000}})
+        return index, await index.poll()
+
+    index, polled = asyncio.run(run())
+    # 겹침 구간의 2번 + 변경된 1, 3번 (오래된 밀리초 문서는 다시 읽지 않음)
+    assert polled == 3
+    assert index.search("모자") == [1] and 3 in index.search("셔츠")
+    assert index._high_water == 1747477960.0
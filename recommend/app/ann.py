@@ -0,0 +1,218 @@
+# recommend/app/ann.py
+"""
+아이템 간 유사도 검색 백엔드.
+
+    - ExactBackend: 블록 단위 brute-force 코사인 (기준 구현)
+    - IVFBackend:   k-means coarse quantizer 기반 근사 검색 (IVF-Flat)
+
+get_backend(name, **params) 로 설정값(SIMILARITY_BACKEND 등)에 따라 선택합니다.
+두 백엔드 모두 L2 정규화된 피처 위에서 내적 = 코사인 유사도로 계산합니다.
+"""
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+from .neighbors import (
+    NeighborIndex,
+    build_neighbor_index,
+    l2_normalize,
+    similarity_block,
+    to_dense,
+    topk_from_scores,
+    DEFAULT_BLOCK_BYTES,
+)
+
+
+class SimilarityBackend:
+    """
+    유사도 검색 백엔드 공통 인터페이스.
+
+    fit(features) 후 query(vectors, k) 로 임의 벡터의 상위 k 아이템을,
+    build_neighbor_index(top_k) 로 전체 아이템의 이웃 인덱스를 만듭니다.
+    """
+    name = None
+
+    def fit(self, features: np.ndarray) -> "SimilarityBackend":
+        raise NotImplementedError
+
+    def query(self, vectors: np.ndarray, k: int, exclude_rows=None) -> tuple:
+        """
+        Args:
+            vectors (np.ndarray): q × d 쿼리 벡터
+            k (int): 쿼리당 반환 개수
+            exclude_rows (array-like, optional): 쿼리별로 제외할 행 인덱스 (길이 q, 자기 자신 제외용)
+
+        Returns:
+            tuple: (q × k 행 인덱스 int32, q × k 점수 float32). 후보가 모자라면 -1 / -inf
+        """
+        raise NotImplementedError
+
+    def build_neighbor_index(self, top_k: int) -> NeighborIndex:
+        raise NotImplementedError
+
+
+class ExactBackend(SimilarityBackend):
+    name = "exact"
+
+    def __init__(self, block_bytes: int = DEFAULT_BLOCK_BYTES):
+        self.block_bytes = block_bytes
+        self.features = None
+
+    def fit(self, features: np.ndarray) -> "ExactBackend":
+        self.features = l2_normalize(features)
+        return self
+
+    def query(self, vectors: np.ndarray, k: int, exclude_rows=None) -> tuple:
+        vectors = l2_normalize(np.atleast_2d(to_dense(vectors)))
+        n = self.features.shape[0]
+        k = min(k, n)
+        ids = np.empty((len(vectors), k), dtype=np.int32)
+        scores = np.empty((len(vectors), k), dtype=np.float32)
+        block_rows = max(1, int(self.block_bytes // (n * 4)))
+        for start in range(0, len(vectors), block_rows):
+            stop = start + block_rows
+            sim = similarity_block(vectors[start:stop], self.features)
+            if exclude_rows is not None:
+                rows = np.asarray(exclude_rows[start:stop])
+                sim[np.arange(len(rows)), rows] = -np.inf
+            ids[start:stop], scores[start:stop] = topk_from_scores(sim, k)
+        return ids, scores
+
+    def build_neighbor_index(self, top_k: int) -> NeighborIndex:
+        return build_neighbor_index(self.features, top_k=top_k, block_bytes=self.block_bytes)
+
+
+class IVFBackend(SimilarityBackend):
+    """
+    Inverted-file 근사 검색.
+
+    spherical k-means 로 n_lists 개 중심을 학습하고 각 아이템을 가장 가까운 중심의
+    리스트에 배정합니다. 쿼리는 가까운 중심 n_probe 개의 리스트만 정확히 채점합니다.
+    리스트별로 피처를 연속 배치해 두어 후보 채점이 슬라이스 행렬곱이 되도록 합니다.
+    """
+    name = "ivf"
+
+    def __init__(
+        self,
+        n_lists: int = None,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        max_train_rows: int = 50_000,
+        seed: int = 0
+    ):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.max_train_rows = max_train_rows
+        self.seed = seed
+
+    def _assign(self, features: np.ndarray, block_rows: int = 8192) -> np.ndarray:
+        labels = np.empty(features.shape[0], dtype=np.int32)
+        for start in range(0, features.shape[0], block_rows):
+            labels[start:start + block_rows] = np.argmax(
+                features[start:start + block_rows] @ self.centroids.T, axis=1
+            )
+        return labels
+
+    def fit(self, features: np.ndarray) -> "IVFBackend":
+        # 희소(CSR) 피처는 CSR 그대로 사용 (배정은 희소 × 밀집 중심, 중심 갱신은 배정 행렬 곱)
+        features = l2_normalize(features)
+        n = features.shape[0]
+        # 기본 리스트 수: √n (최소 1)
+        n_lists = min(n, self.n_lists or max(1, int(np.sqrt(n))))
+        rng = np.random.default_rng(self.seed)
+
+        # 1) 학습 샘플에서 spherical k-means (중심은 n_lists × d 밀집)
+        train = features[rng.choice(n, min(n, self.max_train_rows), replace=False)]
+        self.centroids = to_dense(train[rng.choice(train.shape[0], n_lists, replace=False)]).astype(np.float32)
+        for _ in range(self.n_iter):
+            labels = self._assign(train)
+            # 리스트별 합 = (n_lists × n_train 배정 행렬) @ train
+            assign = sp.csr_matrix(
+                (np.ones(len(labels), dtype=np.float32), (labels, np.arange(len(labels)))),
+                shape=(n_lists, len(labels)),
+            )
+            sums = np.asarray(to_dense(assign @ train), dtype=np.float32)
+            empty = ~sums.any(axis=1)
+            # 빈 리스트는 임의 샘플로 재시작
+            if empty.any():
+                sums[empty] = to_dense(train[rng.choice(train.shape[0], int(empty.sum()))])
+            self.centroids = l2_normalize(sums)
+
+        # 2) 전체 아이템 배정 후 리스트 순서로 재배치
+        labels = self._assign(features)
+        self.order = np.argsort(labels, kind='stable').astype(np.int32)
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=n_lists))))
+        self.list_features = features[self.order]
+        self.labels = labels
+        return self
+
+    def query(self, vectors: np.ndarray, k: int, exclude_rows=None) -> tuple:
+        vectors = l2_normalize(np.atleast_2d(to_dense(vectors)))
+        n_probe = min(self.n_probe, len(self.centroids))
+        probes = np.argpartition(-(vectors @ self.centroids.T), n_probe - 1, axis=1)[:, :n_probe]
+        exclude = None if exclude_rows is None else np.asarray(exclude_rows)
+
+        ids = np.full((len(vectors), k), -1, dtype=np.int32)
+        scores = np.full((len(vectors), k), -np.inf, dtype=np.float32)
+        # 리스트별로 그 리스트를 탐색하는 쿼리를 모아 한 번의 행렬곱으로 채점한 뒤,
+        # 쿼리별 누적 상위 k 와 병합
+        probe_lists = probes.ravel()
+        probe_queries = np.repeat(np.arange(len(vectors)), n_probe)
+        order = np.argsort(probe_lists, kind='stable')
+        bounds = np.searchsorted(probe_lists[order], np.arange(len(self.centroids) + 1))
+        for lst in range(len(self.centroids)):
+            a, b = self.offsets[lst], self.offsets[lst + 1]
+            queries = probe_queries[order[bounds[lst]:bounds[lst + 1]]]
+            if a == b or len(queries) == 0:
+                continue
+            cand_ids = self.order[a:b]
+            cand_scores = similarity_block(vectors[queries], self.list_features[a:b])
+            if exclude is not None:
+                cand_scores[cand_ids[None, :] == exclude[queries][:, None]] = -np.inf
+            merged_ids = np.concatenate([ids[queries], np.broadcast_to(cand_ids, cand_scores.shape)], axis=1)
+            merged_scores = np.concatenate([scores[queries], cand_scores], axis=1)
+            top_pos, top_scores = topk_from_scores(merged_scores, k)
+            ids[queries] = np.take_along_axis(merged_ids, top_pos, axis=1)
+            scores[queries] = top_scores
+        ids[np.isneginf(scores)] = -1
+        return ids, scores
+
+    def build_neighbor_index(self, top_k: int, block_rows: int = 8192) -> NeighborIndex:
+        # 원래 행 순서의 피처를 블록 단위로 쿼리 (희소 피처는 블록만 밀집으로 변환)
+        n = self.list_features.shape[0]
+        k = max(1, min(top_k, n - 1))
+        features = self.list_features[np.argsort(self.order)]
+        ids = np.empty((n, k), dtype=np.int32)
+        scores = np.empty((n, k), dtype=np.float32)
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            ids[start:stop], scores[start:stop] = self.query(
+                features[start:stop], k, exclude_rows=np.arange(start, stop)
+            )
+        return NeighborIndex(ids=ids, scores=scores)
+
+
+BACKENDS = {
+    ExactBackend.name: ExactBackend,
+    IVFBackend.name: IVFBackend,
+}
+
+
+def get_backend(name: str = None, **params) -> SimilarityBackend:
+    """
+    이름으로 유사도 백엔드를 생성합니다.
+
+    name 을 생략하면 환경변수 SIMILARITY_BACKEND (기본 exact)를 사용하고,
+    IVF 파라미터는 IVF_N_LISTS / IVF_N_PROBE 환경변수로도 지정할 수 있습니다.
+    """
+    name = name or os.getenv("SIMILARITY_BACKEND", "exact")
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 유사도 백엔드: {name}")
+    if name == IVFBackend.name:
+        if os.getenv("IVF_N_LISTS"):
+            params.setdefault("n_lists", int(os.environ["IVF_N_LISTS"]))
+        if os.getenv("IVF_N_PROBE"):
+            params.setdefault("n_probe", int(os.environ["IVF_N_PROBE"]))
+    return BACKENDS[name](**params)
@@ -0,0 +1,245 @@
+# recommend/app/batch.py
+"""
+여러 사용자에 대한 일괄 추천 (캠페인 발송용 API / 오프라인 작업 공용).
+
+    1) 프로필이 있는 사용자: 프로필 벡터를 블록 단위로 쌓아 features.T 와 행렬곱
+    2) 프로필이 없는 사용자: 인기 순위(있으면) 또는 기준 아이템 이웃 목록 일괄 조회
+    3) 필터 / 다양성 재정렬은 온라인 추천(recommend_for_user)과 같은 방식으로 적용
+    4) 결과의 상품 ID 를 중복 제거하여 bulk 조회로 hydration
+    5) 사용자별 결과를 NDJSON 한 줄씩 스트리밍 (API 는 사용자 블록 단위로 계산 → hydration → 전송)
+
+오프라인 실행 (인기 순위 / CF / 다양성 재정렬은 API 와 같은 기본값, 필터는 옵션으로 지정):
+    python -m app.batch --model_dir model --user_ids_path users.txt \\
+        --events_path events.ndjson --top_n 6 --out recs.ndjson
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from .cosine_recsys import recommend_items_batch
+from .profiles import UserProfile, build_profile, score_profiles_batch_rows
+from .popularity import PopularityRanker, build_ranker, decayed_counts
+from .filters import ItemFilter
+from .rerank import Reranker, reranker_from_env
+from .hydration import fetch_bulk_sync
+from . import model_store, collaborative
+
+logger = logging.getLogger("recommend")
+
+# 프로필 채점 블록의 점수 버퍼 상한 (bytes)
+BATCH_BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def recommend_many(
+    model: model_store.RecModel,
+    user_ids: List[str],
+    top_n: int = 6,
+    profiles: Optional[Dict[str, UserProfile]] = None,
+    block_bytes: int = BATCH_BLOCK_BYTES,
+    popularity: Optional[PopularityRanker] = None,
+    cf=None,
+    cf_weight: float = 0.0,
+    item_filter: Optional[ItemFilter] = None,
+    reranker: Optional[Reranker] = None
+) -> List[Tuple[str, np.ndarray]]:
+    """
+    user_ids 각각의 top_n 추천 상품 ID 를 계산합니다 (입력 순서 유지).
+
+    사용자별 결과는 model_store.recommend_for_user 와 같습니다 (필터 / 다양성 재정렬 포함).
+
+    Args:
+        model (RecModel): 현재 모델
+        user_ids (list): 사용자 ID 목록
+        top_n (int): 사용자당 추천 개수
+        profiles (dict, optional): user_id → UserProfile. 없거나 비어 있으면 인기 순위 / 기준 아이템 방식
+        block_bytes (int): 프로필 채점 블록당 점수 버퍼 상한
+        popularity (PopularityRanker, optional): 이력 없는 사용자에게 인기 순위를 사용
+        cf (CFIndex, optional): 프로필 사용자 점수에 섞을 협업 필터링 인덱스
+        cf_weight (float): CF 점수 비율 [0, 1]
+        item_filter (ItemFilter, optional): 후보 필터
+        reranker (Reranker, optional): 다양성 재정렬 (프로필 / 기준 아이템 경로)
+
+    Returns:
+        list: [(user_id, 상품 ID 배열), ...]
+    """
+    profiles = profiles or {}
+    results: List[Optional[np.ndarray]] = [None] * len(user_ids)
+    mask = model.filter_index.mask(item_filter)
+    pool = top_n if reranker is None else reranker.pool(top_n)
+
+    def pick(rows: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        rows = rows[rows >= 0]
+        rows = rows[:top_n] if reranker is None else reranker.rerank(model, rows, scores[:len(rows)], top_n)
+        return model.item_ids[rows]
+
+    has_profile = [uid in profiles and not profiles[uid].is_empty for uid in user_ids]
+    with_profile = [i for i, flag in enumerate(has_profile) if flag]
+    without_profile = [i for i, flag in enumerate(has_profile) if not flag]
+
+    # 1) 프로필 사용자: (B × d) @ (d × n) 블록 행렬곱 (필터 마스크는 채점 단계에서 적용)
+    block = max(1, int(block_bytes // (model.n_items * 4)))
+    for start in range(0, len(with_profile), block):
+        rows = with_profile[start:start + block]
+        top_idx, top_scores = score_profiles_batch_rows(
+            model, [profiles[user_ids[i]] for i in rows], pool, cf=cf, cf_weight=cf_weight, mask=mask
+        )
+        for i, idx, scores in zip(rows, top_idx, top_scores):
+            results[i] = pick(idx, scores)
+
+    # 2) 이력 없는 사용자: 인기 순위는 한 번만 계산해 공유 (필터 후보가 부족하면 사용자별로 채움)
+    if without_profile and popularity is not None:
+        popular = model_store.filtered_popular(model, popularity, top_n, item_filter, mask)
+        for i in without_profile:
+            results[i] = model_store.fill_from_anchor(model, user_ids[i], popular, top_n, mask)
+    elif without_profile and mask is None and reranker is None:
+        anchors = [model_store.anchor_item_index(model, user_ids[i]) for i in without_profile]
+        top_idx = recommend_items_batch(model.neighbors, anchors, top_n=top_n)
+        for i, idx in zip(without_profile, top_idx):
+            results[i] = model.item_ids[idx[idx >= 0]]
+    else:
+        # 필터 / 재정렬이 있으면 기준 아이템마다 후보를 골라야 하므로 온라인 경로와 같은 조회
+        for i in without_profile:
+            rows, scores = model.similar_rows(
+                model_store.anchor_item_index(model, user_ids[i]), pool, mask=mask
+            )
+            results[i] = pick(rows, scores)
+
+    return list(zip(user_ids, results))
+
+
+def unique_product_ids(results: Iterable[Tuple[str, np.ndarray]]) -> List[int]:
+    """전체 사용자 결과의 상품 ID 를 등장 순서대로 중복 제거합니다."""
+    seen = dict.fromkeys(int(pid) for _, ids in results for pid in ids)
+    return list(seen)
+
+
+def iter_ndjson(
+    results: Iterable[Tuple[str, np.ndarray]],
+    hydrated: Optional[dict] = None
+) -> Iterator[str]:
+    """
+    사용자별 결과를 NDJSON 줄로 변환합니다. hydrated({id: RecommendItem})가 주어지면
+    recommends 필드에 상품 정보를, 아니면 product_id 목록만 담습니다.
+    """
+    for user_id, ids in results:
+        if hydrated is None:
+            row = {"user_id": user_id, "product_id": [int(pid) for pid in ids]}
+        else:
+            row = {
+                "user_id": user_id,
+                "recommends": [
+                    hydrated[int(pid)].model_dump() for pid in ids if int(pid) in hydrated
+                ],
+            }
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def load_profiles_from_events(events_path: str, user_ids: set) -> Dict[str, UserProfile]:
+    """
+    {"user_id", "product_id", "type"} NDJSON 행동 이벤트 파일로 대상 사용자 프로필을 만듭니다.
+    """
+    events: Dict[str, list] = {}
+    with open(events_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            e = json.loads(line)
+            if e["user_id"] in user_ids:
+                events.setdefault(e["user_id"], []).append((e["product_id"], e["type"]))
+    return {uid: build_profile(uid, evs) for uid, evs in events.items()}
+
+
+def build_popularity(model: model_store.RecModel, client=None, product_base_url: Optional[str] = None,
+                     trending_hours: int = 72) -> PopularityRanker:
+    """
+    API 와 같은 인기 순위를 빌드합니다. product_base_url 이 있으면 최근 조회 / 구매 집계를 섞고,
+    집계를 못 가져오면 누적 지표만 사용합니다.
+    """
+    trending = None
+    if client is not None and product_base_url:
+        try:
+            resp = client.get(f"{product_base_url}/trending/events", params={"hours": trending_hours})
+            resp.raise_for_status()
+            trending = decayed_counts(resp.json()["events"])
+        except Exception as e:
+            logger.warning(f"trending_fetch_failed\terror={e}")
+    return build_ranker(model.items, trending)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='일괄 추천 오프라인 작업 (NDJSON 출력)')
+    parser.add_argument('--model_dir', required=True, help='모델 아티팩트 디렉토리')
+    parser.add_argument('--user_ids_path', required=True, help='사용자 ID 목록 파일 (한 줄에 하나)')
+    parser.add_argument('--events_path', default=None, help='행동 이벤트 NDJSON (프로필 생성용)')
+    parser.add_argument('--top_n', type=int, default=6, help='사용자당 추천 개수')
+    parser.add_argument('--product_base_url', default=None,
+                        help='지정 시 {url}/bulk 로 상품 정보를 채우고 {url}/trending/events 를 인기 순위에 반영')
+    parser.add_argument('--cf_dir', default=None,
+                        help='CF 인덱스 디렉토리 (생략 시 CF_DIR, 없으면 model_dir 옆의 cf)')
+    parser.add_argument('--cf_weight', type=float, default=None, help='CF 혼합 비율 (생략 시 CF_BLEND_WEIGHT)')
+    parser.add_argument('--trending_hours', type=int, default=int(os.getenv("TRENDING_WINDOW_HOURS", "72")),
+                        help='인기 순위에 반영할 최근 이벤트 기간 (시간)')
+    parser.add_argument('--mmr_lambda', type=float, default=None,
+                        help='다양성 재정렬 MMR 가중치 (생략 시 RERANK_LAMBDA)')
+    parser.add_argument('--gender', default=None)
+    parser.add_argument('--major_category', default=None)
+    parser.add_argument('--brand_id', type=int, action='append', default=None, help='허용 브랜드 (반복 지정)')
+    parser.add_argument('--min_price', type=float, default=None)
+    parser.add_argument('--max_price', type=float, default=None)
+    parser.add_argument('--out', default=None, help='출력 파일 경로 (생략 시 stdout)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s\t%(levelname)s\t%(message)s')
+    with open(args.user_ids_path, encoding="utf-8") as f:
+        user_ids = [line.strip() for line in f if line.strip()]
+    model = model_store.load_model(args.model_dir)
+    profiles = (
+        load_profiles_from_events(args.events_path, set(user_ids)) if args.events_path else None
+    )
+
+    # API(/recommend/batch)와 같은 인기 순위 / CF / 필터 / 다양성 재정렬 구성
+    cf_dir = args.cf_dir or os.getenv(
+        "CF_DIR", os.path.join(os.path.dirname(os.path.abspath(args.model_dir)), "cf")
+    )
+    cf = collaborative.load_cf(cf_dir)
+    cf_weight = 0.0 if cf is None else (
+        collaborative.CF_BLEND_WEIGHT if args.cf_weight is None else args.cf_weight
+    )
+    item_filter = ItemFilter(
+        gender=args.gender,
+        major_category=args.major_category,
+        brand_ids=tuple(args.brand_id) if args.brand_id else None,
+        min_price=args.min_price,
+        max_price=args.max_price,
+    )
+    reranker = reranker_from_env().with_lambda(args.mmr_lambda)
+
+    with httpx.Client() as client:
+        popularity = build_popularity(model, client, args.product_base_url, args.trending_hours)
+        results = recommend_many(
+            model, user_ids, top_n=args.top_n, profiles=profiles, popularity=popularity,
+            cf=cf, cf_weight=cf_weight, item_filter=item_filter, reranker=reranker,
+        )
+        hydrated = None
+        if args.product_base_url:
+            hydrated = fetch_bulk_sync(
+                client, f"{args.product_base_url}/bulk", unique_product_ids(results)
+            )
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for line in iter_ndjson(results, hydrated):
+            out.write(line)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
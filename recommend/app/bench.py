@@ -0,0 +1,515 @@
+# recommend/app/bench.py
+"""
+추천 모델 구성 요소의 메모리 / 지연시간 벤치마크.
+
+각 벤치마크는 결과를 dict 리스트로 반환하고, 스크립트 실행 시 JSON Lines 로 출력합니다.
+합성 데이터는 고정 시드로 생성되므로 같은 환경에서는 같은 입력으로 재현됩니다.
+
+    python -m app.bench neighbors --sizes 10000 100000 1000000
+    python -m app.cli bench pipeline --scale medium --out bench.jsonl
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import scipy
+import scipy.sparse as sp
+import sklearn
+
+from .ann import ExactBackend, IVFBackend
+from .neighbors import build_neighbor_index, l2_normalize, to_dense
+from .model_store import build_model_from_frame
+from .rerank import Reranker
+from .cosine_recsys import (
+    FEATURE_COLUMNS,
+    build_preprocessor,
+    compute_feature_matrix,
+    evaluate_semantic_similarity,
+    load_data,
+)
+from .snapshot import convert_json, read_snapshot
+from .evaluation import evaluate_topk
+
+
+# 합성 카탈로그 규모 프리셋 (아이템 수)
+SCALES = {
+    "small": [10_000],
+    "medium": [100_000],
+    "large": [1_000_000],
+    "all": [10_000, 100_000, 1_000_000],
+}
+
+
+def environment() -> dict:
+    """벤치마크 결과 비교용 실행 환경 정보."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "sklearn": sklearn.__version__,
+        "pandas": pd.__version__,
+        "cpu_count": os.cpu_count(),
+        "machine": platform.machine(),
+    }
+
+
+def synthetic_features(
+    n_items: int,
+    n_features: int = 32,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    벤치마크용 합성 피처 매트릭스 (n_items × n_features, float32)를 생성합니다.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.random((n_items, n_features), dtype=np.float32)
+
+
+def synthetic_catalog(
+    n_items: int,
+    n_brands: int = 1_000,
+    n_categories: int = 50,
+    seed: int = 0
+) -> tuple:
+    """
+    load_data 입력과 같은 스키마의 합성 상품 / 브랜드 DataFrame 을 생성합니다.
+
+    Returns:
+        tuple: (product_df, brand_df)
+    """
+    rng = np.random.default_rng(seed)
+    price = rng.integers(5_000, 300_000, n_items)
+    discount = rng.integers(0, 80, n_items)
+    product_df = pd.DataFrame({
+        'id': np.arange(1, n_items + 1),
+        'name': [f'상품 {i}' for i in range(1, n_items + 1)],
+        'discounted_price': (price * (100 - discount) // 100),
+        'category_code': rng.integers(0, n_categories, n_items).astype(str),
+        'discount': discount,
+        'major_category': rng.choice(['top', 'bottom', 'outer', 'shoes', 'bag'], n_items),
+        'gender': rng.choice(['M', 'F', 'U'], n_items),
+        'img_url': '',
+        'like_count': rng.zipf(1.8, n_items).clip(0, 10**6),
+        'view_count': rng.zipf(1.6, n_items).clip(0, 10**7),
+        'purchase_count': rng.zipf(2.0, n_items).clip(0, 10**5),
+        'rank': rng.integers(1, 1_000, n_items),
+        'price': price,
+        'brand_id': rng.integers(1, n_brands + 1, n_items),
+    })
+    brand_df = pd.DataFrame({
+        'id': np.arange(1, n_brands + 1),
+        'brand_kor': [f'브랜드{i}' for i in range(1, n_brands + 1)],
+        'brand_eng': [f'brand{i}' for i in range(1, n_brands + 1)],
+        'like_count': rng.zipf(1.5, n_brands).clip(0, 10**6),
+    })
+    return product_df, brand_df
+
+
+def write_synthetic_json(n_items: int, out_dir: str, **kwargs) -> tuple:
+    """합성 카탈로그를 줄 단위 JSON 파일로 저장하고 (product_path, brand_path)를 반환합니다."""
+    product_df, brand_df = synthetic_catalog(n_items, **kwargs)
+    product_path = os.path.join(out_dir, 'product.json')
+    brand_path = os.path.join(out_dir, 'brand.json')
+    product_df.to_json(product_path, orient='records', lines=True, force_ascii=False)
+    brand_df.to_json(brand_path, orient='records', lines=True, force_ascii=False)
+    return product_path, brand_path
+
+
+def synthetic_clustered_features(
+    n_items: int,
+    n_features: int = 32,
+    n_clusters: int = 256,
+    noise: float = 0.3,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    군집 구조가 있는 합성 피처 매트릭스를 생성합니다.
+
+    실제 카탈로그는 카테고리/성별 one-hot 때문에 군집을 이루므로,
+    근사 검색 백엔드의 recall 측정에는 균등 난수보다 이 분포가 현실에 가깝습니다.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, n_features), dtype=np.float32)
+    assign = rng.integers(0, n_clusters, n_items)
+    noise_arr = rng.standard_normal((n_items, n_features), dtype=np.float32) * noise
+    return centers[assign] + noise_arr
+
+
+def recall_at_k(approx_ids: np.ndarray, exact_ids: np.ndarray) -> float:
+    """근사 결과가 정확 결과의 상위 k 중 몇 개를 찾았는지 평균 비율로 반환합니다."""
+    hits = [len(np.intersect1d(a[a >= 0], e)) for a, e in zip(approx_ids, exact_ids)]
+    return float(np.mean(hits) / exact_ids.shape[1])
+
+
+def _measure(fn, *args, **kwargs) -> tuple:
+    """fn 실행 결과와 (소요 시간 초, tracemalloc 피크 bytes)를 반환합니다."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_neighbor_index(
+    sizes: list,
+    top_k: int = 50,
+    max_build_rows: int = 5_000,
+    n_queries: int = 1000
+) -> list:
+    """
+    NeighborIndex 빌드 시간 / 피크 메모리 / 조회 지연시간을 측정합니다.
+
+    n_items 가 max_build_rows 보다 크면 쿼리 행 일부만 빌드하고
+    전체 빌드 시간은 행 수 비율로 외삽합니다 (build_extrapolated=True).
+
+    Args:
+        sizes (list): 합성 아이템 수 목록 (예: [10_000, 100_000, 1_000_000])
+        top_k (int): 아이템당 이웃 수
+        max_build_rows (int): 실제로 빌드할 최대 쿼리 행 수
+        n_queries (int): 조회 지연시간 측정 횟수
+
+    Returns:
+        list: 크기별 측정 결과 dict
+    """
+    reports = []
+    for n in sizes:
+        features = synthetic_features(n)
+        rows = None
+        if n > max_build_rows:
+            rows = np.random.default_rng(1).choice(n, max_build_rows, replace=False)
+        built_rows = n if rows is None else len(rows)
+
+        index, elapsed, peak = _measure(build_neighbor_index, features, top_k=top_k, rows=rows)
+
+        rng = np.random.default_rng(2)
+        queries = rng.integers(0, index.n_items, n_queries)
+        start = time.perf_counter()
+        for q in queries:
+            index.neighbors(int(q), 6)
+        lookup_us = (time.perf_counter() - start) / n_queries * 1e6
+
+        reports.append({
+            "bench": "neighbor_index",
+            "n_items": n,
+            "top_k": index.k,
+            "built_rows": built_rows,
+            "build_extrapolated": rows is not None,
+            "build_seconds": round(elapsed * n / built_rows, 3),
+            "build_peak_mb": round(peak / 2**20, 1),
+            "index_mb": round(n * index.k * 8 / 2**20, 1),
+            "dense_matrix_mb": round(n * n * 8 / 2**20, 1),
+            "lookup_us": round(lookup_us, 2),
+        })
+    return reports
+
+
+def bench_evaluation(
+    sizes: list,
+    ks=(6, 10, 20),
+    n_categories: int = 200,
+    max_legacy_items: int = 5_000
+) -> list:
+    """
+    evaluate_semantic_similarity (iterrows) 와 evaluate_topk (블록 벡터화)의 소요 시간을 비교합니다.
+
+    기존 방식은 n_items 가 max_legacy_items 이하일 때만 실행합니다.
+    """
+    reports = []
+    for n in sizes:
+        features = synthetic_features(n)
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame({
+            'id': np.arange(n),
+            'category_code': rng.integers(0, n_categories, n).astype(str),
+        })
+        index = build_neighbor_index(features, top_k=max(ks))
+        report = {"bench": "evaluation", "n_items": n, "ks": list(ks)}
+
+        if n <= max_legacy_items:
+            start = time.perf_counter()
+            evaluate_semantic_similarity(df, index, K=ks[0])
+            report["legacy_seconds"] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        metrics = evaluate_topk(df, index, ks=ks)
+        report["vectorized_seconds"] = round(time.perf_counter() - start, 3)
+
+        n_jobs = os.cpu_count() or 1
+        if n_jobs > 1:
+            start = time.perf_counter()
+            evaluate_topk(df, index, ks=ks, n_jobs=n_jobs)
+            report[f"vectorized_{n_jobs}proc_seconds"] = round(time.perf_counter() - start, 3)
+
+        report["metrics"] = {key: round(v, 4) for key, v in metrics.items()}
+        reports.append(report)
+    return reports
+
+
+def bench_ann(
+    sizes: list,
+    k: int = 10,
+    n_queries: int = 500,
+    n_probe: int = 8
+) -> list:
+    """
+    ExactBackend 대비 IVFBackend 의 쿼리 지연시간 / speedup / recall@k 를 측정합니다.
+    """
+    reports = []
+    for n in sizes:
+        features = synthetic_clustered_features(n)
+        queries = np.random.default_rng(4).choice(n, n_queries, replace=False)
+
+        exact = ExactBackend().fit(features)
+        start = time.perf_counter()
+        exact_ids, _ = exact.query(features[queries], k, exclude_rows=queries)
+        exact_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ivf = IVFBackend(n_probe=n_probe).fit(features)
+        fit_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        ivf_ids, _ = ivf.query(features[queries], k, exclude_rows=queries)
+        ivf_seconds = time.perf_counter() - start
+
+        reports.append({
+            "bench": "ann",
+            "n_items": n,
+            "k": k,
+            "n_lists": len(ivf.centroids),
+            "n_probe": n_probe,
+            "ivf_fit_seconds": round(fit_seconds, 3),
+            "exact_query_ms": round(exact_seconds / n_queries * 1e3, 3),
+            "ivf_query_ms": round(ivf_seconds / n_queries * 1e3, 3),
+            "speedup": round(exact_seconds / ivf_seconds, 2),
+            f"recall@{k}": round(recall_at_k(ivf_ids, exact_ids), 4),
+        })
+    return reports
+
+
+def bench_snapshot(sizes: list, repeat: int = 3) -> list:
+    """
+    load_data (JSON 파싱 + merge) 와 read_snapshot (mmap) 의 카탈로그 로드 시간을 비교합니다.
+    """
+    reports = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            product_path, brand_path = write_synthetic_json(n, tmp)
+            snap_path = os.path.join(tmp, 'catalog.snap')
+            start = time.perf_counter()
+            convert_json(product_path, brand_path, snap_path)
+            convert_seconds = time.perf_counter() - start
+
+            json_times, snap_times = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                load_data(product_path, brand_path)
+                json_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                read_snapshot(snap_path, mmap=True)
+                snap_times.append(time.perf_counter() - start)
+
+            snap_bytes = sum(
+                os.path.getsize(os.path.join(snap_path, f)) for f in os.listdir(snap_path)
+            )
+            reports.append({
+                "bench": "snapshot",
+                "n_items": n,
+                "json_mb": round((os.path.getsize(product_path) + os.path.getsize(brand_path)) / 2**20, 1),
+                "snapshot_mb": round(snap_bytes / 2**20, 1),
+                "convert_seconds": round(convert_seconds, 3),
+                "load_data_ms": round(min(json_times) * 1e3, 2),
+                "read_snapshot_ms": round(min(snap_times) * 1e3, 2),
+                "speedup": round(min(json_times) / min(snap_times), 1),
+            })
+    return reports
+
+
+def _feature_bytes(features) -> int:
+    if sp.issparse(features):
+        return features.data.nbytes + features.indices.nbytes + features.indptr.nbytes
+    return features.nbytes
+
+
+def bench_sparse(
+    sizes: list,
+    n_categories: int = 5_000,
+    top_k: int = 50,
+    neighbor_rows: int = 2_000
+) -> list:
+    """
+    밀집 / 희소(CSR) 전처리 모드의 fit 시간, 피크 메모리, 피처 크기,
+    이웃 빌드 시간(neighbor_rows 행 기준)을 비교합니다.
+
+    category_code 카디널리티(n_categories)가 클수록 원-핫 블록이 넓어져 차이가 커집니다.
+    """
+    reports = []
+    for n in sizes:
+        product_df, brand_df = synthetic_catalog(n, n_categories=n_categories)
+        df = product_df.merge(brand_df, left_on='brand_id', right_on='id',
+                              how='left', suffixes=('', '_brand'))
+        rows = np.random.default_rng(5).choice(n, min(n, neighbor_rows), replace=False)
+        report = {"bench": "sparse", "n_items": n, "n_categories": n_categories}
+        neighbor_ids = {}
+        for mode, sparse in (("dense", False), ("sparse", True)):
+            preprocessor = build_preprocessor(**FEATURE_COLUMNS, sparse=sparse)
+            features, fit_seconds, fit_peak = _measure(
+                lambda: l2_normalize(compute_feature_matrix(df, preprocessor))
+            )
+            index, build_seconds, _ = _measure(build_neighbor_index, features, top_k=top_k, rows=rows)
+            neighbor_ids[mode] = index.ids
+            report.update({
+                f"{mode}_fit_seconds": round(fit_seconds, 3),
+                f"{mode}_fit_peak_mb": round(fit_peak / 2**20, 1),
+                f"{mode}_features_mb": round(_feature_bytes(features) / 2**20, 1),
+                f"{mode}_neighbor_build_seconds": round(build_seconds * n / len(rows), 3),
+            })
+            n_features = features.shape[1]
+        report["n_features"] = n_features
+        report["neighbors_equal"] = float(np.mean(neighbor_ids["dense"] == neighbor_ids["sparse"]))
+        report["features_mb_ratio"] = round(
+            report["dense_features_mb"] / max(report["sparse_features_mb"], 0.1), 1
+        )
+        reports.append(report)
+    return reports
+
+
+def bench_pipeline(
+    sizes: list,
+    top_k: int = 50,
+    n_categories: int = 200,
+    max_build_rows: int = 5_000,
+    sparse: bool = False
+) -> list:
+    """
+    load_data → build_preprocessor / compute_feature_matrix → 이웃 빌드의 단계별 시간 / 피크 메모리.
+
+    이웃 빌드는 n_items 가 max_build_rows 보다 크면 일부 쿼리 행만 계산하고 외삽합니다.
+    """
+    reports = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            product_path, brand_path = write_synthetic_json(n, tmp, n_categories=n_categories)
+            df, load_seconds, load_peak = _measure(load_data, product_path, brand_path)
+
+        preprocessor = build_preprocessor(**FEATURE_COLUMNS, sparse=sparse)
+        features, fit_seconds, fit_peak = _measure(
+            lambda: l2_normalize(compute_feature_matrix(df, preprocessor))
+        )
+
+        rows = None
+        if n > max_build_rows:
+            rows = np.random.default_rng(1).choice(n, max_build_rows, replace=False)
+        built_rows = n if rows is None else len(rows)
+        index, build_seconds, build_peak = _measure(build_neighbor_index, features, top_k=top_k, rows=rows)
+
+        reports.append({
+            "bench": "pipeline",
+            "n_items": n,
+            "n_categories": n_categories,
+            "n_features": int(features.shape[1]),
+            "sparse": sparse,
+            "top_k": index.k,
+            "load_seconds": round(load_seconds, 3),
+            "load_peak_mb": round(load_peak / 2**20, 1),
+            "preprocess_seconds": round(fit_seconds, 3),
+            "preprocess_peak_mb": round(fit_peak / 2**20, 1),
+            "neighbors_seconds": round(build_seconds * n / built_rows, 3),
+            "neighbors_peak_mb": round(build_peak / 2**20, 1),
+            "neighbors_extrapolated": rows is not None,
+        })
+    return reports
+
+
+def bench_rerank(
+    sizes: list,
+    top_n: int = 6,
+    pool_sizes: tuple = (20, 50, 100, 200),
+    mmr_lambda: float = 0.7,
+    max_per_brand: int = 2,
+    n_queries: int = 500
+) -> list:
+    """
+    기준 아이템 이웃 조회 대비 다양성 재정렬(MMR + 브랜드 cap)의 추가 지연과
+    상위 top_n 의 브랜드 / 카테고리 다양성, 관련도 손실을 측정합니다.
+    """
+    reports = []
+    for n in sizes:
+        product_df, brand_df = synthetic_catalog(n, n_brands=max(10, n // 200))
+        df = product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left',
+                              suffixes=('', '_brand'))
+        model = build_model_from_frame(df, top_k=max(pool_sizes), backend='exact', sparse=False)
+        anchors = np.random.default_rng(2).integers(0, n, n_queries)
+        brand, category = model.rerank_codes
+        features = to_dense(model.features)
+
+        def _run(pool_size, reranker):
+            picked, started = [], time.perf_counter()
+            for a in anchors:
+                rows, scores = model.similar_rows(int(a), pool_size)
+                picked.append(rows[:top_n] if reranker is None
+                              else reranker.rerank(model, rows, scores, top_n))
+            elapsed = (time.perf_counter() - started) / len(anchors)
+            return picked, elapsed
+
+        baseline, base_seconds = _run(top_n, None)
+        base_rel = np.mean([model.neighbors.scores[a, :top_n].mean() for a in anchors])
+        for pool_size in pool_sizes:
+            reranker = Reranker(mmr_lambda=mmr_lambda, pool_size=pool_size, max_per_brand=max_per_brand)
+            picked, seconds = _run(pool_size, reranker)
+            rel = np.mean([(features[rows] @ features[a]).mean() for a, rows in zip(anchors, picked)])
+            reports.append({
+                "bench": "rerank",
+                "n_items": n,
+                "top_n": top_n,
+                "pool_size": pool_size,
+                "mmr_lambda": mmr_lambda,
+                "max_per_brand": max_per_brand,
+                "baseline_us": round(base_seconds * 1e6, 1),
+                "rerank_us": round(seconds * 1e6, 1),
+                "overhead_us": round((seconds - base_seconds) * 1e6, 1),
+                "distinct_brands": round(float(np.mean([len(set(brand[r])) for r in picked])), 2),
+                "distinct_brands_baseline": round(float(np.mean([len(set(brand[r])) for r in baseline])), 2),
+                "distinct_categories": round(float(np.mean([len(set(category[r])) for r in picked])), 2),
+                "distinct_categories_baseline": round(
+                    float(np.mean([len(set(category[r])) for r in baseline])), 2),
+                "mean_relevance": round(float(rel), 4),
+                "mean_relevance_baseline": round(float(base_rel), 4),
+            })
+    return reports
+
+
+BENCHMARKS = {
+    "ann": bench_ann,
+    "neighbors": bench_neighbor_index,
+    "evaluation": bench_evaluation,
+    "snapshot": bench_snapshot,
+    "sparse": bench_sparse,
+    "pipeline": bench_pipeline,
+    "rerank": bench_rerank,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='추천 모델 벤치마크')
+    parser.add_argument('bench', choices=sorted(BENCHMARKS), help='실행할 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='합성 아이템 수 목록')
+    args = parser.parse_args()
+
+    for report in BENCHMARKS[args.bench](args.sizes):
+        sys.stdout.write(json.dumps(report) + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+# recommend/app/cli.py
+"""
+오프라인 학습 / 평가 / 벤치마크 CLI.
+
+    python -m app.cli gen --scale medium --out_dir data/synthetic --snapshot
+    python -m app.cli build --product_path data/product.json --brand_path data/brand.json --model_dir model
+    python -m app.cli evaluate --model_dir model --ks 6 10 --baseline eval_baseline.json
+    python -m app.cli bench pipeline --scale small --out bench.jsonl
+
+모든 서브커맨드는 결과를 JSON 으로 stdout 에 출력합니다 (bench 는 JSON Lines).
+evaluate 에 --baseline 을 주면 기준 리포트보다 지표가 tolerance 이상 떨어졌을 때
+종료 코드 1 로 끝나므로, 모델 배포 전 CI 단계에서 회귀 검사에 사용할 수 있습니다.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+
+from . import bench
+from .cosine_recsys import load_data
+from .evaluation import evaluate_topk
+from .model_store import (
+    DEFAULT_TOP_K,
+    build_model_from_frame,
+    load_model,
+    publish_lock,
+    save_model,
+)
+from .snapshot import convert_json, read_snapshot
+
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB). Linux 는 KB, macOS 는 byte 단위로 보고됩니다."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def _emit(report: dict, out_path: str = None) -> None:
+    line = json.dumps(report, ensure_ascii=False)
+    sys.stdout.write(line + "\n")
+    if out_path:
+        with open(out_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _load_frame(args):
+    if args.snapshot:
+        return read_snapshot(args.snapshot, mmap=True), {"snapshot_path": args.snapshot}
+    if not (args.product_path and args.brand_path):
+        raise SystemExit("--snapshot 또는 --product_path/--brand_path 가 필요합니다")
+    df = load_data(args.product_path, args.brand_path)
+    return df, {"product_path": args.product_path, "brand_path": args.brand_path}
+
+
+def cmd_build(args) -> int:
+    """데이터 로드 → 전처리 → 유사도 → 저장 단계별 시간과 피크 메모리를 보고합니다."""
+    started = time.perf_counter()
+    df, source = _load_frame(args)
+    loaded = time.perf_counter()
+
+    model = build_model_from_frame(
+        df, top_k=args.top_k, backend=args.backend, source=source, sparse=args.sparse
+    )
+    built = time.perf_counter()
+
+    path = None
+    if args.model_dir:
+        with publish_lock(args.model_dir):
+            path = save_model(model, args.model_dir)
+    saved = time.perf_counter()
+
+    _emit({
+        "command": "build",
+        "version": model.version,
+        "path": path,
+        "n_items": model.meta["n_items"],
+        "n_features": model.meta["n_features"],
+        "top_k": model.meta["top_k"],
+        "similarity_backend": model.meta["similarity_backend"],
+        "sparse_features": model.meta["sparse_features"],
+        "seconds": {
+            "load": round(loaded - started, 3),
+            **model.meta["build_seconds"],
+            "save": round(saved - built, 3),
+            "total": round(saved - started, 3),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "env": bench.environment(),
+    }, args.out)
+    return 0
+
+
+def compare_metrics(metrics: dict, baseline: dict, tolerance: float) -> dict:
+    """
+    baseline 대비 tolerance(절대값) 넘게 떨어진 지표를 반환합니다.
+
+    Returns:
+        dict: 지표명 → {"baseline", "current"} (회귀가 없으면 빈 dict)
+    """
+    regressions = {}
+    for key, expected in baseline.items():
+        current = metrics.get(key)
+        if current is None or current < expected - tolerance:
+            regressions[key] = {"baseline": expected, "current": current}
+    return regressions
+
+
+def cmd_evaluate(args) -> int:
+    """저장된 모델(또는 데이터로 즉석 빌드한 모델)의 이웃 테이블로 top-K 지표를 계산합니다."""
+    if args.model_dir:
+        model = load_model(args.model_dir)
+    else:
+        df, source = _load_frame(args)
+        model = build_model_from_frame(
+            df, top_k=max(args.ks), backend=args.backend, source=source, sparse=args.sparse
+        )
+    if max(args.ks) > model.neighbors.k:
+        raise SystemExit(f"max(ks)={max(args.ks)} 가 모델 top_k={model.neighbors.k} 보다 큽니다")
+
+    started = time.perf_counter()
+    metrics = evaluate_topk(
+        model.items, model.neighbors, ks=args.ks, label_col=args.label_col, n_jobs=args.n_jobs
+    )
+    report = {
+        "command": "evaluate",
+        "version": model.version,
+        "n_items": model.n_items,
+        "label_col": args.label_col,
+        "metrics": metrics,
+        "seconds": round(time.perf_counter() - started, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        # evaluate 리포트 전체 또는 지표 dict 만 담긴 파일 모두 허용
+        regressions = compare_metrics(metrics, baseline.get("metrics", baseline), args.tolerance)
+        report["regressions"] = regressions
+        status = 1 if regressions else 0
+    _emit(report, args.out)
+    return status
+
+
+def cmd_bench(args) -> int:
+    """bench.BENCHMARKS 의 벤치마크를 규모 프리셋(또는 --sizes)으로 실행합니다."""
+    sizes = args.sizes or bench.SCALES[args.scale]
+    env = bench.environment()
+    for report in bench.BENCHMARKS[args.bench](sizes):
+        _emit({**report, "env": env}, args.out)
+    return 0
+
+
+def cmd_gen(args) -> int:
+    """합성 카탈로그를 줄 단위 JSON (+ 선택적 컬럼형 스냅샷)으로 생성합니다."""
+    n_items = args.n_items or bench.SCALES[args.scale][-1]
+    os.makedirs(args.out_dir, exist_ok=True)
+    product_path, brand_path = bench.write_synthetic_json(
+        n_items, args.out_dir, n_brands=args.n_brands, n_categories=args.n_categories, seed=args.seed
+    )
+    report = {
+        "command": "gen",
+        "n_items": n_items,
+        "product_path": product_path,
+        "brand_path": brand_path,
+    }
+    if args.snapshot:
+        report["snapshot_path"] = convert_json(
+            product_path, brand_path, os.path.join(args.out_dir, "catalog.snap")
+        )
+    _emit(report)
+    return 0
+
+
+def _add_data_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--product_path', help='상품 데이터 파일 경로')
+    parser.add_argument('--brand_path', help='브랜드 데이터 파일 경로')
+    parser.add_argument('--snapshot', help='컬럼형 카탈로그 스냅샷 경로 (데이터 파일 대신 사용)')
+    parser.add_argument('--backend', default=None, help='유사도 백엔드 (exact / ivf)')
+    parser.add_argument('--sparse', action='store_true', default=None,
+                        help='희소(CSR) 전처리 모드 (생략 시 FEATURE_SPARSE)')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='추천 모델 오프라인 학습 / 평가 / 벤치마크')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('build', help='모델 아티팩트 빌드')
+    _add_data_args(p)
+    p.add_argument('--model_dir', help='아티팩트 저장 디렉토리 (생략 시 저장하지 않음)')
+    p.add_argument('--top_k', type=int, default=DEFAULT_TOP_K, help='아이템당 이웃 수')
+    p.add_argument('--out', help='리포트를 추가로 기록할 JSON Lines 파일')
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser('evaluate', help='top-K Precision / Recall / nDCG 평가')
+    _add_data_args(p)
+    p.add_argument('--model_dir', help='평가할 모델 디렉토리 (생략 시 데이터로 빌드)')
+    p.add_argument('--ks', type=int, nargs='+', default=[6], help='평가할 K 목록')
+    p.add_argument('--label_col', default='category_code', help='관련성 판단 기준 컬럼')
+    p.add_argument('--n_jobs', type=int, default=1, help='평가 프로세스 수')
+    p.add_argument('--baseline', help='비교할 기준 리포트 (JSON)')
+    p.add_argument('--tolerance', type=float, default=0.005, help='허용 지표 하락폭 (절대값)')
+    p.add_argument('--out', help='리포트를 추가로 기록할 JSON Lines 파일')
+    p.set_defaults(func=cmd_evaluate)
+
+    p = sub.add_parser('bench', help='구성 요소 벤치마크')
+    p.add_argument('bench', choices=sorted(bench.BENCHMARKS), help='실행할 벤치마크')
+    p.add_argument('--scale', choices=sorted(bench.SCALES), default='small', help='합성 데이터 규모')
+    p.add_argument('--sizes', type=int, nargs='+', help='합성 아이템 수 목록 (--scale 대신 사용)')
+    p.add_argument('--out', help='리포트를 추가로 기록할 JSON Lines 파일')
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser('gen', help='합성 카탈로그 생성')
+    p.add_argument('--out_dir', required=True, help='출력 디렉토리')
+    p.add_argument('--scale', choices=sorted(bench.SCALES), default='small', help='합성 데이터 규모')
+    p.add_argument('--n_items', type=int, help='아이템 수 (--scale 대신 사용)')
+    p.add_argument('--n_brands', type=int, default=1_000, help='브랜드 수')
+    p.add_argument('--n_categories', type=int, default=50, help='category_code 종류 수')
+    p.add_argument('--seed', type=int, default=0, help='난수 시드')
+    p.add_argument('--snapshot', action='store_true', help='컬럼형 스냅샷(catalog.snap)도 생성')
+    p.set_defaults(func=cmd_gen)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s\t%(levelname)s\t%(message)s')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,300 @@
+# recommend/app/collaborative.py
+"""
+암묵적 피드백(좋아요 / 조회 / 구매) 기반 item-item 협업 필터링.
+
+    1) 이벤트를 청크 단위로 읽어 희소 사용자 × 아이템 가중치 행렬(CSR)에 누적
+    2) 아이템 열을 L2 정규화한 뒤, 아이템 블록별 X[:, block].T @ X (희소 곱) 로
+       코사인 유사도를 구해 아이템당 상위 K 이웃만 보관 (CFIndex)
+    3) 요청 시 사용자 이력 아이템의 이웃 점수를 이벤트 가중치로 합산하고,
+       콘텐츠 점수와 cf_weight 비율로 섞어 최종 순위를 만듭니다 (CFIndex.blend).
+
+행렬은 학습 / 채점 어느 단계에서도 밀집으로 변환되지 않습니다.
+
+오프라인 학습:
+    python -m app.collaborative --events_path events.ndjson --cf_dir cf --top_k 50
+"""
+import os
+import json
+import shutil
+import logging
+import argparse
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from .neighbors import NeighborIndex, topk_from_scores
+from . import model_store
+
+logger = logging.getLogger("recommend.model")
+
+# 이벤트 종류별 가중치 (unlike 는 좋아요 취소)
+CF_EVENT_WEIGHTS = {
+    "view": float(os.getenv("CF_WEIGHT_VIEW", "1.0")),
+    "like": float(os.getenv("CF_WEIGHT_LIKE", "3.0")),
+    "unlike": -float(os.getenv("CF_WEIGHT_LIKE", "3.0")),
+    "purchase": float(os.getenv("CF_WEIGHT_PURCHASE", "5.0")),
+}
+# 이벤트 누적 청크 크기 (행 수)
+CF_CHUNK_EVENTS = int(os.getenv("CF_CHUNK_EVENTS", "1000000"))
+# 유사도 계산 아이템 블록 크기
+CF_BLOCK_ITEMS = int(os.getenv("CF_BLOCK_ITEMS", "2048"))
+# 요청별 cf_weight 미지정 시 기본 혼합 비율
+CF_BLEND_WEIGHT = float(os.getenv("CF_BLEND_WEIGHT", "0.3"))
+
+
+@dataclass
+class CFIndex:
+    """
+    Attributes:
+        version (str): 학습 버전명
+        item_ids (np.ndarray): CF 행 → 상품 ID
+        neighbors (NeighborIndex): CF 행 기준 상위 K 이웃 (-1 / -inf 패딩)
+        meta (dict): 학습 정보 (사용자 수, 이벤트 수 등)
+    """
+    version: str
+    item_ids: np.ndarray
+    neighbors: NeighborIndex
+    meta: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.id_to_row = {int(pid): row for row, pid in enumerate(self.item_ids)}
+
+    def score_items(self, weights: Dict[int, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        {상품 ID: 이벤트 가중치} 이력으로 후보 상품 점수를 계산합니다.
+
+        Returns:
+            tuple: (후보 상품 ID 배열, 점수 배열). 이력 상품 자신은 제외
+        """
+        rows, w = [], []
+        for pid, weight in weights.items():
+            row = self.id_to_row.get(pid)
+            if row is not None and weight > 0:
+                rows.append(row)
+                w.append(weight)
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        rows = np.asarray(rows)
+        nbr_ids = np.asarray(self.neighbors.ids[rows])
+        nbr_scores = np.asarray(self.neighbors.scores[rows]) * np.asarray(w, dtype=np.float32)[:, None]
+        valid = nbr_ids >= 0
+        cand, inverse = np.unique(nbr_ids[valid], return_inverse=True)
+        scores = np.bincount(inverse, weights=nbr_scores[valid], minlength=len(cand))
+        keep = ~np.isin(cand, rows)
+        return self.item_ids[cand[keep]], scores[keep].astype(np.float32)
+
+    def blend(
+        self,
+        model,
+        content_scores: np.ndarray,
+        weights: Dict[int, float],
+        cf_weight: float
+    ) -> np.ndarray:
+        """
+        모델 행 기준 콘텐츠 점수(코사인)에 CF 점수를 섞습니다.
+
+        CF 점수는 최댓값으로 [0, 1] 정규화한 뒤 (1 - cf_weight) * content + cf_weight * cf.
+        CF 인덱스에 없는 상품의 CF 점수는 0 입니다.
+        """
+        if cf_weight <= 0:
+            return content_scores
+        cand_ids, cand_scores = self.score_items(weights)
+        cf_full = np.zeros(len(content_scores), dtype=np.float32)
+        if len(cand_ids) and cand_scores.max() > 0:
+            rows = np.fromiter((model.id_to_index.get(int(pid), -1) for pid in cand_ids),
+                               dtype=np.int64, count=len(cand_ids))
+            present = rows >= 0
+            cf_full[rows[present]] = cand_scores[present] / cand_scores.max()
+        return (1.0 - cf_weight) * content_scores + cf_weight * cf_full
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "item_ids.npy"), self.item_ids)
+        self.neighbors.save(path)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CFIndex":
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(
+            version=meta["version"],
+            item_ids=np.load(os.path.join(path, "item_ids.npy")),
+            neighbors=NeighborIndex.load(path, mmap=mmap),
+            meta=meta,
+        )
+
+
+def _event_chunks(events: Iterable[dict], chunk_size: int) -> Iterator[list]:
+    chunk = []
+    for e in events:
+        chunk.append(e)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_interaction_matrix(
+    events: Iterable[dict],
+    weights: Optional[dict] = None,
+    chunk_size: int = CF_CHUNK_EVENTS
+) -> Tuple[sp.csr_matrix, np.ndarray, int]:
+    """
+    {"user_id", "product_id", "type"} 이벤트 스트림을 청크 단위로 희소 행렬에 누적합니다.
+
+    같은 (사용자, 상품) 가중치는 합산 후 log1p 로 완화하고, 합이 0 이하(좋아요 후 취소 등)인
+    칸은 제거합니다.
+
+    Returns:
+        tuple: (사용자 × 아이템 CSR float32, 열 → 상품 ID 배열, 사용한 이벤트 수)
+    """
+    weights = weights or CF_EVENT_WEIGHTS
+    user_index: Dict[str, int] = {}
+    item_index: Dict[int, int] = {}
+    matrix = sp.csr_matrix((0, 0), dtype=np.float32)
+    n_events = 0
+    for chunk in _event_chunks(events, chunk_size):
+        users, items, values = [], [], []
+        for e in chunk:
+            weight = weights.get(e.get("type"))
+            if weight is None or e.get("product_id") is None:
+                continue
+            users.append(user_index.setdefault(str(e["user_id"]), len(user_index)))
+            items.append(item_index.setdefault(int(e["product_id"]), len(item_index)))
+            values.append(weight)
+        n_events += len(values)
+        shape = (len(user_index), len(item_index))
+        part = sp.coo_matrix(
+            (np.asarray(values, dtype=np.float32), (users, items)), shape=shape
+        ).tocsr()
+        matrix.resize(shape)
+        matrix = matrix + part
+
+    matrix.data = np.where(matrix.data > 0, np.log1p(np.maximum(matrix.data, 0)), 0).astype(np.float32)
+    matrix.eliminate_zeros()
+    item_ids = np.fromiter(item_index.keys(), dtype=np.int64, count=len(item_index))
+    return matrix, item_ids, n_events
+
+
+def _row_topk(block: sp.csr_matrix, offset: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """희소 유사도 블록의 행별 상위 k (자기 자신 제외). 후보가 모자라면 -1 / -inf."""
+    ids = np.full((block.shape[0], k), -1, dtype=np.int32)
+    scores = np.full((block.shape[0], k), -np.inf, dtype=np.float32)
+    for r in range(block.shape[0]):
+        lo, hi = block.indptr[r], block.indptr[r + 1]
+        cols, vals = block.indices[lo:hi], block.data[lo:hi]
+        mask = cols != offset + r
+        cols, vals = cols[mask], vals[mask]
+        kk = min(k, len(cols))
+        if kk == 0:
+            continue
+        top_pos, top_vals = topk_from_scores(vals[None, :], kk)
+        ids[r, :kk] = cols[top_pos[0]]
+        scores[r, :kk] = top_vals[0]
+    return ids, scores
+
+
+def build_cf_index(
+    matrix: sp.csr_matrix,
+    item_ids: np.ndarray,
+    top_k: int = 50,
+    block_items: int = CF_BLOCK_ITEMS
+) -> CFIndex:
+    """
+    사용자 × 아이템 행렬로 item-item 코사인 이웃 인덱스를 만듭니다.
+
+    아이템 블록별로 X[:, block].T @ X 희소 곱만 계산하므로 피크 메모리는
+    블록의 공동 출현 쌍 수에 비례합니다.
+    """
+    n_items = matrix.shape[1]
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    norms[norms == 0] = 1.0
+    x = (matrix @ sp.diags(1.0 / norms).astype(np.float32)).tocsc()
+    xt = x.T.tocsr()
+
+    k = max(1, min(top_k, n_items - 1))
+    ids = np.empty((n_items, k), dtype=np.int32)
+    scores = np.empty((n_items, k), dtype=np.float32)
+    for start in range(0, n_items, block_items):
+        stop = min(start + block_items, n_items)
+        block = (xt[start:stop] @ x).tocsr()
+        ids[start:stop], scores[start:stop] = _row_topk(block, start, k)
+
+    version = model_store.new_version()
+    return CFIndex(
+        version=version,
+        item_ids=item_ids,
+        neighbors=NeighborIndex(ids=ids, scores=scores),
+        meta={
+            "version": version,
+            "built_at": datetime.utcnow().isoformat(),
+            "n_users": int(matrix.shape[0]),
+            "n_items": int(n_items),
+            "nnz": int(matrix.nnz),
+            "top_k": int(k),
+        },
+    )
+
+
+def save_cf(cf: CFIndex, cf_dir: str, keep: int = 3) -> str:
+    """
+    cf_dir/<version>/ 에 저장하고 CURRENT 포인터를 원자적으로 교체합니다 (model_store 와 같은 구조).
+    """
+    os.makedirs(cf_dir, exist_ok=True)
+    target = os.path.join(cf_dir, cf.version)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=cf_dir)
+    try:
+        cf.save(tmp_dir)
+        os.rename(tmp_dir, target)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    fd, tmp_ptr = tempfile.mkstemp(prefix=".CURRENT-", dir=cf_dir)
+    with os.fdopen(fd, "w") as f:
+        f.write(cf.version)
+    os.replace(tmp_ptr, os.path.join(cf_dir, model_store.CURRENT_FILE))
+    model_store.prune_versions(cf_dir, keep)
+    return target
+
+
+def load_cf(cf_dir: str) -> Optional[CFIndex]:
+    """CURRENT 버전 CF 인덱스를 로드합니다. 없으면 None."""
+    version = model_store.current_version(cf_dir)
+    if version is None:
+        return None
+    return CFIndex.load(os.path.join(cf_dir, version), mmap=True)
+
+
+def iter_events_file(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='item-item 협업 필터링 인덱스 학습')
+    parser.add_argument('--events_path', required=True,
+                        help='{"user_id", "product_id", "type"} NDJSON (GET /product/events/export)')
+    parser.add_argument('--cf_dir', required=True, help='CF 아티팩트 저장 디렉토리')
+    parser.add_argument('--top_k', type=int, default=50, help='아이템당 이웃 수')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s\t%(levelname)s\t%(message)s')
+    matrix, item_ids, n_events = build_interaction_matrix(iter_events_file(args.events_path))
+    cf = build_cf_index(matrix, item_ids, top_k=args.top_k)
+    cf.meta["n_events"] = n_events
+    path = save_cf(cf, args.cf_dir)
+    logger.info(f"cf_saved\tversion={cf.version}\tpath={path}")
+    print(json.dumps(cf.meta, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -16,23 +16,42 @@ from sklearn.preprocessing import (
 from sklearn.metrics.pairwise import cosine_similarity
 from category_encoders.count import CountEncoder
 
+from .neighbors import NeighborIndex, topk_from_scores
+from .hashing import anchor_index
+
+
+# 전처리 파이프라인 컬럼 구성 (run_recommendation / model_store 공용)
+FEATURE_COLUMNS = {
+    'discount_cols': ['discount', 'rank'],
+    'view_buy_cols': ['like_count', 'view_count', 'like_count_brand'],
+    'price_cols': ['discounted_price', 'price'],
+    'low_cat_cols': ['gender', 'category_code'],
+    'high_cat_cols': ['brand_eng'],
+}
+
 
 def build_preprocessor(
     discount_cols: list,
     view_buy_cols: list,
     price_cols: list,
     low_cat_cols: list,
-    high_cat_cols: list
+    high_cat_cols: list,
+    sparse: bool = False
 ) -> ColumnTransformer:
     """
     전처리 파이프라인을 생성하여 반환합니다.
 
+    sparse=True 이면 원-핫 블록을 CSR 로 유지하고 수치형 블록(float32)과 함께
+    CSR 행렬로 결합합니다. category_code 카디널리티가 커져도 피처 폭에 비례한
+    밀집 메모리가 필요하지 않습니다.
+
     Args:
         discount_cols (list): MinMaxScaler로 [0,1] 정규화할 컬럼 리스트
         view_buy_cols (list): 로그 변환 + RobustScaler로 이상치 영향을 완화할 컬럼 리스트
         price_cols (list): 로그 변환 + MinMaxScaler로 가격 분포를 정규화할 컬럼 리스트
         low_cat_cols (list): OneHotEncoder로 명목형 인코딩할 저카디널리티 컬럼 리스트
         high_cat_cols (list): CountEncoder(normalize=True)로 빈도 비율 인코딩할 고카디널리티 컬럼 리스트
+        sparse (bool): 희소(CSR) 출력 모드
 
     Returns:
         ColumnTransformer: 지정된 전처리 파이프라인이 적용된 transformer 객체
@@ -57,7 +76,8 @@ def build_preprocessor(
     # 4) 저카디널리티 범주형: OneHotEncoder 적용
     low_cat_pipe = Pipeline([
         ('one_hot', OneHotEncoder(
-            sparse_output=False,  # 희소 행렬이 아닌 numpy 배열 반환
+            sparse_output=sparse,  # 기본은 numpy 배열, 희소 모드는 CSR 반환
+            dtype=np.float32 if sparse else np.float64,
             handle_unknown='ignore'  # 훈련 시 없는 카테고리는 0 벡터 처리
         ))
     ])
@@ -81,7 +101,9 @@ def build_preprocessor(
             ('low_card_ohe',     low_cat_pipe,   low_cat_cols),
             ('high_card_freq',   high_cat_pipe,  high_cat_cols),
         ],
-        remainder='drop'
+        remainder='drop',
+        # 희소 모드: 밀도와 무관하게 항상 CSR 로 결합
+        sparse_threshold=1.0 if sparse else 0.0
     )
     return preprocessor
 
@@ -159,43 +181,91 @@ def compute_cosine_similarity(
     return cosine_similarity(feature_matrix)
 
 
+def _candidate_scores(
+    cosine_sim,
+    item_indices: np.ndarray,
+    exclude=None
+) -> tuple:
+    """
+    쿼리 아이템별 후보 (행 인덱스, 점수) 2-D 배열을 만들고 제외 대상 점수를 -inf 로 마스킹합니다.
+
+    밀집 행렬이면 전체 행이, NeighborIndex 면 상위 K 이웃이 후보가 됩니다.
+    """
+    if isinstance(cosine_sim, NeighborIndex):
+        cand_idx = np.asarray(cosine_sim.ids[item_indices])
+        cand_scores = np.array(cosine_sim.scores[item_indices], dtype=np.float32)
+        if exclude is not None and len(exclude):
+            cand_scores[np.isin(cand_idx, exclude)] = -np.inf
+        return cand_idx, cand_scores
+
+    cand_scores = np.array(cosine_sim[item_indices], dtype=np.float32)
+    cand_idx = np.broadcast_to(np.arange(cand_scores.shape[1]), cand_scores.shape)
+    # 자기 자신 제거
+    cand_scores[np.arange(len(item_indices)), item_indices] = -np.inf
+    if exclude is not None and len(exclude):
+        cand_scores[:, exclude] = -np.inf
+    return cand_idx, cand_scores
+
+
+def recommend_items_batch(
+    cosine_sim,
+    item_indices,
+    top_n: int = 6,
+    exclude=None
+) -> np.ndarray:
+    """
+    여러 기준 아이템에 대한 top_n 추천 행 인덱스를 한 번의 2-D 연산으로 계산합니다.
+
+    Args:
+        cosine_sim (np.ndarray | NeighborIndex): 코사인 유사도 행렬 또는 상위 K 이웃 인덱스
+        item_indices (array-like): 기준 아이템 행 인덱스 목록 (길이 q)
+        top_n (int): 쿼리당 추천 개수
+        exclude (array-like, optional): 모든 쿼리에서 제외할 행 인덱스 (기준 아이템은 항상 제외)
+
+    Returns:
+        np.ndarray: q × top_n 행 인덱스 배열 (유사도 내림차순). 후보가 모자라면 -1 로 채움
+    """
+    item_indices = np.atleast_1d(np.asarray(item_indices, dtype=np.int64))
+    exclude = None if exclude is None else np.fromiter(exclude, dtype=np.int64)
+    cand_idx, cand_scores = _candidate_scores(cosine_sim, item_indices, exclude)
+
+    # argpartition 으로 상위 k 후보만 고른 뒤 k개만 정렬
+    k = min(top_n, cand_scores.shape[1])
+    top_pos, top_scores = topk_from_scores(cand_scores, k)
+    top_idx = np.take_along_axis(cand_idx, top_pos, axis=1)
+    top_idx = np.where(np.isneginf(top_scores), -1, top_idx)
+    if k < top_n:
+        top_idx = np.pad(top_idx, ((0, 0), (0, top_n - k)), constant_values=-1)
+    return top_idx
+
+
 def recommend_items(
     df: pd.DataFrame,
-    cosine_sim: np.ndarray,
+    cosine_sim,
     item_index: int,
-    top_n: int = 6
+    top_n: int = 6,
+    exclude=None
 ) -> pd.DataFrame:
     """
     특정 아이템을 기준으로 유사도 상위 top_n개 아이템을 추천하여 반환합니다.
 
     Args:
         df (pd.DataFrame): 원본 상품 데이터
-        cosine_sim (np.ndarray): 코사인 유사도 행렬
+        cosine_sim (np.ndarray | NeighborIndex): 코사인 유사도 행렬 또는 상위 K 이웃 인덱스
         item_index (int): 기준 아이템의 행 인덱스
         top_n (int): 추천 아이템 개수 (기본값: 5)
+        exclude (array-like, optional): 추천에서 제외할 행 인덱스 (예: 이미 구매한 상품)
 
     Returns:
         pd.DataFrame: 추천된 아이템들의 행 데이터
     """
-    # 1) 모든 아이템에 대한 유사도 점수 계산
-    scores = list(enumerate(cosine_sim[item_index]))
-
-    # 2) 자기 자신 제거
-    scores = [(i, s) for i, s in scores if i != item_index]
-
-    # 3) 유사도 점수 내림차순 정렬
-    scores.sort(key=lambda x: x[1], reverse=True)
-
-    # 4) 상위 top_n 인덱스 추출
-    top_idx = [i for i, _ in scores[:top_n]]
-
-    # 5) 원본 df에서 해당 인덱스 행 반환
-    return df.iloc[top_idx]
+    top_idx = recommend_items_batch(cosine_sim, [item_index], top_n=top_n, exclude=exclude)[0]
+    return df.iloc[top_idx[top_idx >= 0]]
 
 
 def evaluate_semantic_similarity(
     df: pd.DataFrame,
-    cosine_sim: np.ndarray,
+    cosine_sim,
     K: int = 6
 ) -> dict:
     """
@@ -203,7 +273,7 @@ def evaluate_semantic_similarity(
 
     Args:
         df (pd.DataFrame): 전체 상품 데이터
-        cosine_sim (np.ndarray): 코사인 유사도 행렬
+        cosine_sim (np.ndarray | NeighborIndex): 코사인 유사도 행렬 또는 상위 K 이웃 인덱스 (K 이상)
         K (int): top-K 개수
 
     Returns:
@@ -253,22 +323,14 @@ def run_recommendation(
     df = load_data(product_path, brand_path)
 
     # 2) 전처리 및 feature matrix 생성
-    preprocessor = build_preprocessor(
-        discount_cols=['discount', 'rank'],
-        view_buy_cols=['like_count','view_count','like_count_brand'],
-        price_cols=['discounted_price','price'],
-        low_cat_cols=['gender','category_code'],
-        high_cat_cols=['brand_eng']
-    )
+    preprocessor = build_preprocessor(**FEATURE_COLUMNS)
     feature_matrix = compute_feature_matrix(df, preprocessor)
 
     # 3) 코사인 유사도 계산
     cosine_sim = compute_cosine_similarity(feature_matrix)
 
-    # 4) user_id 해시로 시드 고정 → 랜덤 인덱스 선택
-    seed = int(hash(user_id) % (2**32))
-    rng = np.random.default_rng(seed)
-    item_index = rng.integers(0, feature_matrix.shape[0])
+    # 4) user_id 의 프로세스 무관 해시로 기준 아이템 선택
+    item_index = anchor_index(user_id, feature_matrix.shape[0])
 
     # 5) 추천 실행
     recs = recommend_items(df, cosine_sim, item_index=item_index, top_n=top_n)
@@ -277,68 +339,5 @@ def run_recommendation(
       "product_id": recs["id"].tolist()
     }
 
-# def main():
-#     """
-#     스크립트 진입점:
-#     - --user_id: 추천 기준 랜덤 시드로 사용할 사용자 ID
-#     - --top_n: 추천 출력 개수 지정
-#     - --product_path: 상품 데이터 CSV 경로
-#     - --brand_path: 브랜드 데이터 CSV 경로
-#     """
-#     parser = argparse.ArgumentParser(description='콘텐츠 기반 추천 시스템 실행')
-#     parser.add_argument('--user_id', required=True,  help='프론트엔드에서 전달된 사용자 고유 ID')
-#     parser.add_argument('--top_n', type=int, default=5, help='추천 결과 개수')
-#     parser.add_argument('--product_path', required=True,  help='상품 데이터 파일 경로')
-#     parser.add_argument('--brand_path', required=True,  help='브랜드 데이터 파일 경로')
-#     args = parser.parse_args()
-
-#     # 로깅 설정: INFO 레벨, 시간·레벨·메시지 표시
-#     # logging.basicConfig(
-#     #     level=logging.INFO,
-#     #     format='%(asctime)s - %(levelname)s - %(message)s'
-#     # )
-
-#     # 1) 데이터 로드
-#     df = load_data(
-#         product_path=args.product_path,
-#         brand_path=args.brand_path
-#     )
-#     # logging.info(f'Loaded data shape: {df.shape}')
-
-#     # 2) 전처리 파이프라인 구성 및 feature matrix 생성
-#     preprocessor = build_preprocessor(
-#         discount_cols=['discount', 'rank'],
-#         view_buy_cols=['like_count', 'view_count', 'like_count_brand'],
-#         price_cols=['discounted_price', 'price'],
-#         low_cat_cols=['gender', 'category_code'],
-#         high_cat_cols=['brand_eng']
-#     )
-#     feature_matrix = compute_feature_matrix(df, preprocessor)
-#     # logging.info(f'Feature matrix shape: {feature_matrix.shape}')
-
-#     # 3) 코사인 유사도 계산
-#     cosine_sim = compute_cosine_similarity(feature_matrix)
-#     # logging.info('Computed cosine similarity matrix')
-
-#     # 4) user_id 해시를 시드로 랜덤 item_index 선택
-#     seed = int(hash(args.user_id) % (2**32))
-#     rng = np.random.default_rng(seed)
-#     item_index = rng.integers(0, feature_matrix.shape[0])
-#     # logging.info(f'User="{args.user_id}" selected item_index={item_index}')
-
-#     # 5) 추천 실행 및 결과 로깅
-#     recs = recommend_items(
-#         df, cosine_sim, item_index=item_index, top_n=args.top_n
-#     )
-#     # logging.info(f'Recommendations for user="{args.user_id}":\n{recs}')
-#     rec_product_ids = recs["id"].tolist()
-#     result_dict = {
-#         "user_id": args.user_id,
-#         "product_id": rec_product_ids
-#     }
-
-#     return result_dict
-#     # print(result_dict)
-
-# if __name__ == '__main__':
-#     main()
\ No newline at end of file
+# 스크립트 실행은 app.cli 로 대체되었습니다:
+#     python -m app.cli build --product_path ... --brand_path ... --model_dir model
@@ -0,0 +1,111 @@
+# recommend/app/evaluation.py
+"""
+오프라인 추천 품질 평가 (벡터화 버전).
+
+cosine_recsys.evaluate_semantic_similarity 와 같은 기준(쿼리와 같은 category_code 를
+관련 아이템으로 간주)으로 Precision@K / Recall@K / nDCG@K 를 계산하되,
+카테고리별 아이템 수를 한 번만 집계하고 쿼리를 블록 단위 2-D 연산으로 채점합니다.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .cosine_recsys import recommend_items_batch
+
+DEFAULT_BLOCK_SIZE = 2048
+
+# 프로세스 풀 워커별 평가 상태 (initializer 에서 1회 설정)
+_worker_state = {}
+
+
+def _init_worker(cosine_sim, labels, totals, ks):
+    _worker_state.update(cosine_sim=cosine_sim, labels=labels, totals=totals, ks=ks)
+
+
+def _score_block(
+    cosine_sim,
+    labels: np.ndarray,
+    totals: np.ndarray,
+    ks: tuple,
+    queries: np.ndarray
+) -> dict:
+    """
+    쿼리 블록 하나를 채점하여 지표별 (합계, 유효 쿼리 수)를 반환합니다.
+    """
+    max_k = max(ks)
+    top = recommend_items_batch(cosine_sim, queries, top_n=max_k)
+    rel = (labels[top] == labels[queries][:, None]) & (top >= 0)
+    total = totals[queries]
+    has_relevant = total > 0
+    discounts = 1.0 / np.log2(np.arange(2, max_k + 2))
+    ideal_cum = np.cumsum(discounts)
+
+    sums = {}
+    for k in ks:
+        hits = rel[:, :k].sum(axis=1)
+        dcg = (rel[:, :k] * discounts[:k]).sum(axis=1)
+        idcg = ideal_cum[np.clip(np.minimum(total, k), 1, None) - 1]
+        sums[f'Precision@{k}'] = ((hits / k).sum(), len(queries))
+        sums[f'Recall@{k}'] = (
+            (hits[has_relevant] / total[has_relevant]).sum(), int(has_relevant.sum())
+        )
+        sums[f'nDCG@{k}'] = (
+            (dcg[has_relevant] / idcg[has_relevant]).sum(), int(has_relevant.sum())
+        )
+    return sums
+
+
+def _score_block_in_worker(queries: np.ndarray) -> dict:
+    state = _worker_state
+    return _score_block(state['cosine_sim'], state['labels'], state['totals'], state['ks'], queries)
+
+
+def evaluate_topk(
+    df: pd.DataFrame,
+    cosine_sim,
+    ks=(6,),
+    label_col: str = 'category_code',
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    n_jobs: int = 1
+) -> dict:
+    """
+    전체 아이템을 쿼리로 하여 여러 K 에 대한 Precision/Recall/nDCG 를 한 번에 계산합니다.
+
+    Args:
+        df (pd.DataFrame): 전체 상품 데이터 (cosine_sim 과 같은 행 순서)
+        cosine_sim (np.ndarray | NeighborIndex): 코사인 유사도 행렬 또는 상위 K 이웃 인덱스
+        ks (iterable): 평가할 K 목록 (NeighborIndex 사용 시 max(ks) <= index.k)
+        label_col (str): 관련성 판단 기준 컬럼
+        block_size (int): 블록당 쿼리 수
+        n_jobs (int): 블록을 나눠 처리할 프로세스 수 (1이면 현재 프로세스에서 처리)
+
+    Returns:
+        dict: {'Precision@K': float, 'Recall@K': float, 'nDCG@K': float, ...}
+    """
+    ks = tuple(sorted(set(int(k) for k in ks)))
+
+    # 카테고리 코드 → 정수 라벨, 카테고리별 아이템 수는 한 번만 집계 (자기 자신 제외)
+    labels, _ = pd.factorize(df[label_col], use_na_sentinel=False)
+    totals = np.bincount(labels)[labels] - 1
+
+    n = len(df)
+    blocks = [np.arange(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+    if n_jobs > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(cosine_sim, labels, totals, ks),
+        ) as pool:
+            partials = list(pool.map(_score_block_in_worker, blocks))
+    else:
+        partials = [_score_block(cosine_sim, labels, totals, ks, q) for q in blocks]
+
+    # 블록별 (합계, 개수)를 모아 평균 계산
+    result = {}
+    for key in partials[0]:
+        total_sum = sum(p[key][0] for p in partials)
+        count = sum(p[key][1] for p in partials)
+        result[key] = float(total_sum / count) if count else float('nan')
+    return result
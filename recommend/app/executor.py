@@ -0,0 +1,105 @@
+# recommend/app/executor.py
+"""
+추천 계산 전용 실행기 (이벤트 루프 밖에서 CPU 작업 수행).
+
+추천 채점은 NumPy 행렬 연산이 대부분이라 GIL 을 풀어 주므로 스레드 풀로 충분하고,
+모델은 메모리 맵으로 공유되어 워커별 복제가 필요 없습니다.
+
+    - 실행 중 + 대기 중 작업 수를 max_workers + max_queue 로 제한
+    - 한도를 넘으면 즉시 ComputeOverloaded (503 + Retry-After 로 응답)
+    - 요청별 timeout 초과 시 ComputeTimeout (대기 중이던 작업은 취소)
+"""
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class ComputeOverloaded(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"compute queue full (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+class ComputeTimeout(Exception):
+    """작업이 제한 시간 안에 끝나지 않음."""
+
+
+class ComputeExecutor:
+    """
+    Args:
+        max_workers (int): 동시에 실행할 작업 수
+        max_queue (int): 실행 대기 가능한 작업 수
+        timeout (float): 기본 요청별 제한 시간 (초)
+        retry_after (int): 과부하 응답의 Retry-After (초)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 64,
+        timeout: float = 2.0,
+        retry_after: int = 1
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compute")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        fn(*args, **kwargs) 를 풀에서 실행하고 결과를 기다립니다.
+
+        Raises:
+            ComputeOverloaded: 실행 + 대기 작업이 한도에 도달한 경우
+            ComputeTimeout: timeout 안에 끝나지 않은 경우
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ComputeOverloaded(self.retry_after)
+            self._in_flight += 1
+        # 제한 시간 초과 후에도 실행 중인 작업은 끝날 때까지 한도에 포함됨
+        future = self._pool.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise ComputeTimeout(f"compute exceeded {timeout}s")
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def executor_from_env() -> ComputeExecutor:
+    return ComputeExecutor(
+        max_workers=int(os.getenv("COMPUTE_WORKERS", str(min(4, os.cpu_count() or 1)))),
+        max_queue=int(os.getenv("COMPUTE_MAX_QUEUE", "64")),
+        timeout=float(os.getenv("COMPUTE_TIMEOUT", "2.0")),
+        retry_after=int(os.getenv("COMPUTE_RETRY_AFTER", "1")),
+    )
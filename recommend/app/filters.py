@@ -0,0 +1,132 @@
+# recommend/app/filters.py
+"""
+추천 후보 필터 (gender / major_category / brand_id / 가격대).
+
+모델 로드 후 한 번 속성별 인덱스를 만들어 두고, 요청마다 필요한 인덱스만 AND 해서
+n_items 길이의 불리언 후보 마스크를 얻습니다.
+
+    - gender / major_category: 값별 불리언 마스크 (카디널리티가 낮음)
+    - brand_id: 브랜드별 행 인덱스 배열 (카디널리티가 높아 마스크 대신 인덱스 보관)
+    - 가격: 가격 오름차순 행 순서 + searchsorted 로 구간 행 추출
+
+후보 마스크는 이웃 조회 / 프로필 채점 단계에서 바로 적용되므로 필터 후 top_n 이
+정확히 채워지고, 화면 단에서 과다 조회 후 거르는 작업이 필요 없습니다.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 성별 무관 상품 코드 (특정 성별 필터에 함께 포함; popularity.UNISEX 와 동일)
+UNISEX = "U"
+# 가격 필터 기준 컬럼 (화면에 표시되는 할인가)
+PRICE_COLUMN = "discounted_price"
+
+
+@dataclass(frozen=True)
+class ItemFilter:
+    """
+    요청별 필터 조건. None 인 조건은 적용하지 않습니다.
+
+    Attributes:
+        gender (str, optional): 성별 코드 (성별 무관 상품 포함)
+        major_category (str, optional): 대분류
+        brand_ids (tuple, optional): 허용 브랜드 ID 목록
+        min_price, max_price (float, optional): 할인가 구간 (양 끝 포함)
+    """
+    gender: Optional[str] = None
+    major_category: Optional[str] = None
+    brand_ids: Optional[Tuple[int, ...]] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return self == ItemFilter()
+
+    def cache_key(self) -> str:
+        """결과 캐시 키에 넣을 정규화된 문자열 (필터가 없으면 "-")."""
+        if self.is_empty:
+            return "-"
+        brands = ",".join(str(b) for b in sorted(set(self.brand_ids))) if self.brand_ids else ""
+        return (
+            f"g={self.gender or ''}|c={self.major_category or ''}|b={brands}"
+            f"|p={self.min_price if self.min_price is not None else ''}"
+            f"-{self.max_price if self.max_price is not None else ''}"
+        )
+
+
+class FilterIndex:
+    """
+    상품 메타데이터(RecModel.items)로부터 만든 속성별 필터 인덱스.
+
+    Args:
+        items (pd.DataFrame): 모델 행 순서의 상품 메타데이터
+    """
+
+    def __init__(self, items: pd.DataFrame):
+        self.n_items = len(items)
+        self.gender = self._value_masks(items.get("gender"))
+        self.major_category = self._value_masks(items.get("major_category"))
+        self.brand_rows = self._value_rows(items.get("brand_id"))
+
+        price = items.get(PRICE_COLUMN)
+        price = (
+            np.zeros(self.n_items) if price is None
+            else pd.to_numeric(price, errors="coerce").to_numpy(dtype=np.float64)
+        )
+        # 가격이 없는 상품(NaN)은 정렬 끝으로 밀려 어떤 구간에도 포함되지 않음
+        self.price_order = np.argsort(price, kind="stable").astype(np.int32)
+        self.sorted_price = price[self.price_order]
+
+    def _value_masks(self, column: Optional[pd.Series]) -> Dict[str, np.ndarray]:
+        if column is None:
+            return {}
+        values = column.astype(str).to_numpy()
+        return {v: values == v for v in np.unique(values)}
+
+    def _value_rows(self, column: Optional[pd.Series]) -> Dict[int, np.ndarray]:
+        if column is None:
+            return {}
+        codes = pd.to_numeric(column, errors="coerce").to_numpy()
+        order = np.argsort(codes, kind="stable")
+        uniques, starts = np.unique(codes[order], return_index=True)
+        bounds = list(starts[1:]) + [len(order)]
+        return {
+            int(v): order[s:e].astype(np.int32)
+            for v, s, e in zip(uniques, starts, bounds) if not np.isnan(v)
+        }
+
+    def _empty(self) -> np.ndarray:
+        return np.zeros(self.n_items, dtype=bool)
+
+    def mask(self, item_filter: Optional[ItemFilter]) -> Optional[np.ndarray]:
+        """
+        필터를 만족하는 행의 불리언 마스크. 필터가 없으면 None (전체 후보).
+        """
+        if item_filter is None or item_filter.is_empty:
+            return None
+        mask = np.ones(self.n_items, dtype=bool)
+
+        if item_filter.gender is not None:
+            g = item_filter.gender
+            mask &= self.gender.get(g, self._empty()) | self.gender.get(UNISEX, self._empty())
+        if item_filter.major_category is not None:
+            mask &= self.major_category.get(item_filter.major_category, self._empty())
+        if item_filter.brand_ids:
+            allowed = self._empty()
+            for brand_id in item_filter.brand_ids:
+                rows = self.brand_rows.get(int(brand_id))
+                if rows is not None:
+                    allowed[rows] = True
+            mask &= allowed
+        if item_filter.min_price is not None or item_filter.max_price is not None:
+            low = -np.inf if item_filter.min_price is None else item_filter.min_price
+            high = np.inf if item_filter.max_price is None else item_filter.max_price
+            lo = np.searchsorted(self.sorted_price, low, side="left")
+            hi = np.searchsorted(self.sorted_price, high, side="right")
+            in_range = self._empty()
+            in_range[self.price_order[lo:hi]] = True
+            mask &= in_range
+        return mask
@@ -0,0 +1,49 @@
+# recommend/app/hashing.py
+"""
+프로세스와 무관하게 같은 값을 주는 사용자 해시 / 버킷 유틸리티.
+
+내장 hash() 는 PYTHONHASHSEED 로 프로세스마다 다르게 솔트되므로, 워커마다
+같은 사용자에게 다른 기준 아이템을 고르고 사용자별 캐시도 무력화됩니다.
+여기서는 키가 있는 BLAKE2b(8 byte digest)를 사용해
+
+    - 모든 워커 / 재시작 / 인스턴스에서 같은 입력 → 같은 값
+    - USER_HASH_KEY 를 바꾸면 전체 배정이 한 번에 재섞임
+    - 용도(salt)별로 독립적인 값 (용도가 다른 버킷 배정끼리 서로 상관되지 않음)
+
+을 보장합니다.
+"""
+import os
+import hashlib
+
+# 해시 키 (최대 64 byte). 배포 전체에서 같은 값을 사용해야 함
+USER_HASH_KEY = os.getenv("USER_HASH_KEY", "recommend").encode("utf-8")[:64]
+
+# 용도별 salt
+ANCHOR_SALT = "anchor"
+
+
+def stable_hash(value: str, salt: str = "", key: bytes = USER_HASH_KEY) -> int:
+    """
+    value 의 64비트 부호 없는 정수 해시 (프로세스 / 머신과 무관).
+
+    Args:
+        value (str): 해시 대상 (user_id 등)
+        salt (str): 용도 구분 문자열 (최대 16 byte)
+        key (bytes): 해시 키
+    """
+    digest = hashlib.blake2b(
+        str(value).encode("utf-8"), digest_size=8, key=key, salt=salt.encode("utf-8")[:16]
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+def bucket(value: str, n_buckets: int, salt: str = "") -> int:
+    """value 를 [0, n_buckets) 버킷에 배정합니다."""
+    if n_buckets <= 0:
+        raise ValueError(f"n_buckets 는 1 이상이어야 합니다: {n_buckets}")
+    return stable_hash(value, salt) % n_buckets
+
+
+def anchor_index(user_id: str, n_items: int) -> int:
+    """행동 이력이 없는 사용자의 기준 아이템 행 인덱스."""
+    return bucket(user_id, n_items, ANCHOR_SALT)
@@ -0,0 +1,128 @@
+# recommend/app/hydration.py
+"""
+추천 상품 ID → 화면 표시용 RecommendItem 변환 (상품 서비스 /product/bulk 호출).
+
+서비스에서는 Hydrator 하나를 애플리케이션 수명 동안 공유합니다.
+    - 연결 풀 / keep-alive 가 설정된 httpx.AsyncClient 1개
+    - 상품 ID 별 RecommendItem TTL + LRU 캐시 (자주 추천되는 상품은 상품 서비스 호출 생략)
+"""
+import os
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from .schemas import RecommendItem
+from .ttl_cache import TTLCache
+
+# /product/bulk 한 번에 요청할 최대 상품 수
+BULK_CHUNK_SIZE = 1000
+
+
+def to_recommend_item(p: dict) -> RecommendItem:
+    return RecommendItem(
+        id=p["id"],
+        img_url=p.get("img_url") or "",
+        name=p.get("name") or "",              # product_name → name
+        brand_kor=p.get("brand_kor") or "",
+        discount=p.get("discount") or 0,
+        price=p.get("discounted_price") or 0,  # price 필드 채우기
+    )
+
+
+def _chunks(product_ids: List[int], size: int) -> Iterable[List[int]]:
+    for start in range(0, len(product_ids), size):
+        yield product_ids[start:start + size]
+
+
+async def fetch_bulk(
+    client: httpx.AsyncClient,
+    bulk_url: str,
+    product_ids: List[int],
+    timeout: float = 10.0
+) -> Dict[int, RecommendItem]:
+    """
+    중복 제거된 상품 ID 를 BULK_CHUNK_SIZE 단위로 조회하여 {id: RecommendItem} 으로 반환합니다.
+    """
+    items: Dict[int, RecommendItem] = {}
+    for chunk in _chunks(list(dict.fromkeys(product_ids)), BULK_CHUNK_SIZE):
+        resp = await client.post(bulk_url, json={"product_ids": chunk}, timeout=timeout)
+        resp.raise_for_status()
+        for p in resp.json():
+            items[p["id"]] = to_recommend_item(p)
+    return items
+
+
+def fetch_bulk_sync(
+    client: httpx.Client,
+    bulk_url: str,
+    product_ids: List[int],
+    timeout: float = 30.0
+) -> Dict[int, RecommendItem]:
+    """fetch_bulk 의 동기 버전 (오프라인 배치 작업용)."""
+    items: Dict[int, RecommendItem] = {}
+    for chunk in _chunks(list(dict.fromkeys(product_ids)), BULK_CHUNK_SIZE):
+        resp = client.post(bulk_url, json={"product_ids": chunk}, timeout=timeout)
+        resp.raise_for_status()
+        for p in resp.json():
+            items[p["id"]] = to_recommend_item(p)
+    return items
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """
+    상품 서비스 호출용 공유 클라이언트. 연결 수 / keep-alive 는 환경변수로 조정합니다.
+    """
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("PRODUCT_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("PRODUCT_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("PRODUCT_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+    timeout = httpx.Timeout(float(os.getenv("PRODUCT_HTTP_TIMEOUT", "10")), connect=3.0)
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+class Hydrator:
+    """
+    공유 클라이언트 + 상품 캐시를 통한 hydration.
+
+    캐시에 없는 상품만 /product/bulk 로 조회하고 결과를 캐시에 채웁니다.
+    상품이 변경되면 invalidate() 로 해당 ID 를 제거합니다.
+    """
+
+    def __init__(
+        self,
+        bulk_url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[TTLCache] = None
+    ):
+        self.bulk_url = bulk_url
+        self.client = client
+        self.cache = cache or TTLCache(
+            ttl=float(os.getenv("HYDRATION_CACHE_TTL", "300")),
+            max_size=int(os.getenv("HYDRATION_CACHE_SIZE", "50000")),
+        )
+
+    async def start(self) -> None:
+        if self.client is None:
+            self.client = build_http_client()
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def get_many(self, product_ids: List[int]) -> Dict[int, RecommendItem]:
+        """
+        상품 ID 목록을 {id: RecommendItem} 으로 반환합니다 (캐시 우선, 미스만 일괄 조회).
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        items = self.cache.get_many(product_ids)
+        missing = [pid for pid in product_ids if pid not in items]
+        if missing:
+            fetched = await fetch_bulk(self.client, self.bulk_url, missing)
+            self.cache.put_many(fetched)
+            items.update(fetched)
+        return items
+
+    def invalidate(self, product_ids: Iterable[int]) -> int:
+        return self.cache.invalidate(product_ids)
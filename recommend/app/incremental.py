@@ -0,0 +1,230 @@
+# recommend/app/incremental.py
+"""
+상품 변경분만 반영하는 증분 모델 업데이트.
+
+변경된 상품 행만 fit 완료된 전처리기로 transform 하고, 이웃 테이블은
+    - 변경된 아이템 자신의 이웃 목록
+    - 변경된 아이템이 새로 들어오거나 빠져야 하는 다른 아이템의 목록
+만 갱신합니다. 전처리 통계(스케일러 범위)를 벗어나는 행이 누적되면
+needs_refit() 이 True 가 되어 전체 재학습을 예약합니다.
+
+좋아요 / 조회 / 구매 수 같은 카운터 변경은 증분 업데이트로 받지 않고,
+주기적 재학습 때 apply_counters() 로 최신 값을 합쳐 한꺼번에 반영합니다.
+"""
+import os
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from .model_store import RecModel, ITEM_COLUMNS, new_version
+from .neighbors import (
+    NeighborIndex,
+    build_neighbor_index,
+    l2_normalize,
+    similarity_block,
+    to_dense,
+    topk_from_scores,
+)
+
+logger = logging.getLogger("recommend.model")
+
+# 누적 drift 행 비율이 이 값을 넘으면 전체 재학습
+REFIT_DRIFT_THRESHOLD = float(os.getenv("REFIT_DRIFT_THRESHOLD", "0.05"))
+# 마지막 전체 학습 이후 변경된 행 비율이 이 값을 넘으면 전체 재학습
+REFIT_MAX_UPDATE_RATIO = float(os.getenv("REFIT_MAX_UPDATE_RATIO", "0.3"))
+
+# 주기적 재학습 때 상품 서비스의 최신 값으로 덮어쓰는 카운터 컬럼
+COUNTER_COLUMNS = ("like_count", "view_count", "purchase_count", "like_count_brand")
+
+# 변경 행과의 유사도를 계산할 때 블록당 행 수
+MERGE_BLOCK_ROWS = 16_384
+
+
+def _drifted_rows(model: RecModel, raw: np.ndarray) -> np.ndarray:
+    """
+    transform 결과가 fit 시점의 출력 범위를 벗어난 행 마스크를 반환합니다.
+    (MinMaxScaler 범위 밖 가격/할인율, RobustScaler 기준 이상치 등)
+    """
+    if "feature_min" not in model.meta or not len(raw):
+        return np.zeros(len(raw), dtype=bool)
+    lo = np.asarray(model.meta["feature_min"])
+    hi = np.asarray(model.meta["feature_max"])
+    tol = 1e-6 + 0.01 * (hi - lo)
+    return ((raw < lo - tol) | (raw > hi + tol)).any(axis=1)
+
+
+def _merge_rows(
+    features: np.ndarray,
+    ids: np.ndarray,
+    scores: np.ndarray,
+    rows: np.ndarray,
+    changed: np.ndarray,
+    k: int
+) -> None:
+    """
+    rows 의 기존 이웃 목록에 변경 아이템(changed)의 새 점수를 합쳐 상위 k를 다시 고릅니다 (in-place).
+    """
+    changed_features = features[changed]
+    for start in range(0, len(rows), MERGE_BLOCK_ROWS):
+        block = rows[start:start + MERGE_BLOCK_ROWS]
+        cand_scores = similarity_block(changed_features, features[block]).T.copy()
+        cand_scores[changed[None, :] == block[:, None]] = -np.inf
+        merged_ids = np.concatenate([ids[block], np.broadcast_to(changed, cand_scores.shape)], axis=1)
+        merged_scores = np.concatenate([scores[block], cand_scores], axis=1)
+        top_pos, top_scores = topk_from_scores(merged_scores, k)
+        ids[block] = np.take_along_axis(merged_ids, top_pos, axis=1)
+        scores[block] = top_scores
+
+
+def apply_product_updates(
+    model: RecModel,
+    upserts: pd.DataFrame,
+    deleted_ids=()
+) -> RecModel:
+    """
+    변경/추가된 상품과 삭제된 상품 ID 를 반영한 새 모델을 반환합니다 (기존 모델은 변경하지 않음).
+
+    이웃 점수는 정확한 코사인으로 다시 계산하므로, IVF 로 빌드된 모델에서도
+    변경 행은 exact 결과가 됩니다.
+
+    Args:
+        model (RecModel): 현재 서비스 중인 모델
+        upserts (pd.DataFrame): 변경/추가된 상품 (load_data 와 같은 컬럼 구성)
+        deleted_ids (iterable): 삭제된 상품 ID
+
+    Returns:
+        RecModel: 변경분이 반영된 새 버전 모델
+    """
+    k = model.neighbors.k
+    items = model.items
+    sparse = sp.issparse(model.features)
+    features = (
+        sp.csr_matrix(model.features, dtype=np.float32, copy=True) if sparse
+        else np.array(model.features, dtype=np.float32)
+    )
+    ids = np.array(model.neighbors.ids, dtype=np.int32)
+    scores = np.array(model.neighbors.scores, dtype=np.float32)
+
+    # 1) 삭제 + 갱신 대상 기존 행 제거 후 이웃 ID 재매핑 (제거된 행 → -1)
+    if upserts.empty:
+        upserts = pd.DataFrame(columns=ITEM_COLUMNS)
+    upserts = upserts.drop_duplicates('id', keep='last')
+    upsert_ids = set(int(i) for i in upserts['id'])
+    removed = {int(i) for i in deleted_ids} | upsert_ids
+    keep = ~items['id'].isin(removed).to_numpy()
+    remap = np.full(len(items) + 1, -1, dtype=np.int32)
+    remap[:-1][keep] = np.arange(keep.sum(), dtype=np.int32)
+    ids = remap[ids[keep]]
+    scores = scores[keep]
+    features = features[keep]
+    items = items[keep]
+
+    # 2) 변경 행만 fit 완료된 전처리기로 transform 하여 끝에 추가
+    raw = (
+        model.preprocessor.transform(upserts)
+        if len(upserts) else np.empty((0, features.shape[1]), dtype=np.float32)
+    )
+    drifted = _drifted_rows(model, to_dense(raw).astype(np.float32))
+    n_kept = len(items)
+    changed = np.arange(n_kept, n_kept + len(upserts), dtype=np.int32)
+    if sparse:
+        features = sp.vstack([features, l2_normalize(sp.csr_matrix(raw))], format="csr")
+    else:
+        features = np.vstack([features, l2_normalize(to_dense(raw))])
+    items = pd.concat([items, upserts.reindex(columns=ITEM_COLUMNS)], ignore_index=True)
+    ids = np.vstack([ids, np.full((len(changed), k), -1, dtype=np.int32)])
+    scores = np.vstack([scores, np.full((len(changed), k), -np.inf, dtype=np.float32)])
+
+    # 3) 기존 목록에서 이웃이 빠진 행은 (k+1)번째 이웃을 알 수 없으므로 전체 재계산,
+    #    나머지는 변경 아이템 점수만 병합
+    lost = np.zeros(len(items), dtype=bool)
+    lost[:n_kept] = (ids[:n_kept] < 0).any(axis=1)
+    recompute = np.concatenate([np.flatnonzero(lost), changed])
+    merge = np.flatnonzero(~lost[:n_kept])
+    if len(changed):
+        _merge_rows(features, ids, scores, merge, changed, k)
+    if len(recompute):
+        fresh = build_neighbor_index(features, top_k=k, rows=recompute)
+        kk = fresh.k
+        ids[recompute, :kk] = fresh.ids
+        scores[recompute, :kk] = fresh.scores
+
+    meta = dict(model.meta)
+    meta.update({
+        "version": new_version(),
+        "base_version": model.meta.get("base_version", model.version),
+        "updated_at": datetime.utcnow().isoformat(),
+        "n_items": int(len(items)),
+        "updated_rows_since_fit": int(model.meta.get("updated_rows_since_fit", 0) + len(changed)),
+        "drifted_rows_since_fit": int(model.meta.get("drifted_rows_since_fit", 0) + drifted.sum()),
+    })
+    logger.info(
+        f"model_incremental_update\tbase={model.version}\tnew={meta['version']}"
+        f"\tupserted={len(changed)}\tdeleted={len(removed - upsert_ids)}"
+        f"\trecomputed={len(recompute)}\tdrifted={int(drifted.sum())}"
+    )
+    return RecModel(
+        version=meta["version"],
+        preprocessor=model.preprocessor,
+        features=features,
+        items=items,
+        neighbors=NeighborIndex(ids=ids, scores=scores),
+        meta=meta,
+    )
+
+
+def needs_refit(
+    model: RecModel,
+    drift_threshold: float = REFIT_DRIFT_THRESHOLD,
+    max_update_ratio: float = REFIT_MAX_UPDATE_RATIO
+) -> bool:
+    """
+    증분 업데이트가 누적되어 전처리 통계를 다시 fit 해야 하는지 판단합니다.
+    """
+    n = max(1, model.n_items)
+    drift_ratio = model.meta.get("drifted_rows_since_fit", 0) / n
+    update_ratio = model.meta.get("updated_rows_since_fit", 0) / n
+    return drift_ratio > drift_threshold or update_ratio > max_update_ratio
+
+
+def product_docs_to_frame(docs: list) -> pd.DataFrame:
+    """
+    상품 서비스의 CombinedProduct 응답 목록을 load_data 와 같은 컬럼 구성으로 변환합니다.
+    """
+    df = pd.DataFrame(docs).rename(columns={"brand_like_count": "like_count_brand"})
+    if "category_code" in df:
+        df["category_code"] = df["category_code"].astype(str)
+    return df
+
+
+def apply_counters(items: pd.DataFrame, counters: pd.DataFrame) -> pd.DataFrame:
+    """
+    상품 메타데이터의 카운터 컬럼을 최신 값으로 바꾼 복사본을 반환합니다.
+
+    Args:
+        items (pd.DataFrame): 모델의 상품 메타데이터 (ITEM_COLUMNS)
+        counters (pd.DataFrame): 상품 서비스 GET /product/counters 결과
+            (id + 카운터 컬럼; brand_like_count 는 like_count_brand 로 변환)
+
+    Returns:
+        pd.DataFrame: 카운터가 갱신된 상품 메타데이터 (counters 에 없는 상품은 기존 값 유지)
+    """
+    counters = (
+        counters.rename(columns={"brand_like_count": "like_count_brand"})
+        .drop_duplicates("id", keep="last")
+        .set_index("id")
+    )
+    items = items.copy()
+    pos = counters.index.get_indexer(items["id"].to_numpy())
+    found = pos >= 0
+    for col in COUNTER_COLUMNS:
+        if col not in counters or col not in items:
+            continue
+        values = counters[col].astype("float64").to_numpy()[pos[found]]
+        fresh = items[col].to_numpy(dtype=np.float64, copy=True)
+        fresh[found] = np.where(np.isnan(values), fresh[found], values)
+        items[col] = fresh
+    return items
@@ -1,11 +1,25 @@
 # recommend/app/main.py
-from fastapi import FastAPI, HTTPException, Path
-from typing import List
-import httpx
+from fastapi import FastAPI, HTTPException, Path, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+from datetime import datetime
+from functools import partial
+import asyncio
+import json
+import logging
 import os
 
-from .schemas import RecommendItem, RecommendResponse
-from . import cosine_recsys
+import pandas as pd
+
+from .schemas import RecommendItem, RecommendResponse, ProductChangeBatch, ModelUpdateResponse, \
+    UserEventBatch, BatchRecommendRequest
+from . import model_store, incremental, profiles, batch, popularity, collaborative, warmup, cosine_recsys
+from .hydration import Hydrator
+from .executor import ComputeOverloaded, ComputeTimeout, executor_from_env
+from .result_cache import result_cache_from_env, result_key
+from .filters import ItemFilter
+from .rerank import Reranker, reranker_from_env
+from .snapshot import read_snapshot
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -17,30 +31,526 @@ bulk_url = f"{PRODUCT_BASE_URL}/bulk"
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PRODUCT_JSON = os.path.join(BASE_DIR, "data", "product.json")
 BRAND_JSON = os.path.join(BASE_DIR, "data", "brand.json")
+CATALOG_SNAPSHOT = os.getenv("CATALOG_SNAPSHOT", os.path.join(BASE_DIR, "data", "catalog.snap"))
+MODEL_DIR = os.getenv("MODEL_DIR", os.path.join(BASE_DIR, "model"))
+MODEL_RELOAD_INTERVAL = float(os.getenv("MODEL_RELOAD_INTERVAL", "30"))
+MODEL_REFIT_CHECK_INTERVAL = float(os.getenv("MODEL_REFIT_CHECK_INTERVAL", "300"))
+MODEL_KEEP_VERSIONS = int(os.getenv("MODEL_KEEP_VERSIONS", "3"))
+# 좋아요 / 조회 / 구매 수를 최신 값으로 합쳐 전체 재학습하는 주기 (초)
+MODEL_COUNTER_REFIT_INTERVAL = float(os.getenv("MODEL_COUNTER_REFIT_INTERVAL", "3600"))
+COUNTER_PAGE_SIZE = 5000
+# 증분 업데이트: 변경 상품 상세를 동시에 조회할 최대 요청 수
+PRODUCT_FETCH_CONCURRENCY = int(os.getenv("PRODUCT_FETCH_CONCURRENCY", "16"))
+# 일괄 추천: 블록당 사용자 수 / 블록별 계산 제한 시간 (초) / 이력 일괄 조회 단위
+BATCH_BLOCK_USERS = int(os.getenv("BATCH_BLOCK_USERS", "500"))
+BATCH_COMPUTE_TIMEOUT = float(os.getenv("BATCH_COMPUTE_TIMEOUT", "60"))
+HISTORY_BULK_SIZE = 500
+CF_DIR = os.getenv("CF_DIR", os.path.join(BASE_DIR, "cf"))
+POPULARITY_REFRESH_INTERVAL = float(os.getenv("POPULARITY_REFRESH_INTERVAL", "300"))
+TRENDING_WINDOW_HOURS = int(os.getenv("TRENDING_WINDOW_HOURS", "72"))
+
+logger = logging.getLogger("recommend")
+model_holder = model_store.ModelHolder(MODEL_DIR)
+# 증분 업데이트 / 전체 재학습이 동시에 모델을 교체하지 않도록 직렬화
+# (프로세스 내 대기용; 프로세스 간에는 ModelHolder.publish 의 publish_lock 으로 직렬화)
+model_update_lock = asyncio.Lock()
+# 상품 서비스 공유 클라이언트 + 상품 hydration 캐시
+hydrator = Hydrator(bulk_url)
+# 추천 계산은 이벤트 루프 밖 실행기에서 (대기열 상한 / 요청별 제한 시간)
+compute = executor_from_env()
+# 추천 결과 캐시 (프로세스 내 LRU + 선택적 공유 저장소)
+result_cache = result_cache_from_env()
+# 이력 없는 사용자용 인기 / 트렌딩 순위 (주기적으로 통째로 교체)
+popularity_ranker: Optional[popularity.PopularityRanker] = None
+# 협업 필터링 인덱스 (python -m app.collaborative 로 학습, CF_DIR 의 CURRENT 버전)
+cf_index: Optional[collaborative.CFIndex] = None
+# 후보 검색 이후 다양성 재정렬 (MMR + 브랜드 / 카테고리 cap)
+reranker = reranker_from_env()
+profile_cache = profiles.ProfileCache(
+    ttl=float(os.getenv("PROFILE_TTL", "600")),
+    max_size=int(os.getenv("PROFILE_CACHE_SIZE", "100000")),
+)
+# 기동 단계 / readiness (모델 로드 + 워밍업이 끝나야 ready)
+startup = warmup.StartupState()
+
+
+def warm_model(model: model_store.RecModel):
+    # 새 모델은 교체 직전 워밍업 (지연 생성 인덱스 / 이웃 테이블 / 피처 mmap 페이지)
+    warmup.warm_up(model, reranker=reranker, popularity=popularity_ranker)
+
+
+model_holder.warm_up = warm_model
+
+
+@app.on_event("startup")
+async def start_http_client():
+    await hydrator.start()
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await hydrator.close()
+    compute.shutdown()
+
+
+@app.exception_handler(ComputeOverloaded)
+async def compute_overloaded_handler(request: Request, exc: ComputeOverloaded):
+    # 대기열이 가득 차면 즉시 거절 (load shedding)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "추천 계산 대기열 초과"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(ComputeTimeout)
+async def compute_timeout_handler(request: Request, exc: ComputeTimeout):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "추천 계산 시간 초과"},
+        headers={"Retry-After": str(compute.retry_after)},
+    )
+
+
+@app.on_event("startup")
+async def load_recommend_model():
+    # 모델 로드 / 빌드와 워밍업은 백그라운드에서 진행
+    # (그동안 /health/live 는 200, /health/ready 는 503 이라 트래픽이 들어오지 않음)
+    asyncio.create_task(start_service())
+
+
+def prepare_model() -> model_store.RecModel:
+    # 저장된 아티팩트가 있으면 로드, 없으면 최초 1회 빌드 후 저장 (단계별 시간 기록)
+    if model_store.current_version(MODEL_DIR) is None:
+        # 여러 워커가 동시에 기동해도 한 번만 빌드 (잠금 대기 후 다른 워커의 버전이 있으면 그대로 사용)
+        with model_store.publish_lock(MODEL_DIR):
+            if model_store.current_version(MODEL_DIR) is None:
+                build_initial_model()
+    # 저장본을 mmap 으로 다시 열어 워커 간 페이지 공유
+    with startup.stage("load"):
+        return model_store.load_model(MODEL_DIR)
+
+
+def build_initial_model():
+    with startup.stage("load"):
+        if os.path.isdir(CATALOG_SNAPSHOT):
+            df = read_snapshot(CATALOG_SNAPSHOT, mmap=True)
+            source = {"snapshot_path": CATALOG_SNAPSHOT}
+        else:
+            df = cosine_recsys.load_data(PRODUCT_JSON, BRAND_JSON)
+            source = {"product_path": PRODUCT_JSON, "brand_path": BRAND_JSON}
+    startup.phase = "transform"
+    built = model_store.build_model_from_frame(df, source=source)
+    startup.record("transform", built.meta["build_seconds"]["preprocess"])
+    startup.record("index", built.meta["build_seconds"]["similarity"])
+    with startup.stage("save"):
+        model_store.save_model(built, MODEL_DIR)
+
+
+async def start_service():
+    try:
+        model = await asyncio.to_thread(prepare_model)
+        try:
+            await reload_cf_if_changed()
+        except Exception as e:
+            logger.warning(f"cf_load_failed\terror={e}")
+        await refresh_popularity(model)
+        with startup.stage("warmup"):
+            await asyncio.to_thread(warm_model, model)
+        model_holder.swap(model, warm_up=False)
+    except Exception as e:
+        startup.fail(e)
+        return
+    startup.mark_ready()
+    asyncio.create_task(watch_model_updates())
+    asyncio.create_task(refit_periodically())
+    asyncio.create_task(refresh_popularity_periodically())
+
+
+async def watch_model_updates():
+    # 외부 빌드(python -m app.model_store)로 CURRENT 가 바뀌면 새 버전으로 교체
+    while True:
+        await asyncio.sleep(MODEL_RELOAD_INTERVAL)
+        try:
+            await asyncio.to_thread(model_holder.reload_if_changed)
+            await reload_cf_if_changed()
+        except Exception as e:
+            logger.error(f"model_reload_failed\terror={e}")
+
+
+async def reload_cf_if_changed():
+    # CF_DIR 의 CURRENT 가 바뀌었으면 새 CF 인덱스 로드 (없으면 콘텐츠 점수만 사용)
+    global cf_index
+    version = model_store.current_version(CF_DIR)
+    if version is None or (cf_index is not None and cf_index.version == version):
+        return
+    cf_index = await asyncio.to_thread(collaborative.load_cf, CF_DIR)
+    logger.info(f"cf_loaded\tversion={cf_index.version}")
+
+
+def resolve_cf_weight(cf_weight: Optional[float]) -> float:
+    # CF 인덱스가 없으면 항상 0 (콘텐츠 점수만)
+    if cf_index is None:
+        return 0.0
+    return collaborative.CF_BLEND_WEIGHT if cf_weight is None else cf_weight
+
+
+async def refresh_popularity(model: Optional[model_store.RecModel] = None):
+    # 현재 모델의 상품 메타데이터 + 상품 서비스의 최근 조회/구매 집계로 인기 순위 재빌드
+    global popularity_ranker
+    model = model or model_holder.get()
+    if model is None:
+        return
+    trending = None
+    try:
+        resp = await hydrator.client.get(
+            f"{PRODUCT_BASE_URL}/trending/events", params={"hours": TRENDING_WINDOW_HOURS}
+        )
+        resp.raise_for_status()
+        trending = popularity.decayed_counts(resp.json()["events"])
+    except Exception as e:
+        # 트렌딩 집계 실패 시 누적 지표만으로 빌드
+        logger.warning(f"trending_fetch_failed\terror={e}")
+    popularity_ranker = await asyncio.to_thread(popularity.build_ranker, model.items, trending)
+
+
+async def refresh_popularity_periodically():
+    while True:
+        await asyncio.sleep(POPULARITY_REFRESH_INTERVAL)
+        try:
+            await refresh_popularity()
+        except Exception as e:
+            logger.error(f"popularity_refresh_failed\terror={e}")
+
+
+def counters_stale(model: model_store.RecModel) -> bool:
+    # 카운터(좋아요 / 조회 / 구매 수)를 마지막으로 반영한 뒤 MODEL_COUNTER_REFIT_INTERVAL 이 지났는지
+    refreshed_at = model.meta.get("counters_at") or model.meta.get("built_at")
+    if refreshed_at is None:
+        return True
+    age = datetime.utcnow() - datetime.fromisoformat(refreshed_at)
+    return age.total_seconds() > MODEL_COUNTER_REFIT_INTERVAL
+
+
+def refit_model(
+    base: model_store.RecModel,
+    counters: Optional[pd.DataFrame] = None
+) -> Optional[model_store.RecModel]:
+    """
+    기준 모델(최신 CURRENT)의 카탈로그로 전처리부터 다시 fit 합니다. counters 가 주어지면 최신 카운터를 합칩니다.
+
+    다른 프로세스가 먼저 재학습해 더 할 일이 없으면 None (게시하지 않음).
+    """
+    refresh_counters = counters is not None and counters_stale(base)
+    if not refresh_counters and not incremental.needs_refit(base):
+        return None
+    items = incremental.apply_counters(base.items, counters) if refresh_counters else base.items
+    refit = model_store.build_model_from_frame(
+        items,
+        base.neighbors.k,
+        base.meta.get("similarity_backend"),
+        sparse=base.meta.get("sparse_features", False),
+    )
+    refit.meta["counters_at"] = (
+        refit.meta["built_at"] if refresh_counters
+        else base.meta.get("counters_at") or base.meta.get("built_at")
+    )
+    return refit
+
+
+async def fetch_counters() -> pd.DataFrame:
+    # 상품 서비스에서 전체 상품의 카운터를 id 순 페이지로 조회
+    rows, after_id = [], None
+    while True:
+        params = {"limit": COUNTER_PAGE_SIZE}
+        if after_id is not None:
+            params["after_id"] = after_id
+        resp = await hydrator.client.get(f"{PRODUCT_BASE_URL}/counters", params=params)
+        resp.raise_for_status()
+        page = resp.json()
+        rows.extend(page["items"])
+        after_id = page["next_after_id"]
+        if after_id is None:
+            return pd.DataFrame(rows)
+
+
+async def refit_periodically():
+    # 증분 업데이트로 전처리 통계가 어긋나거나 카운터가 오래되면 현재 카탈로그 전체로 다시 fit
+    # (카운터 변경은 증분 업데이트로 받지 않으므로 여기서 한꺼번에 반영)
+    while True:
+        await asyncio.sleep(MODEL_REFIT_CHECK_INTERVAL)
+        model = model_holder.get()
+        if model is None:
+            continue
+        refresh_counters = counters_stale(model)
+        if not refresh_counters and not incremental.needs_refit(model):
+            continue
+        try:
+            counters = await fetch_counters() if refresh_counters else None
+            async with model_update_lock:
+                refit = await asyncio.to_thread(
+                    model_holder.publish, partial(refit_model, counters=counters), MODEL_KEEP_VERSIONS
+                )
+            if refit is not None:
+                logger.info(
+                    f"model_refit\tbase={model.version}\tnew={refit.version}\tcounters={counters is not None}"
+                )
+        except Exception as e:
+            logger.error(f"model_refit_failed\terror={e}")
+
+
+async def fetch_products(product_ids: List[int]) -> tuple:
+    # 상품 서비스에서 변경 상품 상세 조회. 404 는 삭제된 상품으로 간주
+    # (/product/bulk 응답에는 피처 컬럼이 없으므로 상세 조회를 동시 요청 수 제한 안에서 수행)
+    limit = asyncio.Semaphore(PRODUCT_FETCH_CONCURRENCY)
+
+    async def fetch(pid: int):
+        async with limit:
+            return await hydrator.client.get(f"{PRODUCT_BASE_URL}/{pid}")
+
+    responses = await asyncio.gather(*(fetch(pid) for pid in product_ids))
+    docs, deleted = [], []
+    for pid, resp in zip(product_ids, responses):
+        if resp.status_code == 404:
+            deleted.append(pid)
+            continue
+        resp.raise_for_status()
+        docs.append(resp.json())
+    return docs, deleted
+
+
+@app.post("/model/updates", response_model=ModelUpdateResponse)
+async def apply_model_updates(batch: ProductChangeBatch):
+    """
+    변경된 상품 ID 묶음을 받아 해당 행과 영향받는 이웃 목록만 갱신합니다.
+    """
+    if model_holder.get() is None:
+        raise HTTPException(status_code=503, detail="추천 모델 준비 중")
+    product_ids = list(dict.fromkeys(batch.product_ids))
+    try:
+        docs, deleted = await fetch_products(product_ids)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"상품 서비스 오류: {e}")
+    hydrator.invalidate(product_ids)
+
+    # 다른 프로세스가 먼저 게시한 버전이 있으면 그 위에 적용 (publish_lock + rebase)
+    upserts = incremental.product_docs_to_frame(docs)
+    async with model_update_lock:
+        updated = await asyncio.to_thread(
+            model_holder.publish,
+            lambda base: incremental.apply_product_updates(base, upserts, deleted),
+            MODEL_KEEP_VERSIONS,
+        )
+
+    return ModelUpdateResponse(
+        version=updated.version,
+        upserted=len(docs),
+        deleted=len(deleted),
+        refit_scheduled=incremental.needs_refit(updated),
+    )
+
+
+def history_events(history: dict) -> list:
+    # 상품 서비스 행동 이력 응답 → (product_id, kind) 이벤트 목록
+    return (
+        [(pid, "like") for pid in history.get("likes", [])]
+        + [(pid, "view") for pid in history.get("views", [])]
+        + [(pid, "purchase") for pid in history.get("purchases", [])]
+    )
+
+
+async def get_user_profile(user_id: str):
+    # 캐시 → 상품 서비스 행동 이력 순으로 프로필 조회. 실패 시 None (기준 아이템 방식으로 대체)
+    if user_id == "guest":
+        return None
+    profile = profile_cache.get(user_id)
+    if profile is not None:
+        return profile
+    try:
+        resp = await hydrator.client.get(f"{PRODUCT_BASE_URL}/user/{user_id}/events", timeout=5.0)
+        resp.raise_for_status()
+        history = resp.json()
+    except Exception as e:
+        logger.warning(f"profile_fetch_failed\tuser_id={user_id}\terror={e}")
+        return None
+    profile = profiles.build_profile(user_id, history_events(history))
+    profile_cache.put(profile)
+    return profile
+
+
+async def get_user_profiles(user_ids: List[str], events: Optional[dict] = None) -> dict:
+    """
+    여러 사용자의 프로필을 요청 이벤트 → 프로필 캐시 → 상품 서비스 일괄 이력 조회 순으로 만듭니다.
+
+    Args:
+        user_ids (list): 사용자 ID 목록
+        events (dict, optional): user_id → [(product_id, kind), ...] (요청에 담긴 이벤트)
+
+    Returns:
+        dict: user_id → UserProfile (이력 조회에 실패한 사용자는 빠짐)
+    """
+    events = events or {}
+    loaded, missing = {}, []
+    for uid in dict.fromkeys(user_ids):
+        if uid in events:
+            loaded[uid] = profiles.build_profile(uid, events[uid])
+        elif uid != "guest":
+            profile = profile_cache.get(uid)
+            if profile is None:
+                missing.append(uid)
+            else:
+                loaded[uid] = profile
+    for start in range(0, len(missing), HISTORY_BULK_SIZE):
+        chunk = missing[start:start + HISTORY_BULK_SIZE]
+        try:
+            resp = await hydrator.client.post(
+                f"{PRODUCT_BASE_URL}/user/events/bulk", json={"user_ids": chunk}, timeout=30.0
+            )
+            resp.raise_for_status()
+            histories = resp.json()
+        except Exception as e:
+            # 이력을 못 가져온 사용자는 이력 없는 사용자와 같은 경로 (인기 / 기준 아이템)
+            logger.warning(f"profile_bulk_fetch_failed\tcount={len(chunk)}\terror={e}")
+            continue
+        for history in histories:
+            profile = profiles.build_profile(history["user_id"], history_events(history))
+            profile_cache.put(profile)
+            loaded[profile.user_id] = profile
+    return loaded
+
+
+@app.post("/profile/events", status_code=202)
+async def ingest_user_events(batch: UserEventBatch):
+    """
+    상품 서비스에서 전달된 행동 이벤트를 캐시된 프로필에 증분 반영하고,
+    이벤트가 있는 사용자의 캐시된 추천 결과를 무효화합니다.
+    """
+    model = model_holder.get()
+    applied = sum(
+        profile_cache.apply_event(e.user_id, e.product_id, e.type, model)
+        for e in batch.events
+    )
+    evicted = await result_cache.invalidate_users(e.user_id for e in batch.events)
+    return {"received": len(batch.events), "applied": applied, "evicted": evicted}
+
 
 @app.get("/health", status_code=200)
 async def health_check():
+    return {"status": "ok", "ready": startup.ready, "phase": startup.phase, "compute": compute.stats()}
+
+
+@app.get("/health/live")
+async def liveness():
+    # 이벤트 루프가 응답하면 살아 있음. 기동이 실패했으면 재시작되도록 503
+    if startup.phase == "failed":
+        return JSONResponse(status_code=503, content={"status": "failed", "error": startup.error})
     return {"status": "ok"}
 
+
+@app.get("/health/ready")
+async def readiness():
+    # 모델 로드 + 워밍업이 끝난 인스턴스만 트래픽을 받음
+    state = startup.snapshot()
+    model = model_holder.get()
+    if not startup.ready or model is None:
+        return JSONResponse(status_code=503, content=state)
+    return {**state, "model_version": model.version, "build_seconds": model.meta.get("build_seconds")}
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    # 캐시별 hit/miss 카운터
+    return {
+        "hydration": hydrator.cache.stats(),
+        "profile": profile_cache.stats(),
+        "result": result_cache.stats(),
+    }
+
+
+@app.get("/popular", response_model=RecommendResponse)
+async def get_popular(
+    top_n: int = 6,
+    gender: Optional[str] = None,
+    major_category: Optional[str] = None
+):
+    """
+    세그먼트(gender × major_category)별 인기 / 트렌딩 상품. 미리 정렬된 목록을 잘라 반환합니다.
+    """
+    if popularity_ranker is None:
+        raise HTTPException(status_code=503, detail="추천 모델 준비 중")
+    product_ids = [int(pid) for pid in popularity_ranker.top(top_n, gender, major_category)]
+    try:
+        items = await hydrator.get_many(product_ids)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"상품 서비스 오류: {e}")
+    return RecommendResponse(
+        user_account="비회원",
+        recommends=[items[pid] for pid in product_ids if pid in items],
+    )
+
+
 @app.get("/recommend/{user_id}", response_model=RecommendResponse)
 async def get_recommendations(
     user_id: str = Path(..., description="추천 대상 사용자 ID"),
-    top_n: int = 6
+    top_n: int = 6,
+    cf_weight: Optional[float] = Query(None, ge=0.0, le=1.0, description="협업 필터링 혼합 비율"),
+    gender: Optional[str] = Query(None, description="성별 코드 (성별 무관 상품 포함)"),
+    major_category: Optional[str] = Query(None, description="대분류"),
+    brand_id: Optional[List[int]] = Query(None, description="허용 브랜드 ID (여러 개 가능)"),
+    min_price: Optional[float] = Query(None, ge=0, description="최소 할인가"),
+    max_price: Optional[float] = Query(None, ge=0, description="최대 할인가"),
+    mmr_lambda: Optional[float] = Query(None, ge=0.0, le=1.0, description="다양성 재정렬 관련도 가중치")
 ):
-    print("start of get recommend/user_id")
-    # 1) 추천 ID 리스트
+    logger.debug(f"recommend_start\tuser_id={user_id}\ttop_n={top_n}")
+    model = model_holder.get()
+    if model is None:
+        raise HTTPException(status_code=503, detail="추천 모델 준비 중")
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=422, detail="min_price 가 max_price 보다 큽니다")
+    item_filter = ItemFilter(
+        gender=gender,
+        major_category=major_category,
+        brand_ids=tuple(brand_id) if brand_id else None,
+        min_price=min_price,
+        max_price=max_price,
+    )
+    cf, cf_weight = cf_index, resolve_cf_weight(cf_weight)
+    rerank = reranker.with_lambda(mmr_lambda)
+    # 같은 (사용자, top_n, 모델 / CF 버전, CF 비율, 필터, 재정렬 설정) 결과는 캐시에서 제공,
+    # 동시 요청은 계산 1회로 합침
+    key = result_key(
+        user_id, top_n, model.version, cf.version if cf else "-", cf_weight,
+        item_filter.cache_key(), rerank.cache_key()
+    )
+    return await result_cache.get_or_compute(
+        key, lambda: compute_recommendations(model, user_id, top_n, cf, cf_weight, item_filter, rerank)
+    )
+
+
+async def compute_recommendations(
+    model: model_store.RecModel,
+    user_id: str,
+    top_n: int,
+    cf: Optional[collaborative.CFIndex] = None,
+    cf_weight: float = 0.0,
+    item_filter: Optional[ItemFilter] = None,
+    rerank: Optional[Reranker] = None
+) -> dict:
+    # 1) 추천 ID 리스트 (사전 빌드된 모델 조회)
+    profile = await get_user_profile(user_id)
     try:
-        result = cosine_recsys.run_recommendation(
-            user_id=user_id,
-            top_n=top_n,
-            product_path=PRODUCT_JSON,
-            brand_path=BRAND_JSON
+        result = await compute.run(
+            model_store.recommend_for_user, model, user_id=user_id, top_n=top_n,
+            profile=profile, popularity=popularity_ranker, cf=cf, cf_weight=cf_weight,
+            item_filter=item_filter, reranker=rerank,
         )
         product_ids = result["product_id"]
+    except (ComputeOverloaded, ComputeTimeout):
+        raise
     except Exception as e:
-        print("[DEBUG][추천 모델 에러]", e)
+        logger.error(f"recommend_failed\tuser_id={user_id}\terror={e}")
         raise HTTPException(status_code=500, detail=f"추천 모델 에러: {e}")
-    print("[DEBUG] product_ids:", product_ids)
+    logger.debug(f"recommend_result\tuser_id={user_id}\tproduct_ids={product_ids}")
 
     # # 2) 사용자 계정 정보 조회 (생략 가능)
     # try:
@@ -61,30 +571,82 @@ async def get_recommendations(
 
     # 3) bulk 엔드포인트 호출
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                bulk_url,
-                json={"product_ids": product_ids},
-                timeout=10.0,
-            )
-            resp.raise_for_status()
-            prods = resp.json()  # List[dict]
+        items = await hydrator.get_many(product_ids)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"상품 서비스 오류: {e}")
 
-    # 4) RecommendItem → RecommendResponse 매핑
-    recommends: List[RecommendItem] = []
-    for p in prods:
-        recommends.append(RecommendItem(
-            id=p["id"],
-            img_url=p.get("img_url", ""),
-            name=p.get("name", ""),              # product_name → name
-            brand_kor=p.get("brand_kor", ""),
-            discount=p.get("discount", 0),
-            price=p.get("discounted_price", 0),             # price 필드 채우기
-        ))
+    # 4) RecommendItem → RecommendResponse 매핑 (추천 순서 유지)
+    recommends: List[RecommendItem] = [items[pid] for pid in product_ids if pid in items]
 
     return RecommendResponse(
         user_account=user_account,
         recommends=recommends                  # items → recommends
-    )
\ No newline at end of file
+    ).model_dump()
+
+
+@app.post("/recommend/batch")
+async def get_batch_recommendations(req: BatchRecommendRequest):
+    """
+    여러 사용자의 추천을 사용자 블록(BATCH_BLOCK_USERS) 단위로 계산하여 NDJSON 으로 스트리밍합니다.
+
+    프로필은 요청에 담긴 이벤트 → 프로필 캐시 → 상품 서비스 일괄 이력 조회 순으로 만들고,
+    필터 / 다양성 재정렬은 온라인 추천과 같습니다. 블록마다 결과 상품 ID 를 중복 제거해
+    hydration 한 뒤 바로 전송하므로 메모리 사용량은 블록 크기에 비례합니다.
+    """
+    model = model_holder.get()
+    if model is None:
+        raise HTTPException(status_code=503, detail="추천 모델 준비 중")
+    if req.min_price is not None and req.max_price is not None and req.min_price > req.max_price:
+        raise HTTPException(status_code=422, detail="min_price 가 max_price 보다 큽니다")
+    item_filter = ItemFilter(
+        gender=req.gender,
+        major_category=req.major_category,
+        brand_ids=tuple(req.brand_id) if req.brand_id else None,
+        min_price=req.min_price,
+        max_price=req.max_price,
+    )
+    cf, cf_weight = cf_index, resolve_cf_weight(req.cf_weight)
+    rerank = reranker.with_lambda(req.mmr_lambda)
+    events = {}
+    for e in req.events or ():
+        events.setdefault(e.user_id, []).append((e.product_id, e.type))
+    blocks = [req.user_ids[i:i + BATCH_BLOCK_USERS] for i in range(0, len(req.user_ids), BATCH_BLOCK_USERS)]
+
+    async def run_block(user_ids: List[str]) -> List[str]:
+        # 1) 프로필 → 2) 추천 계산 (실행기) → 3) 블록 결과 hydration
+        block_profiles = await get_user_profiles(user_ids, events)
+        results = await compute.run(
+            batch.recommend_many, model, user_ids, req.top_n, block_profiles,
+            popularity=popularity_ranker, cf=cf, cf_weight=cf_weight,
+            item_filter=item_filter, reranker=rerank,
+            timeout=BATCH_COMPUTE_TIMEOUT,
+        )
+        hydrated = None
+        if req.hydrate:
+            try:
+                hydrated = await hydrator.get_many(batch.unique_product_ids(results))
+            except Exception as e:
+                raise HTTPException(status_code=502, detail=f"상품 서비스 오류: {e}")
+        return list(batch.iter_ndjson(results, hydrated))
+
+    # 첫 블록은 응답 시작 전에 계산해 실행기 포화(503) / 상품 서비스 오류(502)를 상태 코드로 반환
+    first = await run_block(blocks[0])
+
+    async def stream():
+        for line in first:
+            yield line
+        for user_ids in blocks[1:]:
+            try:
+                lines = await run_block(user_ids)
+            except Exception as e:
+                # 응답이 이미 시작됐으므로 실패한 블록의 사용자마다 error 줄을 남기고 계속 진행
+                detail = e.detail if isinstance(e, HTTPException) else type(e).__name__
+                logger.warning(f"batch_block_failed\tusers={len(user_ids)}\terror={detail}")
+                lines = [
+                    json.dumps({"user_id": uid, "error": str(detail)}, ensure_ascii=False) + "\n"
+                    for uid in user_ids
+                ]
+            for line in lines:
+                yield line
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
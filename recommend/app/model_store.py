@@ -0,0 +1,590 @@
+# recommend/app/model_store.py
+"""
+추천 모델 아티팩트의 생성 / 저장 / 로드 / 교체(hot-swap)를 담당합니다.
+
+요청 경로에서는 전처리 fit 이나 유사도 행렬 계산을 하지 않고,
+미리 빌드된 아티팩트의 이웃 테이블만 조회합니다.
+
+디렉토리 구조:
+    MODEL_DIR/
+        CURRENT                 # 현재 서비스 중인 버전명 (한 줄)
+        .publish.lock           # 버전 게시(저장 + CURRENT 교체) 프로세스 간 직렬화용 잠금 파일
+        20250601T120000-ab12/   # 버전별 아티팩트
+            meta.json
+            preprocessor.joblib
+            features.npy            # 밀집 모드 피처
+            features_csr/           # 희소 모드 피처 (data / indices / indptr .npy)
+            neighbor_ids.npy        # NeighborIndex (int32)
+            neighbor_scores.npy     # NeighborIndex (float32)
+            items/                  # 상품 메타 컬럼형 스냅샷 (snapshot.py)
+"""
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import logging
+import argparse
+import uuid
+import fcntl
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cached_property
+from datetime import datetime
+from typing import Callable, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.compose import ColumnTransformer
+
+from . import cosine_recsys, hashing
+from .ann import get_backend
+from .neighbors import (
+    NeighborIndex, l2_normalize, to_dense, similarity_block, topk_from_scores, DEFAULT_TOP_K
+)
+from .snapshot import write_snapshot, read_snapshot
+from .profiles import UserProfile, score_profile_rows
+from .popularity import PopularityRanker
+from .filters import FilterIndex, ItemFilter
+from .rerank import Reranker
+
+logger = logging.getLogger("recommend.model")
+
+CURRENT_FILE = "CURRENT"
+PUBLISH_LOCK_FILE = ".publish.lock"
+# 희소(CSR) 전처리 모드 기본값
+FEATURE_SPARSE = os.getenv("FEATURE_SPARSE", "0") == "1"
+
+# 아티팩트에 함께 저장할 상품 컬럼 (조회/필터/평가용 메타 + 재학습용 원본 피처)
+ITEM_COLUMNS = list(dict.fromkeys(
+    ['id', 'category_code', 'gender', 'major_category', 'brand_id', 'brand_eng', 'discounted_price',
+     'purchase_count']
+    + [col for cols in cosine_recsys.FEATURE_COLUMNS.values() for col in cols]
+))
+
+
+@dataclass
+class RecModel:
+    """
+    빌드가 끝난 추천 모델. 생성 이후에는 읽기 전용으로 취급합니다.
+
+    Attributes:
+        version (str): 아티팩트 버전명
+        preprocessor (ColumnTransformer): fit 완료된 전처리 파이프라인
+        features (np.ndarray | sp.csr_matrix): L2 정규화된 float32 피처 매트릭스 (n_items × d).
+            희소 전처리 모드에서는 CSR
+        items (pd.DataFrame): ITEM_COLUMNS 로 구성된 상품 메타데이터
+        neighbors (NeighborIndex): 아이템별 상위 K개 이웃 인덱스
+        meta (dict): 빌드 시각, 아이템 수 등 부가 정보
+    """
+    version: str
+    preprocessor: ColumnTransformer
+    features: np.ndarray
+    items: pd.DataFrame
+    neighbors: NeighborIndex
+    meta: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        # 상품 ID → 행 인덱스 매핑
+        self.id_to_index = {int(pid): idx for idx, pid in enumerate(self.items['id'])}
+        self.item_ids = self.items['id'].to_numpy()
+
+    @property
+    def n_items(self) -> int:
+        return self.features.shape[0]
+
+    @cached_property
+    def filter_index(self) -> FilterIndex:
+        """속성별 필터 인덱스 (첫 필터 요청 시 한 번 빌드)."""
+        return FilterIndex(self.items)
+
+    @cached_property
+    def rerank_codes(self) -> tuple:
+        """다양성 재정렬용 (브랜드, category_code) 정수 코드 배열."""
+        return (
+            pd.factorize(self.items['brand_id'], use_na_sentinel=False)[0],
+            pd.factorize(self.items['category_code'], use_na_sentinel=False)[0],
+        )
+
+    def similar_rows(self, item_index: int, top_n: int = 6, mask: np.ndarray = None) -> tuple:
+        """
+        item_index 아이템과 가장 유사한 top_n개 (행 인덱스, 유사도)를 반환합니다 (이웃 테이블 조회).
+
+        mask(후보 행 불리언 마스크)가 주어지면 이웃 테이블에서 후보만 남기고,
+        남은 이웃이 top_n 보다 적으면 후보 행만 직접 채점해 정확한 상위 top_n 을 구합니다.
+        """
+        # 필터가 있으면 이웃 테이블 전체(K)에서 후보를 고름
+        top_idx, top_scores = self.neighbors.neighbors(
+            item_index, top_n if mask is None else self.neighbors.k
+        )
+        valid = top_idx >= 0
+        if mask is not None:
+            valid[valid] = mask[top_idx[valid]]
+        top_idx, top_scores = top_idx[valid], top_scores[valid]
+        if mask is None or len(top_idx) >= top_n:
+            return top_idx[:top_n], top_scores[:top_n]
+
+        # 이웃 테이블(상위 K) 밖의 후보가 필요: 후보 행과의 유사도만 계산
+        rows = np.flatnonzero(mask)
+        rows = rows[rows != item_index]
+        if len(rows) == 0:
+            return rows, np.empty(0, dtype=np.float32)
+        scores = similarity_block(self.features[[item_index]], self.features[rows])
+        cand, cand_scores = topk_from_scores(scores, min(top_n, len(rows)))
+        return rows[cand[0]], cand_scores[0]
+
+    def similar_items(self, item_index: int, top_n: int = 6, mask: np.ndarray = None) -> np.ndarray:
+        """
+        item_index 아이템과 가장 유사한 상품 ID를 top_n개 반환합니다 (similar_rows 참고).
+        """
+        rows, _ = self.similar_rows(item_index, top_n, mask=mask)
+        return self.item_ids[rows]
+
+
+def new_version() -> str:
+    """UTC 시각 + 임의 접미사로 정렬 가능한 버전명을 생성합니다."""
+    return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:4]}"
+
+
+def build_model_from_frame(
+    df: pd.DataFrame,
+    top_k: int = DEFAULT_TOP_K,
+    backend: str = None,
+    source: dict = None,
+    sparse: bool = None
+) -> RecModel:
+    """
+    병합된 상품+브랜드 DataFrame 으로 전처리 fit → 피처 매트릭스 → 이웃 테이블을 빌드합니다.
+
+    Args:
+        df (pd.DataFrame): load_data 결과 또는 같은 컬럼 구성을 갖는 상품 데이터
+        top_k (int): 아이템당 보관할 이웃 수
+        backend (str, optional): 유사도 백엔드 이름 (exact / ivf). 생략 시 SIMILARITY_BACKEND
+        source (dict, optional): meta 에 함께 기록할 데이터 출처 정보
+        sparse (bool, optional): 희소(CSR) 전처리 모드. 생략 시 FEATURE_SPARSE
+
+    Returns:
+        RecModel: 빌드된 모델 (아직 저장되지 않음)
+    """
+    sparse = FEATURE_SPARSE if sparse is None else sparse
+    started = time.perf_counter()
+    preprocessor = cosine_recsys.build_preprocessor(**cosine_recsys.FEATURE_COLUMNS, sparse=sparse)
+    feature_matrix = cosine_recsys.compute_feature_matrix(df, preprocessor)
+    if sparse:
+        feature_matrix = sp.csr_matrix(feature_matrix, dtype=np.float32)
+    else:
+        feature_matrix = np.asarray(feature_matrix)
+    features = l2_normalize(feature_matrix)
+    preprocessed = time.perf_counter()
+
+    similarity = get_backend(backend).fit(features)
+    neighbors = similarity.build_neighbor_index(top_k)
+    indexed = time.perf_counter()
+
+    items = df.reindex(columns=ITEM_COLUMNS).reset_index(drop=True)
+    version = new_version()
+    meta = {
+        "version": version,
+        "built_at": datetime.utcnow().isoformat(),
+        "n_items": int(features.shape[0]),
+        "n_features": int(features.shape[1]),
+        "top_k": int(neighbors.k),
+        "similarity_backend": similarity.name,
+        "sparse_features": bool(sparse),
+        # 단계별 빌드 소요 시간 (초)
+        "build_seconds": {
+            "preprocess": round(preprocessed - started, 3),
+            "similarity": round(indexed - preprocessed, 3),
+        },
+        # 전처리 출력의 fit 시점 범위 (증분 업데이트 drift 판단 기준)
+        "feature_min": to_dense(feature_matrix.min(axis=0)).ravel().tolist(),
+        "feature_max": to_dense(feature_matrix.max(axis=0)).ravel().tolist(),
+        **(source or {}),
+    }
+    return RecModel(
+        version=version,
+        preprocessor=preprocessor,
+        features=features,
+        items=items,
+        neighbors=neighbors,
+        meta=meta,
+    )
+
+
+def build_model(
+    product_path: str,
+    brand_path: str,
+    top_k: int = DEFAULT_TOP_K,
+    backend: str = None,
+    sparse: bool = None
+) -> RecModel:
+    """
+    데이터 파일을 로드하여 build_model_from_frame 으로 모델을 빌드합니다.
+
+    Args:
+        product_path, brand_path (str): 데이터 파일 경로
+        top_k (int): 아이템당 보관할 이웃 수
+        backend (str, optional): 유사도 백엔드 이름 (exact / ivf). 생략 시 SIMILARITY_BACKEND
+        sparse (bool, optional): 희소(CSR) 전처리 모드. 생략 시 FEATURE_SPARSE
+
+    Returns:
+        RecModel: 빌드된 모델 (아직 저장되지 않음)
+    """
+    df = cosine_recsys.load_data(product_path, brand_path)
+    return build_model_from_frame(
+        df,
+        top_k=top_k,
+        backend=backend,
+        source={"product_path": product_path, "brand_path": brand_path},
+        sparse=sparse,
+    )
+
+
+def build_model_from_snapshot(
+    snapshot_path: str,
+    top_k: int = DEFAULT_TOP_K,
+    backend: str = None,
+    sparse: bool = None
+) -> RecModel:
+    """
+    컬럼형 카탈로그 스냅샷(snapshot.convert_json 결과)으로 모델을 빌드합니다.
+    """
+    df = read_snapshot(snapshot_path, mmap=True)
+    return build_model_from_frame(
+        df,
+        top_k=top_k,
+        backend=backend,
+        source={"snapshot_path": snapshot_path},
+        sparse=sparse,
+    )
+
+
+def save_features(features, path: str) -> None:
+    """밀집 피처는 features.npy, CSR 피처는 features_csr/ 아래 구성 배열별 .npy 로 저장합니다."""
+    if sp.issparse(features):
+        csr_dir = os.path.join(path, "features_csr")
+        os.makedirs(csr_dir, exist_ok=True)
+        for name in ("data", "indices", "indptr"):
+            np.save(os.path.join(csr_dir, f"{name}.npy"), getattr(features, name))
+        with open(os.path.join(csr_dir, "shape.json"), "w") as f:
+            json.dump(list(features.shape), f)
+    else:
+        np.save(os.path.join(path, "features.npy"), features)
+
+
+def load_features(path: str, mmap: bool = True):
+    """save_features 로 저장한 피처를 로드합니다. CSR 도 구성 배열을 mmap 으로 엽니다."""
+    mode = "r" if mmap else None
+    csr_dir = os.path.join(path, "features_csr")
+    if not os.path.isdir(csr_dir):
+        return np.load(os.path.join(path, "features.npy"), mmap_mode=mode)
+    with open(os.path.join(csr_dir, "shape.json")) as f:
+        shape = tuple(json.load(f))
+    data, indices, indptr = (
+        np.load(os.path.join(csr_dir, f"{name}.npy"), mmap_mode=mode)
+        for name in ("data", "indices", "indptr")
+    )
+    return sp.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def save_model(model: RecModel, model_dir: str) -> str:
+    """
+    모델을 model_dir/<version>/ 에 저장하고 CURRENT 포인터를 원자적으로 교체합니다.
+
+    임시 디렉토리에 모두 기록한 뒤 rename 하므로, 로더는 완성된 아티팩트만 보게 됩니다.
+
+    Returns:
+        str: 저장된 버전 디렉토리 경로
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    target = os.path.join(model_dir, model.version)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=model_dir)
+    try:
+        joblib.dump(model.preprocessor, os.path.join(tmp_dir, "preprocessor.joblib"))
+        save_features(model.features, tmp_dir)
+        model.neighbors.save(tmp_dir)
+        write_snapshot(model.items, os.path.join(tmp_dir, "items"))
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(model.meta, f, ensure_ascii=False, indent=2)
+        os.rename(tmp_dir, target)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # CURRENT 포인터 교체: 임시 파일 작성 후 os.replace (원자적)
+    fd, tmp_ptr = tempfile.mkstemp(prefix=".CURRENT-", dir=model_dir)
+    with os.fdopen(fd, "w") as f:
+        f.write(model.version)
+    os.replace(tmp_ptr, os.path.join(model_dir, CURRENT_FILE))
+    logger.info(f"model_saved\tversion={model.version}\tpath={target}")
+    return target
+
+
+@contextmanager
+def publish_lock(model_dir: str):
+    """
+    model_dir 의 버전 게시(save_model + CURRENT 교체 + prune)를 프로세스 간 직렬화하는 파일 잠금.
+
+    flock 은 같은 프로세스 안에서도 파일을 따로 열면 서로 막으므로 중첩해서 잡지 않습니다.
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    with open(os.path.join(model_dir, PUBLISH_LOCK_FILE), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def prune_versions(model_dir: str, keep: int = 3) -> list:
+    """
+    CURRENT 를 제외하고 최신 keep 개만 남기고 오래된 버전 디렉토리를 삭제합니다.
+
+    Returns:
+        list: 삭제된 버전명 목록
+    """
+    current = current_version(model_dir)
+    versions = sorted(
+        name for name in os.listdir(model_dir)
+        if not name.startswith(".") and name != CURRENT_FILE
+        and os.path.isdir(os.path.join(model_dir, name))
+    )
+    stale = [v for v in versions[:-keep] if v != current] if keep > 0 else []
+    for version in stale:
+        shutil.rmtree(os.path.join(model_dir, version), ignore_errors=True)
+    return stale
+
+
+def current_version(model_dir: str) -> Optional[str]:
+    """CURRENT 포인터가 가리키는 버전명을 반환합니다. 없으면 None."""
+    try:
+        with open(os.path.join(model_dir, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_model(model_dir: str, version: Optional[str] = None) -> RecModel:
+    """
+    저장된 아티팩트를 로드합니다. 큰 배열은 mmap 으로 열어 워커 간 페이지를 공유합니다.
+
+    Args:
+        model_dir (str): 모델 루트 디렉토리
+        version (str, optional): 로드할 버전. 생략 시 CURRENT 버전
+
+    Returns:
+        RecModel: 로드된 모델
+    """
+    version = version or current_version(model_dir)
+    if version is None:
+        raise FileNotFoundError(f"모델 아티팩트가 없습니다: {model_dir}")
+    path = os.path.join(model_dir, version)
+
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    return RecModel(
+        version=version,
+        preprocessor=joblib.load(os.path.join(path, "preprocessor.joblib")),
+        features=load_features(path, mmap=True),
+        items=read_snapshot(os.path.join(path, "items"), mmap=True),
+        neighbors=NeighborIndex.load(path, mmap=True),
+        meta=meta,
+    )
+
+
+class ModelHolder:
+    """
+    현재 서비스 중인 모델 참조를 보관합니다.
+
+    요청 핸들러는 get() 으로 받은 참조 하나만 사용하므로, 교체 중에도
+    이전 모델로 끝까지 처리되고 다음 요청부터 새 모델을 보게 됩니다.
+
+    Args:
+        model_dir (str): 모델 루트 디렉토리
+        warm_up (callable, optional): 교체 직전 새 모델에 실행할 워밍업 함수 (model → None).
+            블로킹 작업이므로 swap / reload_if_changed 는 이벤트 루프 밖에서 호출합니다
+    """
+
+    def __init__(self, model_dir: str, warm_up: Optional[Callable[[RecModel], object]] = None):
+        self.model_dir = model_dir
+        self.warm_up = warm_up
+        self._model: Optional[RecModel] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[RecModel]:
+        return self._model
+
+    def swap(self, model: RecModel, warm_up: bool = True) -> None:
+        if warm_up and self.warm_up is not None:
+            self.warm_up(model)
+        old = self._model
+        self._model = model
+        logger.info(
+            f"model_swapped\told={old.version if old else None}\tnew={model.version}"
+        )
+
+    def reload_if_changed(self) -> bool:
+        """
+        CURRENT 포인터가 바뀌었으면 새 버전을 로드해 교체합니다.
+
+        Returns:
+            bool: 교체가 일어났으면 True
+        """
+        with self._lock:
+            version = current_version(self.model_dir)
+            if version is None or (self._model and self._model.version == version):
+                return False
+            self.swap(load_model(self.model_dir, version))
+            return True
+
+    def publish(self, update: Callable[[RecModel], Optional[RecModel]], keep: int = 3) -> Optional[RecModel]:
+        """
+        최신 CURRENT 버전에 update 를 적용한 새 버전을 저장하고 교체합니다.
+
+        publish_lock 을 잡은 상태에서 다른 프로세스가 먼저 게시한 버전이 있으면 그 버전을
+        로드한 뒤(rebase) update 를 적용하므로, 동시에 게시해도 서로의 변경을 덮어쓰지 않습니다.
+
+        Args:
+            update (callable): 기준 모델 → 새 모델. None 을 반환하면 게시하지 않음
+            keep (int): 남길 버전 수 (prune_versions)
+
+        Returns:
+            RecModel | None: 게시된 새 모델 (게시하지 않았으면 None)
+        """
+        with publish_lock(self.model_dir):
+            self.reload_if_changed()
+            base = self._model
+            if base is None:
+                raise RuntimeError("게시할 기준 모델이 없습니다")
+            model = update(base)
+            if model is None:
+                return None
+            save_model(model, self.model_dir)
+            self.swap(model)
+            prune_versions(self.model_dir, keep)
+            return model
+
+
+def anchor_item_index(model: RecModel, user_id: str) -> int:
+    """행동 이력이 없는 사용자의 기준 아이템 행 인덱스 (워커 / 재시작과 무관하게 고정)."""
+    return hashing.anchor_index(user_id, model.n_items)
+
+
+def filtered_popular(
+    model: RecModel,
+    popularity: PopularityRanker,
+    top_n: int,
+    item_filter: Optional[ItemFilter] = None,
+    mask: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    인기 순위에서 필터를 만족하는 상품 top_n 개. gender / major_category 는 세그먼트로 찾고,
+    나머지 조건은 세그먼트 목록(최대 POPULARITY_TOP_M)을 마스크로 거릅니다.
+    """
+    if mask is None:
+        return popularity.top(top_n)
+    ranked = popularity.top(len(model.item_ids), item_filter.gender, item_filter.major_category)
+    rows = np.fromiter((model.id_to_index.get(int(pid), -1) for pid in ranked),
+                       dtype=np.int64, count=len(ranked))
+    keep = rows >= 0
+    keep[keep] = mask[rows[keep]]
+    return ranked[keep][:top_n]
+
+
+def fill_from_anchor(
+    model: RecModel,
+    user_id: str,
+    product_ids: np.ndarray,
+    top_n: int,
+    mask: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    세그먼트 인기 목록에 필터 후보가 top_n 보다 부족하면 기준 아이템의 필터 이웃으로 채웁니다.
+    """
+    if mask is None or len(product_ids) >= top_n:
+        return product_ids
+    anchor = anchor_item_index(model, user_id)
+    extra = model.similar_items(anchor, top_n + len(product_ids), mask=mask)
+    extra = extra[~np.isin(extra, product_ids)]
+    return np.concatenate([product_ids, extra])[:top_n]
+
+
+def _rerank(model: RecModel, reranker: Optional[Reranker], rows: np.ndarray,
+            scores: np.ndarray, top_n: int) -> np.ndarray:
+    if reranker is None:
+        return rows[:top_n]
+    return reranker.rerank(model, rows, scores, top_n)
+
+
+def recommend_for_user(
+    model: RecModel,
+    user_id: str,
+    top_n: int,
+    profile: Optional[UserProfile] = None,
+    popularity: Optional[PopularityRanker] = None,
+    cf=None,
+    cf_weight: float = 0.0,
+    item_filter: Optional[ItemFilter] = None,
+    reranker: Optional[Reranker] = None
+) -> dict:
+    """
+    빌드된 모델로 run_recommendation 과 같은 형태의 결과를 반환합니다 (조회만 수행).
+
+    행동 이력이 있는 프로필이 주어지면 프로필 벡터로 전체 아이템을 채점하고,
+    cf(CFIndex)가 있으면 협업 필터링 점수를 cf_weight 비율로 섞습니다.
+    이력이 없으면 인기 순위(popularity)를, 그마저 없으면 user_id 시드로 고른
+    기준 아이템의 이웃 목록을 반환합니다.
+    item_filter 가 주어지면 세 경로 모두 필터를 만족하는 상품 중에서 top_n 을 고릅니다.
+    reranker 가 주어지면 프로필 / 기준 아이템 경로는 상위 reranker.pool(top_n) 후보를
+    가져와 다양성 재정렬(MMR + 브랜드 / 카테고리 cap) 후 top_n 을 고릅니다.
+    """
+    mask = model.filter_index.mask(item_filter)
+    pool = top_n if reranker is None else reranker.pool(top_n)
+    if profile is not None and not profile.is_empty:
+        rows, scores = score_profile_rows(
+            model, profile, pool, cf=cf, cf_weight=cf_weight, mask=mask
+        )
+        product_ids = model.item_ids[_rerank(model, reranker, rows, scores, top_n)]
+    elif popularity is not None:
+        product_ids = fill_from_anchor(
+            model, user_id, filtered_popular(model, popularity, top_n, item_filter, mask), top_n, mask
+        )
+    else:
+        rows, scores = model.similar_rows(anchor_item_index(model, user_id), pool, mask=mask)
+        product_ids = model.item_ids[_rerank(model, reranker, rows, scores, top_n)]
+    return {
+        "user_id": user_id,
+        "product_id": [int(pid) for pid in product_ids],
+    }
+
+
+def main():
+    """
+    모델 빌드 스크립트 진입점:
+        python -m app.model_store --product_path data/product.json \\
+            --brand_path data/brand.json --model_dir model
+    """
+    parser = argparse.ArgumentParser(description='추천 모델 아티팩트 빌드')
+    parser.add_argument('--product_path', required=True, help='상품 데이터 파일 경로')
+    parser.add_argument('--brand_path', required=True, help='브랜드 데이터 파일 경로')
+    parser.add_argument('--model_dir', required=True, help='아티팩트 저장 디렉토리')
+    parser.add_argument('--top_k', type=int, default=DEFAULT_TOP_K, help='아이템당 이웃 수')
+    parser.add_argument('--backend', default=None, help='유사도 백엔드 (exact / ivf)')
+    parser.add_argument('--sparse', action='store_true', default=None,
+                        help='희소(CSR) 전처리 모드 (생략 시 FEATURE_SPARSE)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s\t%(levelname)s\t%(message)s')
+    model = build_model(
+        args.product_path, args.brand_path, top_k=args.top_k, backend=args.backend, sparse=args.sparse
+    )
+    with publish_lock(args.model_dir):
+        save_model(model, args.model_dir)
+    print(json.dumps(model.meta, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
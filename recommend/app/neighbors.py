@@ -0,0 +1,143 @@
+# recommend/app/neighbors.py
+"""
+아이템별 상위 K개 이웃만 보관하는 이웃 인덱스.
+
+n_items × n_items 밀집 유사도 행렬 대신 (n_items × K) int32 ID 배열과
+float32 점수 배열만 유지합니다. 빌드는 행 블록 단위로 수행하여
+피크 메모리가 block_rows × n_items × 4 bytes 로 제한됩니다.
+
+피처 매트릭스는 밀집 ndarray 또는 CSR 희소 행렬(희소 전처리 모드) 모두 받습니다.
+"""
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+DEFAULT_TOP_K = 50
+# 블록 하나의 유사도 버퍼 상한 (bytes)
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class NeighborIndex:
+    """
+    Attributes:
+        ids (np.ndarray): 이웃 행 인덱스 (n_items × K, int32), 유사도 내림차순
+        scores (np.ndarray): 이웃 코사인 유사도 (n_items × K, float32)
+    """
+    ids: np.ndarray
+    scores: np.ndarray
+
+    @property
+    def n_items(self) -> int:
+        return self.ids.shape[0]
+
+    @property
+    def k(self) -> int:
+        return self.ids.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.scores.nbytes
+
+    def neighbors(self, item_index: int, top_n: int) -> tuple:
+        """
+        item_index 의 상위 top_n 이웃 (행 인덱스, 점수)을 반환합니다.
+        """
+        return self.ids[item_index, :top_n], self.scores[item_index, :top_n]
+
+    def save(self, path: str) -> None:
+        np.save(os.path.join(path, "neighbor_ids.npy"), self.ids)
+        np.save(os.path.join(path, "neighbor_scores.npy"), self.scores)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "NeighborIndex":
+        mode = "r" if mmap else None
+        return cls(
+            ids=np.load(os.path.join(path, "neighbor_ids.npy"), mmap_mode=mode),
+            scores=np.load(os.path.join(path, "neighbor_scores.npy"), mmap_mode=mode),
+        )
+
+
+def l2_normalize(features):
+    """행 단위 L2 정규화 (float32). 영벡터는 그대로 둡니다. CSR 입력은 CSR 로 반환합니다."""
+    if sp.issparse(features):
+        return normalize(sp.csr_matrix(features, dtype=np.float32), norm="l2", copy=False)
+    features = np.asarray(features, dtype=np.float32)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return features / norms
+
+
+def to_dense(x) -> np.ndarray:
+    return x.toarray() if sp.issparse(x) else np.asarray(x)
+
+
+def similarity_block(query, features) -> np.ndarray:
+    """
+    query (q × d) 와 features (n × d) 의 내적 q × n 밀집 배열.
+
+    features 가 CSR 이면 희소 × 밀집 곱(features @ query.T)으로 계산합니다.
+    수치형 블록 때문에 결과는 어차피 밀집이므로 희소 × 희소 곱은 피합니다.
+    """
+    if sp.issparse(features):
+        return np.ascontiguousarray((features @ to_dense(query).T).T)
+    return to_dense(query) @ features.T
+
+
+def topk_from_scores(
+    scores: np.ndarray,
+    k: int
+) -> tuple:
+    """
+    2-D 점수 행렬의 각 행에서 상위 k개를 (인덱스, 점수) 내림차순으로 추출합니다.
+    argpartition 으로 후보를 고른 뒤 k개만 정렬합니다.
+    """
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    return (
+        np.take_along_axis(part, order, axis=1),
+        np.take_along_axis(part_scores, order, axis=1),
+    )
+
+
+def build_neighbor_index(
+    features: np.ndarray,
+    top_k: int = DEFAULT_TOP_K,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+    rows: np.ndarray = None
+) -> NeighborIndex:
+    """
+    피처 매트릭스로부터 블록 단위로 상위 top_k 이웃 인덱스를 계산합니다.
+
+    Args:
+        features (np.ndarray | sp.csr_matrix): n_items × d 피처 매트릭스 (내부에서 L2 정규화)
+        top_k (int): 아이템당 보관할 이웃 수
+        block_bytes (int): 블록당 유사도 버퍼 상한 (bytes)
+        rows (np.ndarray, optional): 이웃을 계산할 쿼리 행 인덱스. 생략 시 전체
+
+    Returns:
+        NeighborIndex: len(rows) × top_k 이웃 인덱스
+    """
+    normed = l2_normalize(features)
+    n = normed.shape[0]
+    k = max(1, min(top_k, n - 1))
+    rows = np.arange(n) if rows is None else np.asarray(rows)
+
+    ids = np.empty((len(rows), k), dtype=np.int32)
+    scores = np.empty((len(rows), k), dtype=np.float32)
+    block_rows = max(1, int(block_bytes // (n * 4)))
+
+    for start in range(0, len(rows), block_rows):
+        query_rows = rows[start:start + block_rows]
+        sim = similarity_block(normed[query_rows], normed)
+        # 자기 자신은 이웃에서 제외
+        sim[np.arange(len(query_rows)), query_rows] = -np.inf
+        top_ids, top_scores = topk_from_scores(sim, k)
+        ids[start:start + len(query_rows)] = top_ids
+        scores[start:start + len(query_rows)] = top_scores
+
+    return NeighborIndex(ids=ids, scores=scores)
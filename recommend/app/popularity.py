@@ -0,0 +1,164 @@
+# recommend/app/popularity.py
+"""
+행동 이력이 없는 사용자(guest / 신규 가입자)용 인기 / 트렌딩 추천.
+
+    1) 인기 점수: 상품의 like_count / view_count / purchase_count (log 스케일) + rank
+    2) 트렌딩 점수: 최근 조회 / 구매 이벤트를 시간 감쇠(반감기)로 합산
+    3) 두 점수를 [0, 1] 로 정규화해 가중합한 뒤 세그먼트(gender × major_category)별
+       상위 상품 ID 목록을 미리 정렬해 둡니다.
+
+조회는 세그먼트 키로 미리 정렬된 배열을 잘라 반환하므로 마이크로초 단위로 끝나고,
+주기적으로 새로 빌드한 PopularityRanker 로 통째로 교체합니다.
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 인기 점수 구성 가중치
+POPULARITY_WEIGHTS = {
+    "like_count": float(os.getenv("POPULARITY_WEIGHT_LIKE", "1.0")),
+    "view_count": float(os.getenv("POPULARITY_WEIGHT_VIEW", "0.5")),
+    "purchase_count": float(os.getenv("POPULARITY_WEIGHT_PURCHASE", "2.0")),
+    "rank": float(os.getenv("POPULARITY_WEIGHT_RANK", "1.0")),
+}
+# 트렌딩 이벤트 가중치 / 반감기 / 최종 점수에서의 비중
+TRENDING_EVENT_WEIGHTS = {"view": 1.0, "purchase": 5.0}
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+TRENDING_WEIGHT = float(os.getenv("TRENDING_WEIGHT", "1.0"))
+# 세그먼트별로 보관할 상위 상품 수
+POPULARITY_TOP_M = int(os.getenv("POPULARITY_TOP_M", "500"))
+
+# 전체 / 미지정 세그먼트
+ALL = "*"
+# 성별 무관 상품 코드 (성별 세그먼트에 함께 포함)
+UNISEX = "U"
+
+
+def _normalize(score: np.ndarray) -> np.ndarray:
+    top = score.max(initial=0.0)
+    return score / top if top > 0 else score
+
+
+def base_popularity(items: pd.DataFrame, weights: Optional[dict] = None) -> np.ndarray:
+    """
+    상품 메타데이터의 누적 지표로 인기 점수를 계산합니다 (없는 컬럼은 0 으로 간주).
+
+    rank 는 작을수록 상위이므로 백분위를 뒤집어 [0, 1] 점수로 사용합니다.
+    """
+    weights = weights or POPULARITY_WEIGHTS
+    counts = np.zeros(len(items), dtype=np.float64)
+    for col in ("like_count", "view_count", "purchase_count"):
+        if col in items:
+            values = pd.to_numeric(items[col], errors="coerce").fillna(0).clip(lower=0)
+            counts += weights[col] * np.log1p(values.to_numpy(dtype=np.float64))
+    score = _normalize(counts)
+    if "rank" in items:
+        pct = pd.to_numeric(items["rank"], errors="coerce").rank(pct=True).fillna(1.0)
+        score += weights["rank"] * (1.0 - pct.to_numpy())
+    return score
+
+
+def decayed_counts(
+    events: Iterable[dict],
+    now: Optional[float] = None,
+    half_life_hours: float = TRENDING_HALF_LIFE_HOURS
+) -> Dict[int, float]:
+    """
+    {"product_id", "type", "ts", "count"} 이벤트(또는 시간 버킷 집계)를 반감기 감쇠로 합산합니다.
+
+    Returns:
+        dict: 상품 ID → 감쇠 가중 이벤트 수
+    """
+    now = time.time() if now is None else now
+    decay = np.log(2) / (half_life_hours * 3600.0)
+    counts: Dict[int, float] = {}
+    for e in events:
+        weight = TRENDING_EVENT_WEIGHTS.get(e["type"])
+        if weight is None:
+            continue
+        age = max(0.0, now - float(e["ts"]))
+        pid = int(e["product_id"])
+        counts[pid] = counts.get(pid, 0.0) + weight * e.get("count", 1) * np.exp(-decay * age)
+    return counts
+
+
+@dataclass
+class PopularityRanker:
+    """
+    세그먼트별 미리 정렬된 인기 상품 목록.
+
+    Attributes:
+        segments (dict): (gender, major_category) → 점수 내림차순 상품 ID 배열.
+            ALL 은 해당 축을 구분하지 않는 세그먼트
+        built_at (float): 빌드 시각 (epoch)
+        meta (dict): 빌드 정보 (상품 수, 트렌딩 상품 수 등)
+    """
+    segments: Dict[Tuple[str, str], np.ndarray]
+    built_at: float = field(default_factory=time.time)
+    meta: dict = field(default_factory=dict)
+
+    def top(self, top_n: int, gender: Optional[str] = None,
+            major_category: Optional[str] = None) -> np.ndarray:
+        """
+        세그먼트의 상위 top_n 상품 ID. 해당 세그먼트가 없으면 한 단계씩 넓혀 찾습니다.
+        """
+        gender, major_category = gender or ALL, major_category or ALL
+        for key in ((gender, major_category), (gender, ALL), (ALL, major_category), (ALL, ALL)):
+            ranked = self.segments.get(key)
+            if ranked is not None:
+                return ranked[:top_n]
+        return np.empty(0, dtype=np.int64)
+
+
+def build_ranker(
+    items: pd.DataFrame,
+    trending: Optional[Dict[int, float]] = None,
+    top_m: int = POPULARITY_TOP_M,
+    trending_weight: float = TRENDING_WEIGHT
+) -> PopularityRanker:
+    """
+    상품 메타데이터(+ 트렌딩 감쇠 카운트)로 PopularityRanker 를 빌드합니다.
+
+    Args:
+        items (pd.DataFrame): id, gender, major_category 와 인기 지표 컬럼을 가진 상품 테이블
+        trending (dict, optional): decayed_counts 결과
+        top_m (int): 세그먼트별 보관 상품 수
+        trending_weight (float): 트렌딩 점수 비중
+
+    Returns:
+        PopularityRanker
+    """
+    ids = items["id"].to_numpy(dtype=np.int64)
+    score = _normalize(base_popularity(items))
+    if trending:
+        hot = np.fromiter((trending.get(int(pid), 0.0) for pid in ids), dtype=np.float64, count=len(ids))
+        score = score + trending_weight * _normalize(hot)
+
+    # 전체 점수 순서를 한 번만 정렬하고, 세그먼트는 그 순서에서 마스크로 골라냄
+    order = np.argsort(-score, kind="stable")
+    ranked_ids = ids[order]
+    gender = items["gender"].astype(str).to_numpy()[order]
+    category = items["major_category"].astype(str).to_numpy()[order]
+
+    segments: Dict[Tuple[str, str], np.ndarray] = {(ALL, ALL): ranked_ids[:top_m]}
+    for g in np.unique(gender):
+        # 특정 성별 세그먼트에는 성별 무관 상품도 포함
+        g_mask = (gender == g) | (gender == UNISEX)
+        segments[(g, ALL)] = ranked_ids[g_mask][:top_m]
+        for c in np.unique(category[g_mask]):
+            segments[(g, c)] = ranked_ids[g_mask & (category == c)][:top_m]
+    for c in np.unique(category):
+        segments[(ALL, c)] = ranked_ids[category == c][:top_m]
+
+    return PopularityRanker(
+        segments=segments,
+        meta={
+            "n_items": int(len(ids)),
+            "n_segments": len(segments),
+            "n_trending": len(trending or {}),
+        },
+    )
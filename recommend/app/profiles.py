@@ -0,0 +1,255 @@
+# recommend/app/profiles.py
+"""
+사용자 행동(좋아요 / 조회 / 구매) 기반 프로필 벡터.
+
+사용자가 상호작용한 상품의 피처 벡터를 이벤트 가중치로 합산해 같은 피처 공간의
+프로필 벡터를 만들고, 후보 채점은 features @ profile 한 번의 행렬-벡터 곱으로 처리합니다.
+프로필은 TTL + LRU 캐시에 보관하고 새 이벤트가 들어오면 증분 반영합니다.
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+from .neighbors import similarity_block, to_dense, topk_from_scores
+from .ttl_cache import TTLCache
+
+# 이벤트 종류별 가중치 (unlike 는 좋아요 취소)
+EVENT_WEIGHTS = {
+    "view": float(os.getenv("PROFILE_WEIGHT_VIEW", "1.0")),
+    "like": float(os.getenv("PROFILE_WEIGHT_LIKE", "3.0")),
+    "unlike": -float(os.getenv("PROFILE_WEIGHT_LIKE", "3.0")),
+    "purchase": float(os.getenv("PROFILE_WEIGHT_PURCHASE", "5.0")),
+}
+
+
+@dataclass
+class UserProfile:
+    """
+    이벤트 반영은 이벤트 루프 스레드에서, 채점은 compute 스레드에서 동시에 일어나므로
+    weights / 벡터는 제자리에서 바꾸지 않고 새 객체를 만들어 교체합니다 (copy-on-write).
+    읽는 쪽은 참조를 한 번 가져와 그 스냅샷만 사용합니다.
+
+    Attributes:
+        user_id (str): 사용자 ID
+        weights (dict): 상품 ID → 누적 이벤트 가중치 (모델 버전과 무관, 교체 후에는 변경하지 않음)
+        updated_at (float): 마지막 갱신 시각 (monotonic)
+    """
+    user_id: str
+    weights: Dict[int, float] = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.monotonic)
+    # (모델 버전, 계산에 쓴 weights, 프로필 벡터) — 모델이나 weights 가 바뀌면 다시 계산
+    _vector: Optional[tuple] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not any(w > 0 for w in self.weights.values())
+
+    def add_event(self, product_id: int, kind: str, model=None) -> None:
+        """이벤트 하나를 더한 새 weights 로 교체하고, 같은 모델 버전의 벡터가 있으면 새 벡터로 함께 교체합니다."""
+        weight = EVENT_WEIGHTS.get(kind)
+        if weight is None:
+            return
+        base = self.weights
+        weights = dict(base)
+        weights[product_id] = weights.get(product_id, 0.0) + weight
+
+        # 1) 현재 weights 로 계산된 벡터가 있으면 변경분만 더한 새 배열을 만듦
+        cached = self._vector
+        vector = None
+        if cached is not None and model is not None and cached[0] == model.version and cached[1] is base:
+            vec = cached[2]
+            idx = model.id_to_index.get(product_id)
+            if idx is not None:
+                vec = vec + weight * to_dense(model.features[idx]).ravel()
+            vector = (model.version, weights, vec)
+
+        # 2) 참조 교체 (읽는 쪽은 weights 와 벡터의 weights 가 다르면 다시 계산)
+        self.weights = weights
+        self._vector = vector
+        self.updated_at = time.monotonic()
+
+    def vector(self, model) -> np.ndarray:
+        """model 피처 공간에서의 프로필 벡터 (d,) 를 반환합니다."""
+        weights, cached = self.weights, self._vector
+        if cached is not None and cached[0] == model.version and cached[1] is weights:
+            return cached[2]
+        idx, w = [], []
+        for pid, weight in weights.items():
+            row = model.id_to_index.get(pid)
+            if row is not None and weight:
+                idx.append(row)
+                w.append(weight)
+        vec = np.zeros(model.features.shape[1], dtype=np.float32)
+        if idx:
+            vec = to_dense(np.asarray(w, dtype=np.float32) @ model.features[np.asarray(idx)]).ravel()
+        self._vector = (model.version, weights, vec)
+        return vec
+
+
+def build_profile(user_id: str, events: list) -> UserProfile:
+    """
+    (product_id, kind) 이벤트 목록으로 프로필을 생성합니다.
+    """
+    # 아직 공유되지 않은 프로필이므로 이벤트마다 복사하지 않고 한 번에 누적
+    weights: Dict[int, float] = {}
+    for product_id, kind in events:
+        weight = EVENT_WEIGHTS.get(kind)
+        if weight is not None:
+            weights[int(product_id)] = weights.get(int(product_id), 0.0) + weight
+    return UserProfile(user_id=user_id, weights=weights)
+
+
+def score_profile_rows(
+    model,
+    profile: UserProfile,
+    top_n: int,
+    exclude_seen: bool = True,
+    cf=None,
+    cf_weight: float = 0.0,
+    mask: np.ndarray = None
+) -> tuple:
+    """
+    프로필 벡터와 모든 아이템의 코사인 유사도를 한 번의 행렬-벡터 곱으로 계산해
+    상위 top_n 개의 (행 인덱스, 점수)를 반환합니다.
+
+    Args:
+        model (RecModel): 현재 모델
+        profile (UserProfile): 사용자 프로필
+        top_n (int): 추천 개수
+        exclude_seen (bool): 이미 상호작용한 상품 제외 여부
+        cf (CFIndex, optional): 협업 필터링 인덱스 (콘텐츠 점수와 혼합)
+        cf_weight (float): CF 점수 비율 [0, 1]
+        mask (np.ndarray, optional): 후보 행 불리언 마스크 (filters.FilterIndex.mask)
+
+    Returns:
+        tuple: (행 인덱스 배열, 점수 배열). 점수 내림차순, 제외된 후보는 포함하지 않음
+    """
+    weights = profile.weights
+    vec = profile.vector(model)
+    norm = np.linalg.norm(vec)
+    if norm == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    scores = model.features @ (vec / norm)
+    if cf is not None:
+        scores = cf.blend(model, scores, weights, cf_weight)
+    if exclude_seen:
+        seen = [
+            model.id_to_index[pid] for pid, w in weights.items()
+            if w > 0 and pid in model.id_to_index
+        ]
+        scores[seen] = -np.inf
+    if mask is not None:
+        scores[~mask] = -np.inf
+    k = min(top_n, len(scores))
+    top_idx, top_scores = topk_from_scores(scores[None, :], k)
+    valid = np.isfinite(top_scores[0])
+    return top_idx[0][valid], top_scores[0][valid]
+
+
+def score_profile(
+    model,
+    profile: UserProfile,
+    top_n: int,
+    exclude_seen: bool = True,
+    cf=None,
+    cf_weight: float = 0.0,
+    mask: np.ndarray = None
+) -> np.ndarray:
+    """
+    score_profile_rows 의 상위 top_n 상품 ID 배열 (유사도 내림차순).
+    """
+    rows, _ = score_profile_rows(
+        model, profile, top_n, exclude_seen=exclude_seen, cf=cf, cf_weight=cf_weight, mask=mask
+    )
+    return model.item_ids[rows]
+
+
+def score_profiles_batch_rows(
+    model,
+    profiles: list,
+    top_n: int,
+    exclude_seen: bool = True,
+    cf=None,
+    cf_weight: float = 0.0,
+    mask: np.ndarray = None
+) -> tuple:
+    """
+    여러 프로필을 (B × d) 행렬로 쌓아 features.T 와 한 번에 곱해 채점합니다.
+    cf 가 주어지면 행별로 CF 점수를 cf_weight 비율로 섞고, mask 가 주어지면 후보 행만 남깁니다.
+
+    Returns:
+        tuple: (B × top_n 행 인덱스, B × top_n 점수). 유사도 내림차순,
+            후보 부족/빈 프로필 자리는 행 -1 / 점수 -inf
+    """
+    weights = [p.weights for p in profiles]
+    vecs = np.stack([p.vector(model) for p in profiles]).astype(np.float32)
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    empty = norms[:, 0] == 0
+    norms[empty] = 1.0
+    scores = similarity_block(vecs / norms, model.features)
+    if cf is not None and cf_weight > 0:
+        for row, w in enumerate(weights):
+            scores[row] = cf.blend(model, scores[row], w, cf_weight)
+    scores[empty] = -np.inf
+    if exclude_seen:
+        for row, w_row in enumerate(weights):
+            seen = [
+                model.id_to_index[pid] for pid, w in w_row.items()
+                if w > 0 and pid in model.id_to_index
+            ]
+            scores[row, seen] = -np.inf
+    if mask is not None:
+        scores[:, ~mask] = -np.inf
+    k = min(top_n, scores.shape[1])
+    top_idx, top_scores = topk_from_scores(scores, k)
+    return np.where(np.isfinite(top_scores), top_idx, -1), top_scores
+
+
+def score_profiles_batch(
+    model,
+    profiles: list,
+    top_n: int,
+    exclude_seen: bool = True,
+    cf=None,
+    cf_weight: float = 0.0
+) -> np.ndarray:
+    """
+    score_profiles_batch_rows 의 B × top_n 행 인덱스 (후보 부족/빈 프로필은 -1).
+    """
+    top_idx, _ = score_profiles_batch_rows(
+        model, profiles, top_n, exclude_seen=exclude_seen, cf=cf, cf_weight=cf_weight
+    )
+    return top_idx
+
+
+class ProfileCache(TTLCache):
+    """
+    user_id → UserProfile TTL + LRU 캐시.
+
+    TTL 이 지난 프로필은 조회 시 만료되어 상품 서비스에서 다시 적재되고,
+    max_size 를 넘으면 가장 오래 사용되지 않은 프로필부터 제거됩니다.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_size: int = 100_000):
+        super().__init__(ttl=ttl, max_size=max_size)
+
+    def put(self, profile: UserProfile) -> None:
+        super().put(profile.user_id, profile)
+
+    def apply_event(self, user_id: str, product_id: int, kind: str, model=None) -> bool:
+        """
+        캐시에 있는 프로필에만 이벤트를 증분 반영합니다. 캐시에 없으면 다음 조회 때
+        전체 이력으로 적재되므로 무시합니다.
+
+        Returns:
+            bool: 반영되었으면 True
+        """
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                return False
+            entry[1].add_event(int(product_id), kind, model)
+        return True
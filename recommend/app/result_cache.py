@@ -0,0 +1,175 @@
+# recommend/app/result_cache.py
+"""
+추천 결과 2단 캐시.
+
+    1) 프로세스 내 TTL + LRU (TTLCache)
+    2) 선택적 공유 저장소 (ResultBackend 구현; 여러 워커/인스턴스가 결과 공유)
+
+키는 (user_id, top_n, 모델 버전) 조합이라 새 모델이 배포되면 이전 결과는
+자연스럽게 조회되지 않습니다. 키가 user_id 로 시작하므로 행동 이벤트가 반영된
+사용자의 결과는 접두어로 한 번에 무효화합니다. 같은 키의 계산은 동시에 하나만
+실행되고 나머지 요청은 그 결과를 기다립니다 (stampede 방지).
+"""
+import os
+import json
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from .ttl_cache import TTLCache
+
+
+def user_key_prefix(user_id: str) -> str:
+    """사용자의 모든 결과 키가 공유하는 접두어."""
+    return f"rec:{user_id}:"
+
+
+def result_key(user_id: str, top_n: int, version: str, *extra) -> str:
+    """extra: 결과에 영향을 주는 추가 요청 파라미터 (CF 비율 등)."""
+    suffix = "".join(f":{e}" for e in extra)
+    return f"{user_key_prefix(user_id)}{version}:{top_n}{suffix}"
+
+
+class ResultBackend:
+    """
+    공유 결과 저장소 인터페이스. 값은 JSON 문자열로 주고받습니다.
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def delete_prefix(self, prefixes: Iterable[str]) -> int:
+        raise NotImplementedError
+
+
+class InMemoryResultBackend(ResultBackend):
+    """단일 프로세스용 / 테스트용 공유 저장소 대체 구현."""
+
+    def __init__(self, max_size: int = 100_000):
+        self._cache = TTLCache(ttl=60.0, max_size=max_size)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._cache.put(key, value, ttl=ttl)
+
+    async def delete_prefix(self, prefixes: Iterable[str]) -> int:
+        return self._cache.invalidate_prefix(prefixes)
+
+
+RESULT_BACKENDS = {
+    "memory": InMemoryResultBackend,
+}
+
+
+class ResultCache:
+    """
+    Args:
+        ttl (float): 결과 유효 시간 (초)
+        max_size (int): 프로세스 내 캐시 최대 항목 수
+        shared (ResultBackend, optional): 공유 저장소 (없으면 프로세스 내 캐시만 사용)
+    """
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 50_000,
+                 shared: Optional[ResultBackend] = None):
+        self.ttl = ttl
+        self.local = TTLCache(ttl=ttl, max_size=max_size)
+        self.shared = shared
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 무효화 세대 (계산 도중 무효화되면 결과를 캐시에 넣지 않음)
+        self._generation = 0
+        self.shared_hits = 0
+        self.coalesced = 0
+        self.invalidated = 0
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        key 의 결과를 반환합니다. 프로세스 내 → 공유 저장소 → 계산 순서로 조회하며,
+        계산 중인 키는 새로 계산하지 않고 진행 중인 결과를 기다립니다.
+        계산 중 발생한 예외는 대기 중인 요청에도 그대로 전달되고 캐시되지 않습니다.
+        계산 도중 invalidate_users 가 호출되면 결과는 반환하되 캐시하지 않습니다.
+        """
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await self._load_shared(key)
+            if value is None:
+                value = await compute()
+                if generation != self._generation:
+                    future.set_result(value)
+                    return value
+                self.local.put(key, value)
+                if self.shared is not None:
+                    await self.shared.set(key, json.dumps(value, ensure_ascii=False), self.ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없으면 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _load_shared(self, key: str) -> Optional[dict]:
+        if self.shared is None:
+            return None
+        raw = await self.shared.get(key)
+        if raw is None:
+            return None
+        self.shared_hits += 1
+        value = json.loads(raw)
+        self.local.put(key, value)
+        return value
+
+    async def invalidate_users(self, user_ids: Iterable[str]) -> int:
+        """
+        사용자들의 결과를 프로세스 내 / 공유 저장소에서 모두 제거합니다 (행동 이벤트 반영 후).
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        prefixes = [user_key_prefix(uid) for uid in dict.fromkeys(user_ids)]
+        if not prefixes:
+            return 0
+        self._generation += 1
+        removed = self.local.invalidate_prefix(prefixes)
+        if self.shared is not None:
+            removed += await self.shared.delete_prefix(prefixes)
+        self.invalidated += removed
+        return removed
+
+    def stats(self) -> dict:
+        return {
+            **self.local.stats(),
+            "shared": type(self.shared).__name__ if self.shared is not None else None,
+            "shared_hits": self.shared_hits,
+            "coalesced": self.coalesced,
+            "invalidated": self.invalidated,
+        }
+
+
+def result_cache_from_env() -> ResultCache:
+    backend = os.getenv("RESULT_CACHE_BACKEND")
+    shared = RESULT_BACKENDS[backend]() if backend else None
+    return ResultCache(
+        ttl=float(os.getenv("RESULT_CACHE_TTL", "60")),
+        max_size=int(os.getenv("RESULT_CACHE_SIZE", "50000")),
+        shared=shared,
+    )
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class RecommendItem(BaseModel):
     id: int
@@ -11,4 +11,36 @@ class RecommendItem(BaseModel):
 
 class RecommendResponse(BaseModel):
     user_account: str
-    recommends: List[RecommendItem] 
+    recommends: List[RecommendItem]
+
+class ProductChangeBatch(BaseModel):
+    product_ids: List[int] = Field(..., max_length=1000)  # 상품 서비스 알림은 500개 단위
+
+class ModelUpdateResponse(BaseModel):
+    version: str
+    upserted: int
+    deleted: int
+    refit_scheduled: bool
+
+class UserEvent(BaseModel):
+    user_id: str
+    product_id: int
+    type: str            # view / like / unlike / purchase
+
+class UserEventBatch(BaseModel):
+    events: List[UserEvent]
+
+class BatchRecommendRequest(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1, max_length=10000)
+    top_n: int = Field(6, ge=1, le=100)
+    hydrate: bool = True  # False 면 상품 ID 목록만 반환
+    cf_weight: Optional[float] = Field(None, ge=0.0, le=1.0)  # 협업 필터링 혼합 비율 (생략 시 CF_BLEND_WEIGHT)
+    # 행동 이벤트를 직접 넘기면 해당 사용자는 이력 조회 없이 이 이벤트로 프로필 생성
+    events: Optional[List[UserEvent]] = Field(None, max_length=100000)
+    # 온라인 추천(GET /recommend/{user_id})과 같은 필터 / 다양성 재정렬 조건
+    gender: Optional[str] = None
+    major_category: Optional[str] = None
+    brand_id: Optional[List[int]] = None
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+    mmr_lambda: Optional[float] = Field(None, ge=0.0, le=1.0)
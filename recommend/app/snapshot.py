@@ -0,0 +1,155 @@
+# recommend/app/snapshot.py
+"""
+추천기용 상품+브랜드 카탈로그 컬럼형 스냅샷.
+
+load_data 의 줄 단위 JSON 파싱 + merge 결과를 컬럼별 .npy 파일로 저장해 두고,
+np.load(mmap_mode='r') 로 열어 시작/재로드를 파싱 없이 처리합니다.
+같은 스냅샷을 여는 여러 워커 프로세스는 OS 페이지 캐시를 공유합니다.
+
+디렉토리 구조:
+    catalog.snap/
+        schema.json             # 컬럼 순서, dtype, 범주형 카테고리 목록
+        id.npy                  # 숫자형: 원래 dtype 그대로
+        gender.codes.npy        # 범주형: 정수 코드 (결측 -1)
+        ...
+"""
+import os
+import json
+import shutil
+import tempfile
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from .cosine_recsys import load_data
+
+SCHEMA_FILE = "schema.json"
+
+# 범주형 코드로 저장할 컬럼 (그 외 문자열 컬럼도 범주형으로 저장)
+CATEGORICAL_COLUMNS = ['gender', 'category_code', 'brand_eng', 'major_category']
+
+
+def _codes_dtype(n_categories: int):
+    return np.int16 if n_categories < 2**15 else np.int32
+
+
+def write_snapshot(df: pd.DataFrame, path: str) -> str:
+    """
+    DataFrame 을 컬럼형 스냅샷으로 저장합니다. 임시 디렉토리에 쓴 뒤 교체하므로
+    읽는 쪽은 항상 완성된 스냅샷만 보게 됩니다.
+
+    Args:
+        df (pd.DataFrame): 저장할 데이터 (숫자형 / 문자열 / 범주형 컬럼)
+        path (str): 스냅샷 디렉토리 경로
+
+    Returns:
+        str: 스냅샷 디렉토리 경로
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".snap-", dir=parent)
+    schema = {"n_rows": int(len(df)), "columns": []}
+    try:
+        for col in df.columns:
+            series = df[col]
+            if col in CATEGORICAL_COLUMNS or not pd.api.types.is_numeric_dtype(series):
+                cat = series.astype('category')
+                categories = [str(c) for c in cat.cat.categories]
+                codes = cat.cat.codes.to_numpy().astype(_codes_dtype(len(categories)))
+                np.save(os.path.join(tmp_dir, f"{col}.codes.npy"), codes)
+                schema["columns"].append({"name": col, "kind": "categorical", "categories": categories})
+            else:
+                values = series.to_numpy()
+                np.save(os.path.join(tmp_dir, f"{col}.npy"), values)
+                schema["columns"].append({"name": col, "kind": "numeric", "dtype": str(values.dtype)})
+        with open(os.path.join(tmp_dir, SCHEMA_FILE), "w", encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False)
+
+        # 기존 스냅샷 교체: 옛 디렉토리를 옆으로 치운 뒤 rename
+        if os.path.exists(path):
+            old = tempfile.mkdtemp(prefix=".snap-old-", dir=parent)
+            os.rename(path, os.path.join(old, "snap"))
+            os.rename(tmp_dir, path)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.rename(tmp_dir, path)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return path
+
+
+def read_snapshot(path: str, mmap: bool = True, columns: list = None) -> pd.DataFrame:
+    """
+    컬럼형 스냅샷을 DataFrame 으로 엽니다.
+
+    Args:
+        path (str): 스냅샷 디렉토리 경로
+        mmap (bool): True 면 컬럼 배열을 읽기 전용 memory-map 으로 엽니다
+        columns (list, optional): 읽을 컬럼 목록. 생략 시 전체
+
+    Returns:
+        pd.DataFrame: 숫자형 컬럼은 원래 dtype, 범주형 컬럼은 category dtype
+    """
+    with open(os.path.join(path, SCHEMA_FILE), encoding="utf-8") as f:
+        schema = json.load(f)
+    mode = "r" if mmap else None
+
+    data = {}
+    for spec in schema["columns"]:
+        name = spec["name"]
+        if columns is not None and name not in columns:
+            continue
+        if spec["kind"] == "categorical":
+            codes = np.load(os.path.join(path, f"{name}.codes.npy"), mmap_mode=mode)
+            data[name] = pd.Categorical.from_codes(codes, categories=spec["categories"])
+        else:
+            data[name] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode, allow_pickle=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def convert_json(
+    product_path: str,
+    brand_path: str,
+    out_path: str,
+    columns: list = None
+) -> str:
+    """
+    기존 product/brand JSON(또는 CSV) 파일을 load_data 로 병합한 뒤 스냅샷으로 저장합니다.
+
+    Args:
+        product_path, brand_path (str): 원본 데이터 파일 경로
+        out_path (str): 스냅샷 디렉토리 경로
+        columns (list, optional): 저장할 컬럼. 생략 시 숫자형 + CATEGORICAL_COLUMNS
+
+    Returns:
+        str: 스냅샷 디렉토리 경로
+    """
+    df = load_data(product_path, brand_path)
+    if columns is None:
+        columns = [
+            c for c in df.columns
+            if c in CATEGORICAL_COLUMNS or pd.api.types.is_numeric_dtype(df[c])
+        ]
+    return write_snapshot(df[columns], out_path)
+
+
+def main():
+    """
+    JSON → 스냅샷 변환 스크립트:
+        python -m app.snapshot --product_path data/product.json \\
+            --brand_path data/brand.json --out data/catalog.snap
+    """
+    parser = argparse.ArgumentParser(description='카탈로그 컬럼형 스냅샷 변환')
+    parser.add_argument('--product_path', required=True, help='상품 데이터 파일 경로')
+    parser.add_argument('--brand_path', required=True, help='브랜드 데이터 파일 경로')
+    parser.add_argument('--out', required=True, help='스냅샷 디렉토리 경로')
+    args = parser.parse_args()
+
+    path = convert_json(args.product_path, args.brand_path, args.out)
+    print(f'✅ 스냅샷 변환 완료 → {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# recommend/app/ttl_cache.py
+"""
+프로세스 내 TTL + LRU 캐시 (hit/miss 카운터 포함).
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+
+class TTLCache:
+    """
+    key → value 캐시. TTL 이 지난 항목은 조회 시 만료되고,
+    max_size 를 넘으면 가장 오래 사용되지 않은 항목부터 제거됩니다.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable, now: float) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None or entry[0] < now:
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._lookup(key, time.monotonic())
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """캐시에 있는 항목만 {key: value} 로 반환합니다."""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._lookup(key, now)
+                if value is not None:
+                    found[key] = value
+        return found
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """ttl 을 주면 이 항목만 기본 TTL 대신 해당 시간 후 만료됩니다."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def put_many(self, items: Dict[Hashable, Any]) -> None:
+        for key, value in items.items():
+            self.put(key, value)
+
+    def invalidate(self, keys: Iterable[Hashable]) -> int:
+        removed = 0
+        with self._lock:
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    def invalidate_prefix(self, prefixes: Iterable[str]) -> int:
+        """prefixes 중 하나로 시작하는 문자열 키를 모두 제거합니다 (전체 키 1회 순회)."""
+        prefixes = tuple(prefixes)
+        if not prefixes:
+            return 0
+        with self._lock:
+            stale = [k for k in self._data if isinstance(k, str) and k.startswith(prefixes)]
+            for key in stale:
+                del self._data[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
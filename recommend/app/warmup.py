@@ -0,0 +1,112 @@
+# recommend/app/warmup.py
+"""
+서비스 기동 단계 추적과 모델 워밍업.
+
+기동 순서:
+    1) load      : 카탈로그 데이터 읽기 (아티팩트가 없을 때) + 아티팩트 열기
+    2) transform : 전처리 fit / 피처 매트릭스 (아티팩트가 없어 새로 빌드할 때만)
+    3) index     : 이웃 테이블 빌드 (새로 빌드할 때만)
+    4) save      : 새로 빌드한 아티팩트 저장
+    5) warmup    : 워밍업 쿼리 (지연 생성 인덱스 / 이웃 테이블 / 피처 mmap 페이지 준비)
+
+모든 단계가 끝나야 ready 가 되고 /health/ready 가 200 을 반환합니다.
+프로세스가 요청에 응답하는지는 /health/live 로 따로 확인합니다.
+"""
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from .filters import ItemFilter
+from .model_store import recommend_for_user
+from .profiles import UserProfile
+
+logger = logging.getLogger("recommend.warmup")
+
+# 워밍업 쿼리 수 (기준 아이템 경로 기준; 프로필 / 필터 경로는 각각 1회씩 추가)
+WARMUP_QUERIES = int(os.getenv("WARMUP_QUERIES", "20"))
+
+
+class StartupState:
+    """
+    기동 단계별 소요 시간과 readiness 상태.
+
+    Attributes:
+        phase (str): 현재 단계 (starting → load → ... → ready / failed)
+        stages (dict): 단계명 → 소요 시간 (초)
+        error (str, optional): 기동 실패 사유
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.phase = "starting"
+        self.stages: dict = {}
+        self.error: Optional[str] = None
+        self.ready = False
+
+    @contextmanager
+    def stage(self, name: str):
+        self.phase = name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        """같은 단계가 여러 번 기록되면 합산합니다."""
+        self.stages[name] = round(self.stages.get(name, 0.0) + seconds, 3)
+        logger.info(f"startup_stage\tstage={name}\tseconds={seconds:.3f}")
+
+    def mark_ready(self) -> None:
+        self.phase = "ready"
+        self.ready = True
+        logger.info(f"startup_ready\tseconds={time.time() - self.started_at:.3f}\tstages={self.stages}")
+
+    def fail(self, error: Exception) -> None:
+        logger.error(f"startup_failed\tstage={self.phase}\terror={error}")
+        self.phase = "failed"
+        self.error = str(error)
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            "phase": self.phase,
+            "stages": self.stages,
+            "error": self.error,
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+        }
+
+
+def warm_up(model, n_queries: int = WARMUP_QUERIES, reranker=None, popularity=None) -> dict:
+    """
+    요청 경로를 미리 한 번씩 실행해 첫 요청이 초기화 비용을 내지 않게 합니다.
+
+        - 지연 생성되는 필터 인덱스 / 재정렬 코드 빌드
+        - 기준 아이템 / 프로필 / 필터 경로 쿼리로 이웃 테이블과 피처 mmap 페이지 적재
+
+    Returns:
+        dict: {"queries": 실행한 쿼리 수, "seconds": 소요 시간}
+    """
+    started = time.perf_counter()
+    _ = model.filter_index, model.rerank_codes
+
+    for i in range(n_queries):
+        recommend_for_user(model, f"warmup-{i}", 6, popularity=popularity, reranker=reranker)
+
+    rng = np.random.default_rng(0)
+    profile = UserProfile(user_id="warmup")
+    for pid in rng.choice(model.item_ids, size=min(5, model.n_items), replace=False):
+        profile.add_event(int(pid), "view")
+    recommend_for_user(model, "warmup", 6, profile=profile, reranker=reranker)
+
+    gender = str(model.items["gender"].iloc[0]) if model.n_items else None
+    recommend_for_user(model, "warmup", 6, profile=profile, reranker=reranker,
+                       item_filter=ItemFilter(gender=gender))
+
+    seconds = time.perf_counter() - started
+    logger.info(f"model_warmed\tversion={model.version}\tqueries={n_queries + 2}\tseconds={seconds:.3f}")
+    return {"queries": n_queries + 2, "seconds": round(seconds, 3)}
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from app.ann import ExactBackend, IVFBackend, get_backend
+from app.bench import synthetic_catalog, synthetic_clustered_features, recall_at_k
+from app.model_store import build_model_from_frame
+from app.neighbors import build_neighbor_index
+
+
+@pytest.fixture(scope="module")
+def features():
+    return synthetic_clustered_features(50_000, n_clusters=128)
+
+
+def test_exact_backend_matches_neighbor_index(features):
+    small = features[:2_000]
+    index = ExactBackend().fit(small).build_neighbor_index(top_k=10)
+    reference = build_neighbor_index(small, top_k=10)
+    assert np.array_equal(np.sort(index.ids, axis=1), np.sort(reference.ids, axis=1))
+
+
+def test_ivf_recall_against_exact(features):
+    queries = np.random.default_rng(0).choice(len(features), 300, replace=False)
+    exact = ExactBackend().fit(features)
+    ivf = IVFBackend(n_probe=8).fit(features)
+
+    exact_ids, _ = exact.query(features[queries], 10, exclude_rows=queries)
+    ivf_ids, _ = ivf.query(features[queries], 10, exclude_rows=queries)
+
+    assert recall_at_k(ivf_ids, exact_ids) >= 0.95
+    # 자기 자신은 결과에서 제외
+    assert not (ivf_ids == queries[:, None]).any()
+
+
+def test_ivf_neighbor_index_shape(features):
+    index = IVFBackend(n_lists=16, n_probe=4).fit(features[:1_000]).build_neighbor_index(top_k=5)
+    assert index.ids.shape == (1_000, 5)
+    assert index.ids.dtype == np.int32 and index.scores.dtype == np.float32
+    assert np.all(np.diff(index.scores, axis=1) <= 0)
+
+
+def test_one_item_catalog_matches_neighbor_index(features):
+    single = features[:1]
+    reference = build_neighbor_index(single, top_k=10)
+    for backend in (ExactBackend(), IVFBackend(n_lists=1, n_probe=1)):
+        index = backend.fit(single).build_neighbor_index(top_k=10)
+        assert index.ids.shape == reference.ids.shape == (1, 1)
+        assert np.isneginf(index.scores).all()
+
+
+def test_ivf_sparse_features_stay_sparse(features):
+    dense = features[:2_000].copy()
+    dense[np.abs(dense) < 0.05] = 0
+    sparse = sp.csr_matrix(dense)
+    dense_ivf = IVFBackend(n_lists=16, n_probe=4).fit(dense)
+    sparse_ivf = IVFBackend(n_lists=16, n_probe=4).fit(sparse)
+    assert sp.issparse(sparse_ivf.list_features)
+
+    dense_index = dense_ivf.build_neighbor_index(top_k=10)
+    sparse_index = sparse_ivf.build_neighbor_index(top_k=10)
+    assert recall_at_k(sparse_index.ids, dense_index.ids) >= 0.99
+
+
+def test_sparse_and_dense_neighbors_agree(features):
+    dense = features[:2_000].copy()
+    dense[np.abs(dense) < 0.5] = 0
+    sparse_index = build_neighbor_index(sp.csr_matrix(dense), top_k=10)
+    dense_index = build_neighbor_index(dense, top_k=10)
+    assert np.allclose(sparse_index.scores, dense_index.scores, atol=1e-5)
+
+    product_df, brand_df = synthetic_catalog(500, n_brands=20)
+    df = product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left', suffixes=('', '_brand'))
+    sparse_model = build_model_from_frame(df, top_k=10, backend='exact', sparse=True)
+    dense_model = build_model_from_frame(df, top_k=10, backend='exact', sparse=False)
+    assert sp.issparse(sparse_model.features) and not sp.issparse(dense_model.features)
+    assert np.allclose(sparse_model.features.toarray(), dense_model.features, atol=1e-6)
+    assert np.allclose(sparse_model.neighbors.scores, dense_model.neighbors.scores, atol=1e-5)
+
+
+def test_get_backend_from_env(monkeypatch):
+    monkeypatch.setenv("SIMILARITY_BACKEND", "ivf")
+    monkeypatch.setenv("IVF_N_PROBE", "3")
+    backend = get_backend()
+    assert isinstance(backend, IVFBackend) and backend.n_probe == 3
+    with pytest.raises(ValueError):
+        get_backend("hnsw")
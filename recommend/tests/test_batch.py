@@ -0,0 +1,131 @@
+import json
+import importlib
+
+import httpx
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.batch import iter_ndjson, recommend_many, unique_product_ids
+from app.bench import synthetic_catalog
+from app.collaborative import build_cf_index, build_interaction_matrix
+from app.filters import ItemFilter
+from app.hydration import Hydrator
+from app.model_store import build_model_from_frame, recommend_for_user
+from app.popularity import build_ranker
+from app.profiles import ProfileCache, build_profile
+from app.rerank import Reranker
+from app.schemas import RecommendItem
+
+
+@pytest.fixture(scope="module")
+def model():
+    product_df, brand_df = synthetic_catalog(400, n_brands=20)
+    df = product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left', suffixes=('', '_brand'))
+    return build_model_from_frame(df, top_k=10, backend='exact', sparse=False)
+
+
+def _profiles(model):
+    ids = [int(pid) for pid in model.item_ids]
+    return {
+        "u1": build_profile("u1", [(ids[0], "like"), (ids[3], "view")]),
+        "u2": build_profile("u2", [(ids[10], "purchase")]),
+        "u3": build_profile("u3", [(ids[7], "like"), (ids[7], "unlike")]),
+    }
+
+
+def _cf(model):
+    rng = np.random.default_rng(0)
+    ids = model.item_ids
+    events = [{"user_id": f"c{u}", "product_id": int(pid), "type": "view"}
+              for u in range(200) for pid in rng.choice(ids[:100], 5)]
+    matrix, item_ids, _ = build_interaction_matrix(iter(events))
+    return build_cf_index(matrix, item_ids, top_k=10)
+
+
+@pytest.mark.parametrize("item_filter", [None, ItemFilter(gender='F'), ItemFilter(brand_ids=(3, 4), max_price=150_000)])
+def test_matches_per_user_recommendations(model, item_filter):
+    profiles = _profiles(model)
+    user_ids = ["u1", "u2", "u3", "u4", "u1"]
+    cf = _cf(model)
+    for popularity, reranker, cf_weight in (
+        (None, None, 0.0),
+        (build_ranker(model.items), Reranker(), 0.3),
+    ):
+        results = recommend_many(
+            model, user_ids, 6, profiles, block_bytes=model.n_items * 4 * 2, popularity=popularity,
+            cf=cf, cf_weight=cf_weight, item_filter=item_filter, reranker=reranker,
+        )
+        assert [uid for uid, _ in results] == user_ids
+        for uid, ids in results:
+            expected = recommend_for_user(
+                model, uid, 6, profile=profiles.get(uid), popularity=popularity,
+                cf=cf, cf_weight=cf_weight, item_filter=item_filter, reranker=reranker,
+            )
+            assert [int(pid) for pid in ids] == expected["product_id"]
+
+
+def test_unique_ids_and_ndjson_lines():
+    results = [("u1", np.array([3, 1, 2])), ("u2", np.array([2, 5, 3]))]
+    assert unique_product_ids(results) == [3, 1, 2, 5]
+
+    lines = list(iter_ndjson(results))
+    assert all(line.endswith("\n") and line.count("\n") == 1 for line in lines)
+    assert json.loads(lines[1]) == {"user_id": "u2", "product_id": [2, 5, 3]}
+
+    hydrated = {pid: RecommendItem(id=pid, img_url="", name=f"상품 {pid}", brand_kor="", discount=0, price=pid)
+                for pid in (1, 2, 3)}
+    row = json.loads(list(iter_ndjson(results, hydrated))[1])
+    # 상품 서비스에 없는 상품(5)은 빠짐
+    assert [item["id"] for item in row["recommends"]] == [2, 3]
+    assert row["recommends"][0]["name"] == "상품 2"
+
+
+@pytest.fixture
+def main(model, monkeypatch):
+    monkeypatch.setenv("PRODUCT_BASE_URL", "http://product/product")
+    main = importlib.import_module("app.main")
+    monkeypatch.setattr(main.model_holder, "get", lambda: model)
+    monkeypatch.setattr(main, "popularity_ranker", build_ranker(model.items))
+    monkeypatch.setattr(main, "profile_cache", ProfileCache())
+    monkeypatch.setattr(main, "BATCH_BLOCK_USERS", 2)
+    return main
+
+
+def _product_service(bulk_requests):
+    def handler(request):
+        body = json.loads(request.content)
+        if request.url.path.endswith("/user/events/bulk"):
+            return httpx.Response(200, json=[])
+        bulk_requests.append(body["product_ids"])
+        return httpx.Response(200, json=[
+            {"id": pid, "name": f"상품 {pid}", "brand_kor": "", "discount": 0, "discounted_price": 1000}
+            for pid in body["product_ids"]
+        ])
+    return httpx.MockTransport(handler)
+
+
+def test_batch_endpoint_streams_ndjson_with_error_lines(main, monkeypatch):
+    bulk_requests = []
+    client = httpx.AsyncClient(transport=_product_service(bulk_requests))
+    monkeypatch.setattr(main, "hydrator", Hydrator("http://product/product/bulk", client=client))
+    recommend = main.batch.recommend_many
+
+    def flaky(model, user_ids, *args, **kwargs):
+        if "bad" in user_ids:
+            raise RuntimeError("boom")
+        return recommend(model, user_ids, *args, **kwargs)
+
+    monkeypatch.setattr(main.batch, "recommend_many", flaky)
+    resp = TestClient(main.app).post("/recommend/batch", json={
+        "user_ids": ["u1", "u2", "bad", "u4", "u5"], "top_n": 4,
+    })
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["user_id"] for row in rows] == ["u1", "u2", "bad", "u4", "u5"]
+    # 실패한 블록의 사용자마다 error 줄, 나머지 블록은 계속 전송
+    assert rows[2] == {"user_id": "bad", "error": "RuntimeError"} and rows[3]["error"] == "RuntimeError"
+    assert all(len(row["recommends"]) == 4 for row in rows[:2] + rows[4:])
+    # 이력 없는 사용자는 같은 인기 상품 → 블록 내 중복 제거 후 한 번만 조회, 다음 블록은 캐시 사용
+    assert len(bulk_requests) == 1 and len(bulk_requests[0]) == len(set(bulk_requests[0])) == 4
@@ -0,0 +1,28 @@
+import json
+
+from app.cli import compare_metrics, main
+
+
+def test_baseline_regression_exits_nonzero(tmp_path, capsys):
+    data_dir, model_dir = tmp_path / "data", tmp_path / "model"
+    assert main(["gen", "--out_dir", str(data_dir), "--n_items", "1500"]) == 0
+    assert main(["build", "--product_path", str(data_dir / "product.json"),
+                 "--brand_path", str(data_dir / "brand.json"),
+                 "--model_dir", str(model_dir), "--top_k", "10"]) == 0
+    out = tmp_path / "eval.jsonl"
+    assert main(["evaluate", "--model_dir", str(model_dir), "--ks", "6", "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text())
+    assert main(["evaluate", "--model_dir", str(model_dir), "--ks", "6", "--baseline", str(out)]) == 0
+
+    report["metrics"]["nDCG@6"] += 0.1
+    worse = tmp_path / "baseline.json"
+    worse.write_text(json.dumps(report))
+    assert main(["evaluate", "--model_dir", str(model_dir), "--ks", "6", "--baseline", str(worse)]) == 1
+    capsys.readouterr()
+
+
+def test_compare_metrics_tolerance():
+    baseline = {"nDCG@6": 0.80, "Recall@6": 0.10}
+    assert compare_metrics({"nDCG@6": 0.797, "Recall@6": 0.2}, baseline, 0.005) == {}
+    assert set(compare_metrics({"nDCG@6": 0.79}, baseline, 0.005)) == {"nDCG@6", "Recall@6"}
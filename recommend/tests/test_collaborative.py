@@ -0,0 +1,48 @@
+import numpy as np
+
+from app.collaborative import build_cf_index, build_interaction_matrix
+
+
+def _events(n_users=500, n_groups=10, per_user=6, seed=0):
+    rng = np.random.default_rng(seed)
+    events = []
+    for u in range(n_users):
+        group = rng.integers(0, n_groups)
+        for item in group * 50 + rng.integers(0, 50, per_user):
+            events.append({"user_id": f"u{u}", "product_id": int(item) + 1,
+                           "type": rng.choice(["view", "like", "purchase"])})
+    return events
+
+
+def test_chunked_matrix_matches_single_pass():
+    events = _events()
+    chunked, ids_a, n_a = build_interaction_matrix(iter(events), chunk_size=97)
+    whole, ids_b, n_b = build_interaction_matrix(iter(events), chunk_size=len(events))
+    assert n_a == n_b == len(events)
+    assert np.array_equal(ids_a, ids_b)
+    assert abs(chunked - whole).max() < 1e-6
+
+
+def test_item_neighbors_match_dense_cosine():
+    matrix, item_ids, _ = build_interaction_matrix(iter(_events()))
+    cf = build_cf_index(matrix, item_ids, top_k=5, block_items=64)
+
+    dense = matrix.toarray()
+    dense /= np.maximum(np.linalg.norm(dense, axis=0), 1e-12)
+    sim = dense.T @ dense
+    np.fill_diagonal(sim, -np.inf)
+    expected = -np.sort(-sim, axis=1)[:, :5]
+    # 공동 출현이 없는 칸은 희소 결과에 없으므로 -inf 패딩
+    found = expected > 0
+    assert np.allclose(cf.neighbors.scores[found], expected[found], atol=1e-5)
+    assert np.isneginf(cf.neighbors.scores[~found]).all()
+    assert not (cf.neighbors.ids == np.arange(len(item_ids))[:, None]).any()
+
+
+def test_score_items_excludes_history():
+    matrix, item_ids, _ = build_interaction_matrix(iter(_events()))
+    cf = build_cf_index(matrix, item_ids, top_k=10)
+    history = {int(item_ids[0]): 3.0}
+    cand, scores = cf.score_items(history)
+    assert int(item_ids[0]) not in set(cand.tolist())
+    assert len(cand) == len(scores) > 0
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from app.cosine_recsys import compute_cosine_similarity, recommend_items_batch
+from app.neighbors import build_neighbor_index
+
+
+@pytest.fixture(scope="module")
+def features():
+    return np.random.default_rng(0).standard_normal((300, 16)).astype(np.float32)
+
+
+def _sorted_top_n(cosine_sim, item_index, top_n, exclude=()):
+    # 이전 구현: 전체 점수를 정렬한 뒤 자기 자신 / 제외 대상을 건너뜀
+    scores = [(i, s) for i, s in enumerate(cosine_sim[item_index]) if i != item_index and i not in exclude]
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return [i for i, _ in scores[:top_n]]
+
+
+def test_matches_sort_based_top_n(features):
+    sim = compute_cosine_similarity(features)
+    queries = np.arange(0, 300, 7)
+    top = recommend_items_batch(sim, queries, top_n=6)
+    assert top.shape == (len(queries), 6)
+    for q, row in zip(queries, top):
+        assert row.tolist() == _sorted_top_n(sim, q, 6)
+
+
+def test_exclude_applies_to_every_query(features):
+    sim = compute_cosine_similarity(features)
+    queries = np.array([3, 10, 42])
+    # 각 쿼리의 원래 1순위를 모두 제외
+    exclude = {int(i) for i in recommend_items_batch(sim, queries, top_n=1)[:, 0]}
+    top = recommend_items_batch(sim, queries, top_n=6, exclude=exclude)
+    assert not np.isin(top, list(exclude)).any()
+    for q, row in zip(queries, top):
+        assert row.tolist() == _sorted_top_n(sim, q, 6, exclude)
+
+    index = build_neighbor_index(features, top_k=10)
+    neighbor_top = recommend_items_batch(index, queries, top_n=6, exclude=exclude)
+    assert not np.isin(neighbor_top, list(exclude)).any()
+    assert not (neighbor_top == queries[:, None]).any()
+
+
+def test_pads_with_minus_one_when_candidates_run_out(features):
+    index = build_neighbor_index(features, top_k=5)
+    top = recommend_items_batch(index, [0, 1], top_n=8, exclude=[int(index.ids[0, 0])])
+    assert top.shape == (2, 8)
+    assert (top[:, 5:] == -1).all()
+    # 제외된 이웃 자리는 뒤로 밀려 -1
+    assert (top[0, :4] >= 0).all() and top[0, 4] == -1
+
+    small = compute_cosine_similarity(features[:4])
+    padded = recommend_items_batch(small, [0], top_n=6)[0]
+    assert sorted(padded[:3].tolist()) == [1, 2, 3] and (padded[3:] == -1).all()
+
+
+def test_batch_equals_per_row_calls(features):
+    sim = compute_cosine_similarity(features)
+    index = build_neighbor_index(features, top_k=10)
+    queries = np.arange(50)
+    for source in (sim, index):
+        batch = recommend_items_batch(source, queries, top_n=6, exclude=[5, 6])
+        single = np.vstack([recommend_items_batch(source, q, top_n=6, exclude=[5, 6]) for q in queries])
+        assert np.array_equal(batch, single)
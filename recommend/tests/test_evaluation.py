@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.bench import synthetic_catalog
+from app.cosine_recsys import compute_cosine_similarity, evaluate_semantic_similarity
+from app.evaluation import evaluate_topk
+from app.model_store import build_model_from_frame
+
+
+@pytest.fixture(scope="module")
+def model():
+    product_df, brand_df = synthetic_catalog(300, n_brands=20, n_categories=8)
+    df = product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left', suffixes=('', '_brand'))
+    return build_model_from_frame(df, top_k=10, backend='exact', sparse=False)
+
+
+def test_matches_loop_evaluation_on_dense_and_neighbor_index(model):
+    df = model.items.reset_index(drop=True)
+    dense = compute_cosine_similarity(model.features)
+    for source in (dense, model.neighbors):
+        expected = evaluate_semantic_similarity(df, source, K=6)
+        result = evaluate_topk(df, source, ks=(6,), block_size=64)
+        assert result['Precision@6'] == pytest.approx(expected['Precision@6'])
+        assert result['Recall@6'] == pytest.approx(expected['Recall@6'])
+
+
+def test_parallel_blocks_match_single_process(model):
+    df = model.items.reset_index(drop=True)
+    single = evaluate_topk(df, model.neighbors, ks=(3, 6), block_size=50, n_jobs=1)
+    parallel = evaluate_topk(df, model.neighbors, ks=(3, 6), block_size=50, n_jobs=2)
+    assert parallel.keys() == single.keys()
+    for key in single:
+        assert parallel[key] == pytest.approx(single[key])
+
+
+def test_ndcg_hand_computed():
+    df = pd.DataFrame({'category_code': ['a', 'a', 'a', 'b']})
+    sim = np.array([
+        [1.0, 0.5, 0.4, 0.9],  # 0: 3, 1, 2 → 관련 여부 [0, 1, 1]
+        [0.9, 1.0, 0.8, 0.1],  # 1: 0, 2, 3 → [1, 1, 0]
+        [0.5, 0.1, 1.0, 0.9],  # 2: 3, 0, 1 → [0, 1, 1]
+        [0.3, 0.2, 0.1, 1.0],  # 3: 같은 카테고리 없음 → Recall / nDCG 에서 제외
+    ])
+    result = evaluate_topk(df, sim, ks=(2,))
+
+    discount = 1.0 / np.log2(3)
+    ideal = 1.0 + discount
+    assert result['nDCG@2'] == pytest.approx((discount / ideal + 1.0 + discount / ideal) / 3)
+    assert result['Precision@2'] == pytest.approx((0.5 + 1.0 + 0.5 + 0.0) / 4)
+    assert result['Recall@2'] == pytest.approx((0.5 + 1.0 + 0.5) / 3)
@@ -0,0 +1,57 @@
+import asyncio
+import importlib
+import threading
+
+import pytest
+
+from app.executor import ComputeExecutor, ComputeOverloaded, ComputeTimeout
+
+
+def test_rejects_when_workers_and_queue_are_full():
+    executor = ComputeExecutor(max_workers=1, max_queue=1, timeout=5.0, retry_after=7)
+    release = threading.Event()
+
+    async def run():
+        held = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ComputeOverloaded) as info:
+            await executor.run(lambda: None)
+        release.set()
+        await asyncio.gather(*held)
+        return info.value
+
+    error = asyncio.run(run())
+    assert error.retry_after == 7
+    assert executor.stats()["rejected"] == 1 and executor.stats()["in_flight"] == 0
+    executor.shutdown()
+
+
+def test_timeout_keeps_running_task_in_flight_until_done():
+    executor = ComputeExecutor(max_workers=1, max_queue=0, timeout=0.05)
+    release = threading.Event()
+
+    async def run():
+        with pytest.raises(ComputeTimeout):
+            await executor.run(release.wait)
+        # 제한 시간이 지나도 실행 중인 작업은 한도에 포함
+        with pytest.raises(ComputeOverloaded):
+            await executor.run(lambda: None)
+        release.set()
+        await asyncio.sleep(0.05)
+        return await executor.run(lambda: 42)
+
+    assert asyncio.run(run()) == 42
+    assert executor.stats()["timed_out"] == 1
+    executor.shutdown()
+
+
+def test_errors_map_to_503_with_retry_after(monkeypatch):
+    monkeypatch.setenv("PRODUCT_BASE_URL", "http://product")
+    main = importlib.import_module("app.main")
+
+    overloaded = asyncio.run(main.compute_overloaded_handler(None, ComputeOverloaded(3)))
+    assert overloaded.status_code == 503 and overloaded.headers["Retry-After"] == "3"
+
+    timed_out = asyncio.run(main.compute_timeout_handler(None, ComputeTimeout("slow")))
+    assert timed_out.status_code == 503
+    assert timed_out.headers["Retry-After"] == str(main.compute.retry_after)
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from app.filters import FilterIndex, ItemFilter
+
+
+def _items(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(1, n + 1),
+        "gender": rng.choice(["M", "F", "U"], n),
+        "major_category": rng.choice(["top", "bottom", "shoes"], n),
+        "brand_id": rng.integers(1, 50, n),
+        "discounted_price": rng.integers(1_000, 100_000, n).astype(float),
+    })
+
+
+def test_mask_matches_dataframe_query():
+    items = _items()
+    index = FilterIndex(items)
+    f = ItemFilter(gender="M", major_category="top", brand_ids=(3, 7, 11),
+                   min_price=20_000, max_price=60_000)
+    expected = (
+        items.gender.isin(["M", "U"]) & (items.major_category == "top")
+        & items.brand_id.isin([3, 7, 11]) & items.discounted_price.between(20_000, 60_000)
+    ).to_numpy()
+    assert np.array_equal(index.mask(f), expected)
+    assert index.mask(ItemFilter()) is None
+
+
+def test_open_price_range_and_unknown_values():
+    items = _items()
+    items.loc[0, "discounted_price"] = np.nan
+    index = FilterIndex(items)
+    assert np.array_equal(index.mask(ItemFilter(min_price=50_000)),
+                          (items.discounted_price >= 50_000).to_numpy())
+    assert not index.mask(ItemFilter(brand_ids=(999,))).any()
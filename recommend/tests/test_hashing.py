@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from app.hashing import ANCHOR_SALT, anchor_index, bucket, stable_hash
+
+USER_IDS = ["94b73865-5469-4c46-87ac-7737080906a0", "guest", "u1", "사용자"]
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import json
+from app.hashing import anchor_index, bucket
+ids = {ids!r}
+print(json.dumps([[anchor_index(u, 1000), bucket(u, 8)] for u in ids]))
+"""
+
+
+def _run_in_subprocess(hash_seed: str) -> str:
+    env = {**os.environ, "PYTHONHASHSEED": hash_seed, "PYTHONPATH": APP_ROOT}
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(ids=USER_IDS)],
+        env=env, cwd=APP_ROOT, capture_output=True, text=True, check=True,
+    )
+    return out.stdout.strip()
+
+
+def test_stable_across_processes_with_different_hash_seeds():
+    results = {_run_in_subprocess(seed) for seed in ("0", "1", "12345", "random")}
+    assert len(results) == 1
+    local = [[anchor_index(u, 1000), bucket(u, 8)] for u in USER_IDS]
+    assert results.pop().replace(" ", "") == str(local).replace(" ", "")
+
+
+def test_buckets_are_uniform_and_salts_independent():
+    users = [f"user-{i}" for i in range(20_000)]
+    counts = np.bincount([bucket(u, 10) for u in users], minlength=10)
+    assert counts.min() > 1_800 and counts.max() < 2_200
+    assert stable_hash("u1", ANCHOR_SALT) != stable_hash("u1", "other")
+
+    # salt 가 다른 배정끼리 상관되지 않음
+    anchor = [bucket(u, 2, ANCHOR_SALT) for u in users]
+    other = [bucket(u, 2, "other") for u in users]
+    together = sum(a == 1 and o == 1 for a, o in zip(anchor, other)) / len(users)
+    assert 0.22 < together < 0.28
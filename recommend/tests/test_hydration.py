@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+import httpx
+
+from app import hydration
+from app.hydration import Hydrator
+
+
+def _transport(calls):
+    def handler(request):
+        ids = json.loads(request.content)["product_ids"]
+        calls.append(ids)
+        # 없는 상품(음수 ID)은 응답에서 빠짐
+        return httpx.Response(200, json=[
+            {"id": pid, "name": f"상품 {pid}", "brand_kor": "브랜드", "discount": 10, "discounted_price": pid * 100}
+            for pid in ids if pid > 0
+        ])
+    return httpx.MockTransport(handler)
+
+
+def test_bulk_requests_are_chunked_and_deduplicated(monkeypatch):
+    monkeypatch.setattr(hydration, "BULK_CHUNK_SIZE", 4)
+    calls = []
+
+    async def run():
+        async with httpx.AsyncClient(transport=_transport(calls)) as client:
+            return await hydration.fetch_bulk(client, "http://product/product/bulk", [1, 2, 2, 3, 4, 5, 1, 6, -1])
+
+    items = asyncio.run(run())
+    assert calls == [[1, 2, 3, 4], [5, 6, -1]]
+    assert sorted(items) == [1, 2, 3, 4, 5, 6]
+    assert items[3].price == 300 and items[3].name == "상품 3"
+
+
+def test_hydrator_fetches_only_cache_misses():
+    calls = []
+
+    async def run():
+        hydrator = Hydrator("http://product/product/bulk", client=httpx.AsyncClient(transport=_transport(calls)))
+        first = await hydrator.get_many([1, 2, 3])
+        second = await hydrator.get_many([2, 3, 4])
+        assert hydrator.invalidate([3]) == 1
+        third = await hydrator.get_many([3, 4])
+        await hydrator.close()
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert calls == [[1, 2, 3], [4], [3]]
+    assert sorted(second) == [2, 3, 4] and sorted(third) == [3, 4]
+    assert second[2] == first[2]
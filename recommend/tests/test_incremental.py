@@ -0,0 +1,110 @@
+import asyncio
+import importlib
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.bench import synthetic_catalog
+from app.incremental import apply_counters, apply_product_updates, needs_refit
+from app.model_store import ModelHolder, build_model_from_frame, save_model
+from app.neighbors import build_neighbor_index
+from app.schemas import ProductChangeBatch
+
+
+def _frame(n=400, seed=0):
+    product_df, brand_df = synthetic_catalog(n, n_brands=20, seed=seed)
+    return product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left', suffixes=('', '_brand'))
+
+
+def _model(n=400):
+    return build_model_from_frame(_frame(n), top_k=10, backend='exact', sparse=False)
+
+
+def test_upserts_and_deletes_match_exact_neighbors():
+    model = _model()
+    df = _frame()
+    upserts = df[df['id'].isin([5, 6, 7])].copy()
+    upserts['discounted_price'] = upserts['discounted_price'] // 2
+    updated = apply_product_updates(model, upserts, deleted_ids=[1, 2])
+
+    assert updated.version != model.version
+    ids = updated.items['id'].to_numpy()
+    assert not np.isin([1, 2], ids).any() and np.isin([5, 6, 7], ids).all()
+    assert updated.n_items == model.n_items - 2
+    assert (updated.neighbors.ids >= 0).all()
+    assert not (updated.neighbors.ids == np.arange(updated.n_items)[:, None]).any()
+
+    # 병합 / 재계산 결과는 같은 특징 행렬로 처음부터 만든 정확한 이웃과 같아야 함
+    exact = build_neighbor_index(updated.features, top_k=10)
+    assert np.allclose(updated.neighbors.scores, exact.scores, atol=1e-5)
+
+
+def test_drifted_upserts_trigger_refit():
+    model = _model()
+    assert not needs_refit(model)
+    upserts = _frame().head(40).copy()
+    upserts['id'] += 10_000
+    upserts['price'] = 10**8
+    upserts['discounted_price'] = 10**8
+    updated = apply_product_updates(model, upserts)
+
+    assert updated.meta['drifted_rows_since_fit'] == 40
+    assert updated.meta['updated_rows_since_fit'] == 40
+    assert needs_refit(updated)
+    # 범위 안 변경은 갱신 비율만 누적
+    assert not needs_refit(apply_product_updates(model, _frame().head(40)))
+
+
+def test_apply_counters_keeps_missing_rows():
+    items = pd.DataFrame({'id': [1, 2, 3], 'like_count': [1.0, 2.0, 3.0], 'like_count_brand': [0.0, 0.0, 0.0]})
+    counters = pd.DataFrame({'id': [2, 3, 9], 'like_count': [20, None, 90], 'brand_like_count': [7, 8, 9]})
+    fresh = apply_counters(items, counters)
+    assert fresh['like_count'].tolist() == [1.0, 20.0, 3.0]
+    assert fresh['like_count_brand'].tolist() == [0.0, 7.0, 8.0]
+    assert items['like_count'].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_publish_rebases_on_other_writer(tmp_path):
+    model = _model()
+    save_model(model, str(tmp_path))
+    a = ModelHolder(str(tmp_path))
+    b = ModelHolder(str(tmp_path))
+    a.reload_if_changed()
+    b.reload_if_changed()
+
+    a.publish(lambda base: apply_product_updates(base, pd.DataFrame(), deleted_ids=[1]))
+    published = b.publish(lambda base: apply_product_updates(base, pd.DataFrame(), deleted_ids=[2]))
+
+    # b 는 a 가 게시한 버전 위에 적용되므로 두 삭제가 모두 남음
+    assert not np.isin([1, 2], published.items['id'].to_numpy()).any()
+    assert b.publish(lambda base: None) is None
+
+
+def test_fetch_products_bounds_concurrency(monkeypatch):
+    monkeypatch.setenv("PRODUCT_BASE_URL", "http://product/product")
+    main = importlib.import_module("app.main")
+    monkeypatch.setattr(main, "PRODUCT_FETCH_CONCURRENCY", 3)
+    active, peak = [0], [0]
+
+    async def handler(request):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        pid = int(request.url.path.rsplit("/", 1)[-1])
+        if pid % 10 == 0:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"id": pid})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(main.hydrator, "client", client)
+            return await main.fetch_products(list(range(1, 31)))
+
+    docs, deleted = asyncio.run(run())
+    assert peak[0] == 3
+    assert len(docs) == 27 and deleted == [10, 20, 30]
+    with pytest.raises(ValueError):
+        ProductChangeBatch(product_ids=list(range(1_001)))
@@ -0,0 +1,75 @@
+import dataclasses
+import os
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from app.bench import synthetic_catalog
+from app.model_store import (
+    CURRENT_FILE,
+    ModelHolder,
+    build_model_from_frame,
+    current_version,
+    load_model,
+    prune_versions,
+    save_model,
+)
+
+
+def _model(sparse=False):
+    product_df, brand_df = synthetic_catalog(300, n_brands=20)
+    df = product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left', suffixes=('', '_brand'))
+    return build_model_from_frame(df, top_k=10, backend='exact', sparse=sparse)
+
+
+def _versioned(model, version):
+    return dataclasses.replace(model, version=version, meta={**model.meta, "version": version})
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_save_and_load_through_current(tmp_path, sparse):
+    model = _model(sparse)
+    save_model(model, str(tmp_path))
+    assert current_version(str(tmp_path)) == model.version
+
+    loaded = load_model(str(tmp_path))
+    assert loaded.version == model.version and loaded.meta == model.meta
+    assert np.array_equal(loaded.item_ids, model.item_ids)
+    assert np.array_equal(loaded.neighbors.ids, model.neighbors.ids)
+    assert np.array_equal(loaded.neighbors.scores, model.neighbors.scores)
+    assert sp.issparse(loaded.features) == sparse
+    dense = (lambda m: m.toarray()) if sparse else np.asarray
+    assert np.array_equal(dense(loaded.features), dense(model.features))
+    assert loaded.items['category_code'].astype(str).tolist() == model.items['category_code'].astype(str).tolist()
+    # 임시 디렉토리 / 포인터 파일이 남지 않음
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".tmp-") or name.startswith(".CURRENT-")]
+
+
+def test_prune_keeps_current_version(tmp_path):
+    model = _model()
+    versions = [f"2024010{i}T000000-abcd" for i in range(1, 6)]
+    for version in versions:
+        save_model(_versioned(model, version), str(tmp_path))
+    # 롤백으로 CURRENT 가 오래된 버전을 가리키는 경우
+    with open(tmp_path / CURRENT_FILE, "w") as f:
+        f.write(versions[0])
+
+    removed = prune_versions(str(tmp_path), keep=2)
+    assert removed == versions[1:3]
+    remaining = sorted(name for name in os.listdir(tmp_path) if (tmp_path / name).is_dir())
+    assert remaining == [versions[0]] + versions[3:]
+    assert load_model(str(tmp_path)).version == versions[0]
+
+
+def test_holder_picks_up_new_version(tmp_path):
+    model = _model()
+    save_model(_versioned(model, "20240101T000000-aaaa"), str(tmp_path))
+    holder = ModelHolder(str(tmp_path))
+    assert holder.reload_if_changed() and holder.get().version == "20240101T000000-aaaa"
+    assert not holder.reload_if_changed()
+
+    save_model(_versioned(model, "20240102T000000-bbbb"), str(tmp_path))
+    assert holder.reload_if_changed()
+    assert holder.get().version == "20240102T000000-bbbb"
+    assert np.array_equal(holder.get().neighbors.ids, model.neighbors.ids)
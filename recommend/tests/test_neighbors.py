@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.neighbors import build_neighbor_index, topk_from_scores
+
+
+def _dense_reference(features, k):
+    """밀집 코사인 유사도 행렬을 전체 정렬해 얻는 기준 이웃 (자기 자신 제외)."""
+    sim = cosine_similarity(features).astype(np.float32)
+    np.fill_diagonal(sim, -np.inf)
+    order = np.argsort(-sim, axis=1, kind='stable')[:, :k]
+    return order, np.take_along_axis(sim, order, axis=1)
+
+
+@pytest.fixture
+def features():
+    return np.random.default_rng(0).normal(size=(203, 16)).astype(np.float32)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_build_matches_dense_reference_across_blocks(features, sparse):
+    n = len(features)
+    # 블록당 7행 → 마지막 블록이 잘리는 경계까지 포함
+    block_bytes = n * 4 * 7
+    matrix = sp.csr_matrix(features) if sparse else features
+    index = build_neighbor_index(matrix, top_k=10, block_bytes=block_bytes)
+    ref_ids, ref_scores = _dense_reference(features, 10)
+
+    assert index.ids.shape == (n, 10)
+    assert np.array_equal(index.ids, ref_ids)
+    assert np.allclose(index.scores, ref_scores, atol=1e-5)
+    assert not (index.ids == np.arange(n)[:, None]).any()
+
+
+def test_build_with_query_rows_matches_full_index(features):
+    rows = np.array([0, 6, 7, 8, 150, 202])
+    full = build_neighbor_index(features, top_k=5)
+    partial = build_neighbor_index(features, top_k=5, block_bytes=len(features) * 4 * 2, rows=rows)
+    assert np.array_equal(partial.ids, full.ids[rows])
+    assert np.allclose(partial.scores, full.scores[rows])
+
+
+def test_top_k_larger_than_catalog(features):
+    small = features[:6]
+    index = build_neighbor_index(small, top_k=50, block_bytes=small.shape[0] * 4)
+    ref_ids, ref_scores = _dense_reference(small, 5)
+
+    # n <= top_k 이면 자기 자신을 뺀 n - 1 개만 보관
+    assert index.ids.shape == (6, 5)
+    assert np.array_equal(index.ids, ref_ids)
+    assert np.allclose(index.scores, ref_scores, atol=1e-5)
+    assert not (index.ids == np.arange(6)[:, None]).any()
+    assert np.isfinite(index.scores).all()
+
+
+def test_single_item_catalog_keeps_one_column(features):
+    index = build_neighbor_index(features[:1], top_k=10)
+    assert index.ids.shape == (1, 1)
+    # 이웃이 없으므로 점수는 -inf
+    assert np.isneginf(index.scores).all()
+
+
+def test_topk_from_scores_orders_descending():
+    scores = np.random.default_rng(1).normal(size=(5, 40)).astype(np.float32)
+    ids, top = topk_from_scores(scores, 7)
+    expected = np.argsort(-scores, axis=1)[:, :7]
+    assert np.array_equal(ids, expected)
+    assert np.array_equal(top, np.take_along_axis(scores, expected, axis=1))
+    assert (np.diff(top, axis=1) <= 0).all()
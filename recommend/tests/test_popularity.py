@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from app.bench import synthetic_catalog
+from app.filters import ItemFilter
+from app.model_store import build_model_from_frame, recommend_for_user
+from app.popularity import ALL, build_ranker, decayed_counts
+from app.profiles import build_profile
+
+
+def _items():
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4, 5, 6],
+        'gender': ['M', 'F', 'U', 'M', 'F', 'M'],
+        'major_category': ['top', 'top', 'bag', 'shoes', 'bag', 'top'],
+        'like_count': [100, 90, 80, 70, 60, 0],
+        'view_count': [0] * 6,
+        'purchase_count': [0] * 6,
+    })
+
+
+def test_segments_include_unisex_and_fall_back_to_wider_segments():
+    ranker = build_ranker(_items())
+    assert ranker.top(10).tolist() == [1, 2, 3, 4, 5, 6]
+    assert ranker.top(10, gender='M').tolist() == [1, 3, 4, 6]
+    assert ranker.top(10, gender='M', major_category='top').tolist() == [1, 6]
+    # 없는 세그먼트는 (성별, 전체) → (전체, 대분류) → 전체 순으로 넓혀 찾음
+    assert ranker.top(10, gender='M', major_category='outer').tolist() == [1, 3, 4, 6]
+    assert ranker.top(10, gender='X', major_category='bag').tolist() == [3, 5]
+    assert ranker.top(2, gender='X').tolist() == [1, 2]
+    assert (ALL, ALL) in ranker.segments
+
+
+def test_trending_decay_lifts_recent_items():
+    now = 1_000_000.0
+    counts = decayed_counts([
+        {'product_id': 6, 'type': 'purchase', 'ts': now, 'count': 2},
+        {'product_id': 5, 'type': 'view', 'ts': now - 3600, 'count': 4},
+        {'product_id': 5, 'type': 'like', 'ts': now},
+    ], now=now, half_life_hours=1.0)
+    assert counts[6] == 10.0 and np.isclose(counts[5], 2.0)
+
+    ranker = build_ranker(_items(), trending=counts, trending_weight=2.0)
+    assert ranker.top(1).tolist() == [6]
+
+
+def test_users_without_history_get_segment_popular_items():
+    product_df, brand_df = synthetic_catalog(400, n_brands=20)
+    df = product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left', suffixes=('', '_brand'))
+    model = build_model_from_frame(df, top_k=10, backend='exact', sparse=False)
+    ranker = build_ranker(model.items)
+
+    expected = ranker.top(10).tolist()
+    assert recommend_for_user(model, "u1", 10, popularity=ranker)["product_id"] == expected
+    empty = build_profile("u1", [(1, "like"), (1, "unlike")])
+    assert recommend_for_user(model, "u1", 10, profile=empty, popularity=ranker)["product_id"] == expected
+
+    segment = ItemFilter(gender='F', major_category='bag')
+    result = recommend_for_user(model, "u1", 10, popularity=ranker, item_filter=segment)["product_id"]
+    assert result == ranker.top(10, 'F', 'bag').tolist()[:10]
+
+    # 세그먼트 인기 목록에 조건을 만족하는 상품이 부족하면 기준 아이템의 필터 이웃으로 채움
+    short = build_ranker(model.items, top_m=20)
+    narrow = ItemFilter(brand_ids=(3, 4))
+    mask = model.filter_index.mask(narrow)
+    popular = [pid for pid in short.top(20).tolist() if mask[model.id_to_index[pid]]]
+    result = recommend_for_user(model, "u1", 10, popularity=short, item_filter=narrow)["product_id"]
+    assert len(popular) < 10 and result[:len(popular)] == popular
+    assert len(result) == 10 and len(set(result)) == 10
+    assert all(mask[model.id_to_index[pid]] for pid in result)
@@ -0,0 +1,113 @@
+import sys
+import threading
+
+import numpy as np
+
+from app.bench import synthetic_catalog
+from app.model_store import build_model_from_frame
+from app.profiles import (
+    EVENT_WEIGHTS,
+    ProfileCache,
+    UserProfile,
+    build_profile,
+    score_profile_rows,
+    score_profiles_batch_rows,
+)
+
+
+def _model(n=300):
+    product_df, brand_df = synthetic_catalog(n, n_brands=20)
+    df = product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left', suffixes=('', '_brand'))
+    return build_model_from_frame(df, top_k=10, backend='exact', sparse=False)
+
+
+def test_event_weights_and_unlike():
+    profile = build_profile("u1", [(1, "view"), (1, "like"), (2, "purchase"), (3, "click")])
+    assert profile.weights == {1: EVENT_WEIGHTS["view"] + EVENT_WEIGHTS["like"], 2: EVENT_WEIGHTS["purchase"]}
+
+    profile.add_event(1, "unlike")
+    assert profile.weights[1] == EVENT_WEIGHTS["view"]
+    # 좋아요만 했다가 취소한 상품만 있으면 빈 프로필
+    assert build_profile("u2", [(5, "like"), (5, "unlike")]).is_empty
+
+
+def test_incremental_vector_matches_rebuild():
+    model = _model()
+    ids = model.item_ids
+    profile = build_profile("u1", [(int(ids[0]), "like"), (int(ids[1]), "view")])
+    profile.vector(model)
+    profile.add_event(int(ids[2]), "purchase", model)
+    profile.add_event(int(ids[0]), "unlike", model)
+
+    rebuilt = UserProfile("u1", weights=dict(profile.weights))
+    assert np.allclose(profile.vector(model), rebuilt.vector(model), atol=1e-5)
+
+
+def test_scoring_excludes_seen_and_batch_matches_single():
+    model = _model()
+    ids = model.item_ids
+    profiles = [
+        build_profile("u1", [(int(ids[0]), "like"), (int(ids[5]), "view")]),
+        build_profile("u2", [(int(ids[10]), "purchase")]),
+        build_profile("u3", []),
+    ]
+    rows, scores = score_profile_rows(model, profiles[0], top_n=10)
+    assert len(rows) == 10 and not np.isin([0, 5], rows).any()
+    assert (np.diff(scores) <= 1e-6).all()
+
+    batch_rows, batch_scores = score_profiles_batch_rows(model, profiles, top_n=10)
+    for profile, b_rows, b_scores in zip(profiles, batch_rows, batch_scores):
+        _, single_scores = score_profile_rows(model, profile, top_n=10)
+        assert np.allclose(b_scores[b_rows >= 0], single_scores, atol=1e-5)
+    assert (batch_rows[2] == -1).all()
+
+
+def test_cache_applies_events_only_to_cached_profiles():
+    cache = ProfileCache(ttl=60)
+    assert not cache.apply_event("u1", 1, "like")
+    cache.put(build_profile("u1", [(1, "view")]))
+    assert cache.apply_event("u1", 1, "like")
+    assert cache.get("u1").weights[1] == EVENT_WEIGHTS["view"] + EVENT_WEIGHTS["like"]
+
+    expired = ProfileCache(ttl=-1)
+    expired.put(build_profile("u1", []))
+    assert not expired.apply_event("u1", 1, "like")
+
+
+def test_events_race_with_scoring_threads():
+    model = _model(2_000)
+    ids = [int(pid) for pid in model.item_ids]
+    cache = ProfileCache(ttl=60)
+    cache.put(build_profile("u1", [(ids[0], "like")]))
+    profile = cache.get("u1")
+    profile.vector(model)
+    stop = threading.Event()
+    errors = []
+
+    def score():
+        while not stop.is_set():
+            try:
+                score_profile_rows(model, profile, top_n=5)
+                score_profiles_batch_rows(model, [profile], top_n=5)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    # 스레드 전환을 잦게 해 이벤트 반영과 채점이 겹치도록 함
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    threads = [threading.Thread(target=score) for _ in range(4)]
+    for t in threads:
+        t.start()
+    try:
+        for n in range(2_000):
+            cache.apply_event("u1", ids[n], ("view", "like", "purchase")[n % 3], model)
+    finally:
+        stop.set()
+        sys.setswitchinterval(interval)
+    for t in threads:
+        t.join()
+
+    assert not errors
+    rebuilt = UserProfile("u1", weights=dict(profile.weights))
+    assert np.allclose(profile.vector(model), rebuilt.vector(model), atol=1e-3)
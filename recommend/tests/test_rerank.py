@@ -0,0 +1,47 @@
+import numpy as np
+
+from app.rerank import Reranker
+
+
+class _Model:
+    """rerank 가 사용하는 RecModel 속성만 가진 테스트용 모델."""
+
+    def __init__(self, features, brands, categories):
+        self.features = features
+        self.rerank_codes = (np.asarray(brands), np.asarray(categories))
+
+
+def _model():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(3, 8)).astype(np.float32)
+    # 브랜드 0 의 거의 같은 상품 6개 + 다른 브랜드 상품 4개
+    features = np.vstack([base[0] + 0.01 * rng.normal(size=(6, 8)), base[1:].repeat(2, axis=0)])
+    features /= np.linalg.norm(features, axis=1, keepdims=True)
+    brands = [0] * 6 + [1, 1, 2, 2]
+    categories = [0] * 6 + [1] * 4
+    return _Model(features.astype(np.float32), brands, categories)
+
+
+def test_brand_cap_and_relevance_order():
+    model = _model()
+    rows = np.arange(10)
+    relevance = np.linspace(1.0, 0.5, 10)
+    picked = Reranker(mmr_lambda=1.0, pool_size=10, max_per_brand=2, max_per_category=0).rerank(
+        model, rows, relevance, 6)
+    assert list(picked[:2]) == [0, 1]
+    assert np.bincount(np.asarray(model.rerank_codes[0])[picked]).max() <= 2
+    # cap 으로 채울 수 없으면 남은 후보로 채움
+    picked = Reranker(mmr_lambda=1.0, pool_size=10, max_per_brand=1, max_per_category=0).rerank(
+        model, rows, relevance, 6)
+    assert len(set(picked)) == 6
+
+
+def test_mmr_prefers_dissimilar_items_and_noop():
+    model = _model()
+    rows = np.arange(10)
+    relevance = np.linspace(1.0, 0.9, 10)
+    picked = Reranker(mmr_lambda=0.5, pool_size=10, max_per_brand=0, max_per_category=0).rerank(
+        model, rows, relevance, 3)
+    assert picked[0] == 0 and picked[1] >= 6
+    noop = Reranker(mmr_lambda=1.0, pool_size=10, max_per_brand=0, max_per_category=0)
+    assert noop.is_noop and list(noop.rerank(model, rows, relevance, 3)) == [0, 1, 2]
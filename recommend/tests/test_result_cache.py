@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from app.result_cache import InMemoryResultBackend, ResultCache, result_key
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResultCache(shared=InMemoryResultBackend())
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"product_id": [1, 2, 3]}
+
+    async def run():
+        key = result_key("u1", 6, "v1")
+        return await asyncio.gather(*(cache.get_or_compute(key, compute) for _ in range(20)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r == {"product_id": [1, 2, 3]} for r in results)
+    assert cache.stats()["coalesced"] == 19
+
+
+def test_shared_backend_fills_local_tier():
+    shared = InMemoryResultBackend()
+    first, second = ResultCache(shared=shared), ResultCache(shared=shared)
+
+    async def compute():
+        return {"v": 1}
+
+    async def fail():
+        raise AssertionError("should be served from the shared tier")
+
+    key = result_key("u1", 6, "v1")
+    asyncio.run(first.get_or_compute(key, compute))
+    assert asyncio.run(second.get_or_compute(key, fail)) == {"v": 1}
+    assert second.stats()["shared_hits"] == 1
+    # 모델 버전이 바뀌면 다른 키
+    assert result_key("u1", 6, "v2") != key
+
+
+def test_errors_are_shared_and_not_cached():
+    cache = ResultCache()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_compute("k", boom) for _ in range(3)), return_exceptions=True
+        )
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(run()))
+    assert cache.local.get("k") is None
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_compute("k", boom))
+
+
+def test_invalidate_users_evicts_by_prefix_in_both_tiers():
+    shared = InMemoryResultBackend()
+    cache = ResultCache(shared=shared)
+
+    async def compute():
+        return {"v": 1}
+
+    async def run():
+        for key in (result_key("u1", 6, "v1"), result_key("u1", 10, "v1", "0.3"), result_key("u2", 6, "v1")):
+            await cache.get_or_compute(key, compute)
+        return await cache.invalidate_users(["u1", "u1"])
+
+    assert asyncio.run(run()) == 4
+    assert cache.local.get(result_key("u1", 6, "v1")) is None
+    assert shared._cache.get(result_key("u1", 10, "v1", "0.3")) is None
+    assert cache.local.get(result_key("u2", 6, "v1")) == {"v": 1}
+
+
+def test_result_computed_during_invalidation_is_not_cached():
+    cache = ResultCache()
+    key = result_key("u1", 6, "v1")
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return {"v": "stale"}
+
+    async def run():
+        task = asyncio.create_task(cache.get_or_compute(key, compute))
+        await asyncio.sleep(0.005)
+        await cache.invalidate_users(["u1"])
+        return await task
+
+    assert asyncio.run(run()) == {"v": "stale"}
+    assert cache.local.get(key) is None
@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.bench import write_synthetic_json
+from app.cosine_recsys import load_data
+from app.snapshot import convert_json, read_snapshot, write_snapshot
+
+
+def test_round_trip_keeps_values_and_missing_categories(tmp_path):
+    df = pd.DataFrame({
+        'id': np.arange(1, 6, dtype=np.int64),
+        'price': [1.5, 2.0, np.nan, 4.0, 5.0],
+        'gender': ['M', None, 'F', 'M', 'U'],
+        'name': ['a', 'b', 'c', 'd', 'e'],
+    })
+    path = write_snapshot(df, str(tmp_path / 'catalog.snap'))
+    back = read_snapshot(path)
+
+    assert list(back.columns) == list(df.columns)
+    assert back['id'].dtype == np.int64 and back['id'].tolist() == df['id'].tolist()
+    assert np.allclose(back['price'], df['price'], equal_nan=True)
+    assert isinstance(back['gender'].dtype, pd.CategoricalDtype)
+    assert back['gender'].isna().tolist() == df['gender'].isna().tolist()
+    assert back['name'].astype(str).tolist() == df['name'].tolist()
+    assert list(read_snapshot(path, mmap=False, columns=['price']).columns) == ['price']
+
+
+def test_rewrite_replaces_snapshot_atomically(tmp_path):
+    path = str(tmp_path / 'catalog.snap')
+    write_snapshot(pd.DataFrame({'id': [1, 2]}), path)
+    write_snapshot(pd.DataFrame({'id': [3, 4, 5]}), path)
+    assert read_snapshot(path)['id'].tolist() == [3, 4, 5]
+    # 임시 / 교체 디렉토리가 남지 않아야 함
+    assert sorted(os.listdir(tmp_path)) == ['catalog.snap']
+
+
+def test_convert_json_matches_load_data(tmp_path):
+    product_path, brand_path = write_synthetic_json(200, str(tmp_path), n_brands=10)
+    path = convert_json(product_path, brand_path, str(tmp_path / 'catalog.snap'))
+    expected = load_data(product_path, brand_path)
+    back = read_snapshot(path)
+
+    assert len(back) == len(expected)
+    for col in back.columns:
+        if isinstance(back[col].dtype, pd.CategoricalDtype):
+            assert back[col].astype(str).tolist() == expected[col].astype(str).tolist()
+        else:
+            assert np.allclose(back[col], expected[col], equal_nan=True)
@@ -0,0 +1,37 @@
+import pytest
+
+from app.bench import synthetic_catalog
+from app.model_store import ModelHolder, build_model_from_frame
+from app.warmup import StartupState, warm_up
+
+
+def _model(n=500):
+    product_df, brand_df = synthetic_catalog(n, n_brands=20)
+    df = product_df.merge(brand_df, left_on='brand_id', right_on='id', how='left', suffixes=('', '_brand'))
+    return build_model_from_frame(df, top_k=10, backend='exact', sparse=False)
+
+
+def test_startup_stages_and_failure():
+    state = StartupState()
+    with state.stage("load"):
+        pass
+    with pytest.raises(RuntimeError):
+        with state.stage("load"):
+            raise RuntimeError("boom")
+    assert set(state.stages) == {"load"} and not state.ready
+    state.fail(RuntimeError("boom"))
+    assert state.snapshot()["phase"] == "failed" and state.error == "boom"
+
+
+def test_swap_warms_model_before_publishing(tmp_path):
+    model = _model()
+    seen = []
+
+    def hook(m):
+        assert holder.get() is None
+        seen.append(warm_up(m, n_queries=3))
+
+    holder = ModelHolder(str(tmp_path), warm_up=hook)
+    holder.swap(model)
+    assert holder.get() is model and seen[0]["queries"] == 5
+    assert "filter_index" in model.__dict__ and "rerank_codes" in model.__dict__